@@ -100,7 +100,9 @@ def boolean(flag):
     raise ValueError('Unknown flag %r' % s)
 
 config.read(soft_mem_limit=int, hard_mem_limit=int, port=int,
-            multi_user=boolean)
+            multi_user=boolean, straggler_factor=float,
+            compress_threshold=int, heartbeat_interval=float,
+            lease_timeout=float, max_retries=int, max_task_duration=float)
 
 if 'OQ_DISTRIBUTE' not in os.environ:
     os.environ['OQ_DISTRIBUTE'] = config.distribution.oq_distribute
@@ -765,7 +765,8 @@ def context(fname, node):
 class ValidatingXmlParser(object):
     """
     Validating XML Parser based on Expat. It has two methods `.parse_file`
-    and `.parse_bytes` returning a validated :class:`Node` object.
+    and `.parse_bytes` returning a validated :class:`Node` object and a
+    method `.parse_lazy` returning an iterator over validated nodes.
 
     :param validators: a dictionary of validation functions
     :param stop: the tag where to stop the parsing (if any)
@@ -785,6 +786,9 @@ class ValidatingXmlParser(object):
         self.p.CharacterDataHandler = self._char_data
         self._ancestors = []
         self._root = None
+        self.root_tag = None  # set as soon as the root node is opened
+        self._lazytags = ()
+        self._complete = []
         try:
             yield
         except ExpatError as err:
@@ -829,6 +833,48 @@ class ValidatingXmlParser(object):
                     self.p.ParseFile(f)
         return self._root
 
+    def parse_lazy(self, file_or_fname, lazytags, bufsize=1024 * 1024):
+        """
+        Parse a file or a filename incrementally. The children of the nodes
+        with a tag in `lazytags` are yielded as soon as they are complete and
+        are not appended to their parents; the nodes with a tag in `lazytags`
+        are yielded too (without such children) and the root node is yielded
+        last. In this way the memory occupation is bounded by the largest
+        yielded node and not by the size of the file. The tag of the root
+        node is available as `.root_tag` as soon as the first node is
+        yielded.
+
+        :param file_or_fname: a file name or file object open for reading
+        :param lazytags: a sequence of tags without namespace
+        :param bufsize: size of the chunks read from the file
+        """
+        if hasattr(file_or_fname, 'read'):
+            fileobj = file_or_fname
+        else:
+            fileobj = open(file_or_fname, 'rb')
+        try:
+            with self._context():
+                self.filename = getattr(
+                    fileobj, 'name', fileobj.__class__.__name__)
+                self._lazytags = set(lazytags)
+                while True:
+                    data = fileobj.read(bufsize)
+                    self.p.Parse(data, not data)
+                    for node in self._pop_complete():
+                        yield node
+                    if not data:
+                        break
+            # the nodes completed when the parsing is stopped on purpose
+            for node in self._pop_complete():
+                yield node
+        finally:
+            if fileobj is not file_or_fname:
+                fileobj.close()
+
+    def _pop_complete(self):
+        complete, self._complete = self._complete, []
+        return complete
+
     def _start_element(self, longname, attrs):
         try:
             xmlns, name = longname.split('}')
@@ -836,6 +882,8 @@ class ValidatingXmlParser(object):
             name = tag = longname
         else:  # fix the tag with an opening brace
             tag = '{' + longname
+        if not self._ancestors and self.root_tag is None:
+            self.root_tag = tag
         self._ancestors.append(
             Node(tag, attrs, lineno=self.p.CurrentLineNumber))
         if self.stop and name == self.stop:
@@ -848,7 +896,12 @@ class ValidatingXmlParser(object):
         with context(self.filename, node):
             self._root = self._literalnode(node)
         del self._ancestors[-1]
-        if self._ancestors:
+        if self._lazytags and (
+                not self._ancestors or
+                striptag(node.tag) in self._lazytags or
+                striptag(self._ancestors[-1].tag) in self._lazytags):
+            self._complete.append(self._root)
+        elif self._ancestors:
             self._ancestors[-1].append(self._root)
 
     def _char_data(self, data):
@@ -139,10 +139,15 @@ from __future__ import print_function
 import os
 import sys
 import time
+import zlib
+import shutil
 import signal
 import socket
+import bisect
+import tempfile
 import inspect
 import logging
+import itertools
 import operator
 import functools
 import subprocess
@@ -232,15 +237,33 @@ class Pickled(object):
     have a nice string representation and length giving the size
     of the pickled bytestring.
 
+    If `compress` is true, pickled strings larger than the parameter
+    `compress_threshold` in the section [distribution] of openquake.cfg
+    are compressed with zlib. The size of the uncompressed string and the
+    compression time are stored in the attributes .rawsize and .ztime.
+
     :param obj: the object to pickle
+    :param compress: if True, compress the pickled string, if large
     """
-    def __init__(self, obj):
+    def __init__(self, obj, compress=False):
         self.clsname = obj.__class__.__name__
         self.calc_id = str(getattr(obj, 'calc_id', ''))  # for monitors
+        self.compress = compress
+        self.compressed = False
+        self.ztime = 0
         try:
             self.pik = pickle.dumps(obj, pickle.HIGHEST_PROTOCOL)
         except TypeError as exc:  # can't pickle, show the obj in the message
             raise TypeError('%s: %s' % (exc, obj))
+        self.rawsize = len(self.pik)
+        threshold = config.distribution.get('compress_threshold', 0)
+        if compress and threshold and self.rawsize > threshold:
+            t0 = time.time()
+            zpik = zlib.compress(self.pik, 1)  # the fastest level
+            self.ztime = time.time() - t0
+            if len(zpik) < self.rawsize:  # not already compressed data
+                self.pik = zpik
+                self.compressed = True
 
     def __repr__(self):
         """String representation of the pickled object"""
@@ -253,6 +276,8 @@ class Pickled(object):
 
     def unpickle(self):
         """Unpickle the underlying object"""
+        if self.compressed:
+            return pickle.loads(zlib.decompress(self.pik))
         return pickle.loads(self.pik)
 
 
@@ -278,7 +303,7 @@ def get_pickled_sizes(obj):
         sizes, key=lambda pair: pair[1], reverse=True)
 
 
-def pickle_sequence(objects):
+def pickle_sequence(objects, compress=False):
     """
     Convert an iterable of objects into a list of pickled objects.
     If the iterable contains copies, the pickling will be done only once.
@@ -286,6 +311,7 @@ def pickle_sequence(objects):
     pickled again.
 
     :param objects: a sequence of objects to pickle
+    :param compress: passed to :class:`Pickled`
     """
     cache = {}
     out = []
@@ -295,11 +321,242 @@ def pickle_sequence(objects):
             if isinstance(obj, Pickled):  # already pickled
                 cache[obj_id] = obj
             else:  # pickle the object
-                cache[obj_id] = Pickled(obj)
+                cache[obj_id] = Pickled(obj, compress)
         out.append(cache[obj_id])
     return out
 
 
+_shared_cache = {}  # dirname -> object
+
+
+def _load_shared(dirname):
+    # called when unpickling a Shared handle; the objects are cached, so
+    # that a worker process loads each of them only once
+    for path in list(_shared_cache):  # remove the objects already closed
+        if not os.path.exists(path):
+            del _shared_cache[path]
+    try:
+        return _shared_cache[dirname]
+    except KeyError:
+        obj = _shared_cache[dirname] = Shared.load(dirname)
+        return obj
+
+
+class Shared(object):
+    """
+    A read-only object to be broadcast to the tasks running on the local
+    machine. The object is stored once in a temporary directory, by default
+    in /dev/shm, i.e. in shared memory, or in the system temporary directory
+    if /dev/shm is missing or full. The numpy arrays inside the object
+    larger than `min_nbytes` are saved in .npy files and memory-mapped by
+    the worker processes, so that all the processes share the same pages.
+    The tasks receive a lightweight handle, which is resolved into the
+    original object when the arguments are unpickled in the worker.
+    With OQ_DISTRIBUTE=celery, zmq, ipython or qsub the full object is sent,
+    since the workers may run on different machines, and with
+    OQ_DISTRIBUTE=no the object is used directly: in these cases nothing
+    is stored.
+
+    Shared objects passed to a :class:`Starmap` are removed when all
+    the results of the Starmap have been received; they can be removed
+    manually with the `.close()` method.
+
+    :param obj: the object to broadcast
+    :param dirname: the parent directory (default /dev/shm, if it exists)
+    :param min_nbytes: the minimum size of the memory-mapped arrays
+    """
+    shared_dir = '/dev/shm' if os.path.isdir('/dev/shm') else None
+
+    def __init__(self, obj, dirname=None, min_nbytes=1000):
+        self.obj = obj
+        self.dirname = None
+        self.nbytes = 0  # bytes in memory-mapped arrays
+        if oq_distribute() in ('no', 'celery', 'zmq', 'ipython', 'qsub'):
+            return  # the handle could not be used
+        try:
+            self._save(dirname or self.shared_dir, min_nbytes)
+        except EnvironmentError as exc:  # for instance /dev/shm is full
+            self.close()
+            tmpdir = tempfile.gettempdir()
+            logging.warn('Could not store %s in %s (%s), using %s',
+                         obj.__class__.__name__, dirname or self.shared_dir,
+                         exc, tmpdir)
+            self._save(tmpdir, min_nbytes)
+
+    def _save(self, parent, min_nbytes):
+        self.dirname = tempfile.mkdtemp(prefix='oq-shared-', dir=parent)
+        self.nbytes = 0
+        names = {}  # id(array) -> file name
+
+        def persistent_id(o):
+            if (isinstance(o, numpy.ndarray) and not o.dtype.hasobject and
+                    o.nbytes >= min_nbytes):
+                if id(o) not in names:
+                    names[id(o)] = '%d.npy' % len(names)
+                    numpy.save(os.path.join(self.dirname, names[id(o)]), o)
+                    self.nbytes += o.nbytes
+                return names[id(o)]
+        with open(os.path.join(self.dirname, 'obj.pik'), 'wb') as f:
+            pickler = pickle.Pickler(f, pickle.HIGHEST_PROTOCOL)
+            pickler.persistent_id = persistent_id
+            pickler.dump(self.obj)
+
+    @staticmethod
+    def load(dirname):
+        """
+        Load the object stored in the given directory by memory-mapping
+        its arrays
+        """
+        def persistent_load(name):
+            return numpy.load(os.path.join(dirname, name), mmap_mode='r')
+        with open(os.path.join(dirname, 'obj.pik'), 'rb') as f:
+            unpickler = pickle.Unpickler(f)
+            unpickler.persistent_load = persistent_load
+            return unpickler.load()
+
+    @classmethod
+    def get_handle(cls, obj):
+        """
+        :param obj: an object, possibly resolved from a Shared handle
+        :returns: a Shared handle to the object, if it was resolved from a
+                  handle in this process, otherwise the object itself
+        """
+        for dirname, cached in _shared_cache.items():
+            if cached is obj and os.path.exists(dirname):
+                self = object.__new__(cls)
+                self.obj = obj
+                self.dirname = dirname
+                self.nbytes = 0
+                return self
+        return obj
+
+    def get(self):
+        """
+        :returns: the underlying object
+        """
+        return self.obj
+
+    def close(self):
+        """
+        Remove the stored object
+        """
+        if self.dirname:
+            shutil.rmtree(self.dirname, ignore_errors=True)
+            _shared_cache.pop(self.dirname, None)
+
+    def __reduce__(self):
+        if self.dirname is None or oq_distribute() in (
+                'celery', 'zmq', 'ipython'):  # nothing stored/remote workers
+            return (_identity, (self.obj,))
+        return (_load_shared, (self.dirname,))
+
+    def __repr__(self):
+        return '<%s %s %s in %s>' % (
+            self.__class__.__name__, self.obj.__class__.__name__,
+            humansize(self.nbytes), self.dirname)
+
+
+def _identity(obj):
+    return obj
+
+
+def get_zinfo(pickles):
+    """
+    :param pickles: a sequence of Pickled instances (possibly repeated)
+    :returns: a dictionary with keys rawsize, size and ztime
+    """
+    uniq = {id(pik): pik for pik in pickles}.values()
+    return AccumDict(rawsize=sum(pik.rawsize for pik in uniq),
+                     size=sum(len(pik) for pik in uniq),
+                     ztime=sum(pik.ztime for pik in uniq))
+
+
+class TaskStats(object):
+    """
+    Streaming statistics on the durations of the tasks of a given type,
+    collected in the master as the results arrive. A task is flagged as
+    a straggler if its duration exceeds `factor` times the median duration
+    of the tasks arrived before it (at least `min_tasks` of them).
+
+    :param name: the name of the task
+    :param factor: the straggler factor (0 means no straggler detection)
+    :param min_tasks: the minimum number of tasks to compute the median
+    """
+    bins = 2. ** numpy.arange(-7, 16)  # from 1/128 s to 9 hours
+    stats_dt = numpy.dtype(
+        [('operation', (bytes, 50)), ('num_tasks', numpy.uint32),
+         ('min', numpy.float32), ('mean', numpy.float32),
+         ('median', numpy.float32), ('p90', numpy.float32),
+         ('p99', numpy.float32), ('max', numpy.float32),
+         ('num_stragglers', numpy.uint32),
+         ('histogram', (numpy.uint32, len(bins) + 1))])
+    straggler_dt = numpy.dtype(
+        [('operation', (bytes, 50)), ('taskno', numpy.uint32),
+         ('duration', numpy.float32), ('median', numpy.float32)])
+
+    def __init__(self, name, factor, min_tasks=5):
+        self.name = name
+        self.factor = factor
+        self.min_tasks = min_tasks
+        self.durations = []  # sorted list
+        self.histogram = numpy.zeros(len(self.bins) + 1, numpy.uint32)
+        self.stragglers = []  # triples (taskno, duration, median)
+
+    def quantile(self, q):
+        """
+        :returns: the q-quantile of the durations, by linear interpolation
+        """
+        n = len(self.durations)
+        idx = q * (n - 1)
+        lo = int(idx)
+        hi = min(lo + 1, n - 1)
+        return self.durations[lo] + (
+            self.durations[hi] - self.durations[lo]) * (idx - lo)
+
+    def add(self, taskno, duration):
+        """
+        Add the duration of a task and log a warning if it is a straggler.
+
+        :returns: True if the task is a straggler, False otherwise
+        """
+        straggler = False
+        if self.factor and len(self.durations) >= self.min_tasks:
+            median = self.quantile(.5)
+            if duration > self.factor * median:
+                self.stragglers.append((taskno, duration, median))
+                logging.warn('Task %s #%s took %d s, more than %s times the '
+                             'median duration (%s s)', self.name, taskno,
+                             duration, self.factor, median)
+                straggler = True
+        bisect.insort(self.durations, duration)
+        self.histogram[numpy.searchsorted(self.bins, duration)] += 1
+        return straggler
+
+    def get_stats(self):
+        """
+        :returns: an array of dtype stats_dt with a single row
+        """
+        durations = self.durations
+        row = (self.name, len(durations), durations[0],
+               numpy.mean(durations), self.quantile(.5), self.quantile(.9),
+               self.quantile(.99), durations[-1], len(self.stragglers),
+               self.histogram)
+        return numpy.array([row], self.stats_dt)
+
+    def save(self, hdf5path):
+        """
+        Save the statistics in the datasets `task_stats` and
+        `task_stragglers` of the given file
+        """
+        if not self.durations:
+            return
+        hdf5.extend3(hdf5path, 'task_stats', self.get_stats())
+        if self.stragglers:
+            data = numpy.array([(self.name,) + tup for tup in self.stragglers],
+                               self.straggler_dt)
+            hdf5.extend3(hdf5path, 'task_stragglers', data)
+
+
 class IterResult(object):
     """
     :param futures:
@@ -312,13 +569,15 @@ class IterResult(object):
         a logging function for the progress report
     :param sent:
         the number of bytes sent (0 if OQ_DISTRIBUTE=no)
+    :param zinfo:
+        a dictionary with the compression information for the arguments
     """
     task_data_dt = numpy.dtype(
         [('taskno', numpy.uint32), ('weight', numpy.float32),
          ('duration', numpy.float32)])
 
     def __init__(self, futures, taskname, num_tasks,
-                 progress=logging.info, sent=0):
+                 progress=logging.info, sent=0, zinfo=None):
         self.futures = futures
         self.name = taskname
         self.num_tasks = num_tasks
@@ -327,7 +586,11 @@ class IterResult(object):
         else:
             self.progress = progress
         self.sent = sent
+        self.zinfo = AccumDict() if zinfo is None else zinfo
+        self.shared = []  # Shared objects to close at the end
         self.received = []
+        self.stats = TaskStats(
+            taskname, config.distribution.get('straggler_factor', 0))
         if self.num_tasks:
             self.log_percent = self._log_percent()
             next(self.log_percent)
@@ -339,17 +602,24 @@ class IterResult(object):
         yield 0
         done = 1
         prev_percent = 0
-        while done < self.num_tasks:
+        # num_tasks can grow while iterating if tasks are resubmitted
+        while done <= self.num_tasks:
             percent = int(float(done) / self.num_tasks * 100)
             if percent > prev_percent:
                 self.progress('%s %3d%%', self.name, percent)
                 prev_percent = percent
             yield done
             done += 1
-        self.progress('%s 100%%', self.name)
-        yield done
 
     def __iter__(self):
+        try:
+            for val in self._iter():
+                yield val
+        finally:
+            for shared in self.shared:
+                shared.close()
+
+    def _iter(self):
         self.received = []
         for fut in self.futures:
             check_mem_usage()  # log a warning if too much memory is used
@@ -362,7 +632,11 @@ class IterResult(object):
                 raise result
             elif hasattr(result, 'unpickle'):
                 self.received.append(len(result))
+                t0 = time.time()
                 val, etype, mon = result.unpickle()
+                if result.compress:
+                    self.zinfo += get_zinfo([result])
+                    self.zinfo += {'unztime': time.time() - t0}
             else:
                 val, etype, mon = result
                 self.received.append(len(Pickled(result)))
@@ -371,6 +645,9 @@ class IterResult(object):
             if self.num_tasks:
                 next(self.log_percent)
             if not self.name.startswith('_'):  # no info for private tasks
+                # the task is the first child, see safely_call
+                duration = (mon.children[0] if mon.children else mon).duration
+                self.stats.add(getattr(mon, 'task_no', 0), duration)
                 self.save_task_data(mon)
             yield val
 
@@ -382,7 +659,17 @@ class IterResult(object):
             received = {'max_per_task': max_per_task, 'tot': tot}
             tname = self.name
             dic = {tname: {'sent': self.sent, 'received': received}}
+            if self.zinfo.get('ztime'):  # the data were compressed
+                ratio = float(self.zinfo['rawsize']) / self.zinfo['size']
+                dic[tname].update(
+                    compression_ratio=ratio,
+                    compression_time=self.zinfo['ztime'],
+                    decompression_time=self.zinfo.get('unztime', 0))
+                self.progress('Compression ratio %.1f, compression time %.2fs',
+                              ratio, self.zinfo['ztime'])
             mon.save_info(dic)
+            if mon.hdf5path and not self.name.startswith('_'):
+                self.stats.save(mon.hdf5path)
 
     def save_task_data(self, mon):
         if mon.hdf5path and hasattr(mon, 'weight'):
@@ -407,9 +694,11 @@ class IterResult(object):
         res = object.__new__(cls)
         res.received = []
         res.sent = 0
+        res.zinfo = AccumDict()
         for iresult in iresults:
             res.received.extend(iresult.received)
             res.sent += iresult.sent
+            res.zinfo += iresult.zinfo
             name = iresult.name.split('#', 1)[0]
             if hasattr(res, 'name'):
                 assert res.name.split('#', 1)[0] == name, (res.name, name)
@@ -432,6 +721,7 @@ class Starmap(object):
     """
     executor = executor
     task_ids = []
+    compress = False
 
     @classmethod
     def restart(cls):
@@ -475,6 +765,8 @@ class Starmap(object):
         self.init(oqtask)
         self.results = []
         self.distribute = oq_distribute(oqtask)
+        # compress the data sent to other processes
+        self.compress = self.distribute not in ('no', 'threadpool')
         if self.distribute == 'threadpool':
             self.executor = ThreadPoolExecutor(executor.num_tasks_hint)
         if self.distribute == 'ipython' and isinstance(
@@ -484,6 +776,8 @@ class Starmap(object):
 
     def init(self, oqtask):
         self.sent = AccumDict()
+        self.zinfo = AccumDict()
+        self.shared = {}  # id -> Shared object
         # a task can be a function, a class or an instance with a __call__
         if inspect.isfunction(oqtask):
             self.argnames = inspect.getargspec(oqtask).args
@@ -525,15 +819,49 @@ class Starmap(object):
             return self.executor.submit(
                 safely_call, self.task_func, piks)
 
+    def resubmit(self, *args):
+        """
+        Submit a new task while the results are being consumed, for instance
+        to send back to the workers the unprocessed part of a slow task.
+        The new result will be returned by the same IterResult. Not supported
+        with OQ_DISTRIBUTE=zmq and OQ_DISTRIBUTE=qsub.
+        """
+        if self.distribute in ('zmq', 'qsub'):
+            raise NotImplementedError('Cannot resubmit tasks with '
+                                      'OQ_DISTRIBUTE=%s' % self.distribute)
+        # the objects resolved from the Shared arguments are sent again
+        # as handles, not in full
+        args = tuple(self._get_shared(arg) for arg in args)
+        self.iresult.num_tasks += 1
+        [args] = self.add_task_no([args], start=self.iresult.num_tasks)
+        self.submit(*args)
+
+    def _get_shared(self, arg):
+        # the Shared argument containing `arg`, or `arg` itself; `arg` can
+        # also be the copy loaded when unpickling the results of a task
+        for shared in self.shared.values():
+            if arg is shared.obj or arg is _shared_cache.get(shared.dirname):
+                return shared
+        return arg
+
     def _iterfutures(self):
+        # collect also the results of the tasks resubmitted while iterating
+        start = 0
+        while start < len(self.results):
+            results = self.results[start:]
+            start = len(self.results)
+            for fut in self._iter(results):
+                yield fut
+
+    def _iter(self, results):
         # compatibility wrapper for different concurrency frameworks
 
         if self.distribute == 'no':
-            for result in self.results:
+            for result in results:
                 yield mkfuture(result)
 
         elif self.distribute == 'celery':
-            rset = ResultSet(self.results)
+            rset = ResultSet(results)
             for task_id, result_dict in rset.iter_native():
                 idx = self.task_ids.index(task_id)
                 self.task_ids.pop(idx)
@@ -544,7 +872,7 @@ class Starmap(object):
                 yield fut
 
         else:  # future interface
-            for fut in as_completed(self.results):
+            for fut in as_completed(results):
                 yield fut
 
     def reduce(self, agg=operator.add, acc=None):
@@ -585,11 +913,19 @@ class Starmap(object):
         """
         :returns: an IterResult object
         """
+        ires = self._submit_all()
+        ires.shared = list(self.shared.values())
+        return ires
+
+    def _submit_all(self):
         if self.num_tasks == 1:
             [args] = self.add_task_no(self.task_args, pickle=False)
             self.progress('Executing "%s" in process', self.name)
             fut = mkfuture(safely_call(self.task_func, args))
-            return IterResult([fut], self.name, self.num_tasks)
+            self.iresult = IterResult(
+                itertools.chain([fut], self._iterfutures()),
+                self.name, self.num_tasks)
+            return self.iresult
 
         elif self.distribute == 'zmq':  # experimental
             allargs = self.add_task_no(self.task_args)
@@ -598,14 +934,15 @@ class Starmap(object):
                 self.task_func, allargs,
                 w.master_host, w.task_in_port, w.receiver_ports)
             ntasks = next(it)
-            return IterResult(it, self.name, ntasks, self.progress, self.sent)
+            return IterResult(it, self.name, ntasks, self.progress,
+                              self.sent, self.zinfo)
 
         elif self.distribute == 'qsub':  # experimental
             allargs = list(self.add_task_no(self.task_args, pickle=False))
             logging.warn('Sending %d tasks to the grid engine', len(allargs))
             return IterResult(qsub(self.task_func, allargs),
                               self.name, len(allargs),
-                              self.progress, self.sent)
+                              self.progress, self.sent, self.zinfo)
 
         task_no = 0
         for args in self.add_task_no(self.task_args):
@@ -614,26 +951,34 @@ class Starmap(object):
         if not task_no:
             self.progress('No %s tasks were submitted', self.name)
         # NB: keep self._iterfutures() an iterator, especially with celery!
-        ir = IterResult(self._iterfutures(), self.name, task_no,
-                        self.progress, self.sent)
-        return ir
+        self.iresult = IterResult(self._iterfutures(), self.name, task_no,
+                                  self.progress, self.sent, self.zinfo)
+        return self.iresult
 
     def __iter__(self):
         return iter(self.submit_all())
 
-    def add_task_no(self, iterargs, pickle=True):
+    def add_task_no(self, iterargs, pickle=True, start=1):
         """
         Add .task_no and .weight to the monitor and yield back
         the arguments by pickling them if pickle is True.
         """
-        for task_no, args in enumerate(iterargs, 1):
+        for task_no, args in enumerate(iterargs, start):
+            for arg in args:
+                if isinstance(arg, Shared):
+                    self.shared[id(arg)] = arg
+            if not pickle:  # the Shared objects are not resolved
+                args = tuple(arg.get() if isinstance(arg, Shared) else arg
+                             for arg in args)
             if isinstance(args[-1], Monitor):
                 # add incremental task number and task weight
                 args[-1].task_no = task_no
                 args[-1].weight = getattr(args[0], 'weight', 1.)
             if pickle:
-                args = pickle_sequence(args)
+                args = pickle_sequence(args, self.compress)
                 self.sent += {a: len(p) for a, p in zip(self.argnames, args)}
+                if self.compress:
+                    self.zinfo += get_zinfo(args)
             if task_no == 1:  # first time
                 self.progress('Submitting %s "%s" tasks', self.num_tasks,
                               self.name)
@@ -685,6 +1030,7 @@ def wakeup_pool():
 # subclasses Sequential and Processmap are used
 class BaseStarmap(object):
     poolfactory = staticmethod(lambda size: multiprocessing.Pool(size))
+    compress = False
     add_task_no = Starmap.__dict__['add_task_no']
     init = Starmap.__dict__['init']
     num_tasks = Starmap.__dict__['num_tasks']
@@ -714,8 +1060,10 @@ class BaseStarmap(object):
         :returns: an :class:`IterResult` instance
         """
         futs = (mkfuture(res) for res in self.imap)
-        return IterResult(futs, self.func.__name__, self.num_tasks,
-                          self.progress, self.sent)
+        ires = IterResult(futs, self.func.__name__, self.num_tasks,
+                          self.progress, self.sent, self.zinfo)
+        ires.shared = list(self.shared.values())
+        return ires
 
     def __iter__(self):
         try:
@@ -748,6 +1096,8 @@ class Sequential(BaseStarmap):
         self.task_args = iterargs
         self.progress = progress
         self.sent = AccumDict()
+        self.zinfo = AccumDict()
+        self.shared = {}
         self.argnames = inspect.getargspec(func).args
         allargs = list(self.add_task_no(iterargs))
         progress('Starting %s sequential tasks', self.num_tasks)
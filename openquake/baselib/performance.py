@@ -16,8 +16,11 @@
 # You should have received a copy of the GNU Affero General Public License
 # along with OpenQuake.  If not, see <http://www.gnu.org/licenses/>.
 import os
+import sys
 import time
+import signal
 import socket
+import collections
 from datetime import datetime
 
 import numpy
@@ -50,6 +53,8 @@ else:  # Ubuntu 12.04
 
 perf_dt = numpy.dtype([('operation', (bytes, 50)), ('time_sec', float),
                        ('memory_mb', float), ('counts', int)])
+stack_dt = numpy.dtype([('operation', (bytes, 50)), ('stack', hdf5.vstr),
+                        ('counts', int)])
 
 
 def _pairs(items):
@@ -63,6 +68,60 @@ def _pairs(items):
     return sorted(lst)
 
 
+class Sampler(object):
+    """
+    A statistical profiler. Should be used as a context manager::
+
+     with Sampler(0.01) as sampler:
+         do_something()
+     print(sampler.stacks)
+
+    Every `interval` seconds of CPU time the stack of the main thread is
+    recorded in the `.stacks` counter, in the folded format used by the
+    flame graph tools, i.e. a string `module:func;module:func;...` from the
+    outermost frame to the innermost one; the frames above the one entering
+    the sampler are not recorded. The sampler is based on the
+    SIGPROF signal, so it does nothing when used outside the main thread
+    or on platforms without `signal.setitimer` (i.e. Windows).
+
+    :param interval: the sampling interval in seconds
+    """
+    def __init__(self, interval):
+        self.interval = interval
+        self.stacks = collections.Counter()
+        self._handler = None
+        self._base = None
+
+    def _sample(self, signum, frame):
+        stack = []
+        while frame is not None and frame is not self._base:
+            stack.append('%s:%s' % (frame.f_globals.get('__name__'),
+                                    frame.f_code.co_name))
+            frame = frame.f_back
+        self.stacks[';'.join(reversed(stack))] += 1
+
+    def __enter__(self):
+        self._base = sys._getframe(1)  # the frame entering the sampler
+        try:
+            self._handler = signal.signal(signal.SIGPROF, self._sample)
+        except (AttributeError, ValueError):
+            # no SIGPROF on Windows, ValueError outside of the main thread
+            return self
+        # restart the system calls interrupted by the sampler; otherwise
+        # on Python 2 they would fail with EINTR (on Python 3 they are
+        # retried anyway, see PEP 475)
+        signal.siginterrupt(signal.SIGPROF, False)
+        signal.setitimer(signal.ITIMER_PROF, self.interval, self.interval)
+        return self
+
+    def __exit__(self, etype, exc, tb):
+        if self._handler is not None:
+            signal.setitimer(signal.ITIMER_PROF, 0)
+            signal.signal(signal.SIGPROF, self._handler)
+            self._handler = None
+        self._base = None
+
+
 # this is not thread-safe
 class Monitor(object):
     """
@@ -82,6 +141,10 @@ class Monitor(object):
     .exc: usually None; otherwise the exception happened in the `with` block
     .mem: the memory delta in bytes
 
+    If the .profiling_interval attribute is positive, the tasks receiving
+    the monitor are run under a :class:`Sampler` and the sampled stacks
+    are stored in the dataset `performance_stacks`.
+
     The behaviour of the Monitor can be customized by subclassing it
     and by overriding the method on_exit(), called at end and used to display
     or store the results of the analysis.
@@ -93,6 +156,7 @@ class Monitor(object):
     address = None
     authkey = None
     calc_id = None
+    profiling_interval = 0
 
     def __init__(self, operation='dummy', hdf5path=None,
                  autoflush=False, measuremem=False):
@@ -106,6 +170,7 @@ class Monitor(object):
         self.children = []
         self.counts = 0
         self.address = None
+        self.stacks = collections.Counter()
         self._flush = True
 
     @property
@@ -143,6 +208,16 @@ class Monitor(object):
             data.append((self.operation, time_sec, memory_mb, self.counts))
         return numpy.array(data, perf_dt)
 
+    def get_stacks(self):
+        """
+        :returns:
+            an array of dtype stack_dt, with the stacks sampled while
+            running the monitored operation, if any
+        """
+        data = [(self.operation, stack, counts)
+                for stack, counts in sorted(self.stacks.items())]
+        return numpy.array(data, stack_dt)
+
     def __enter__(self):
         self.exc = None  # exception
         self._start_time = time.time()
@@ -187,6 +262,10 @@ class Monitor(object):
                 self.operation)
         for child in self.children:
             child.flush()
+        stacks = self.get_stacks()
+        if len(stacks) and self.hdf5path:
+            hdf5.extend3(self.hdf5path, 'performance_stacks', stacks)
+        self.stacks.clear()
         data = self.get_data()
         if len(data) == 0:  # no information
             return []
@@ -216,6 +295,7 @@ class Monitor(object):
         del self_vars['operation']
         del self_vars['children']
         del self_vars['counts']
+        del self_vars['stacks']
         del self_vars['_flush']
         new = self.__class__(operation)
         vars(new).update(self_vars)
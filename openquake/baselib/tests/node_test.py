@@ -176,3 +176,27 @@ param=yyy
     def test_can_pickle(self):
         node = n.Node('tag')
         self.assertEqual(pickle.loads(pickle.dumps(node)), node)
+
+    def test_parse_lazy(self):
+        xmlfile = io.BytesIO(b"""\
+<root>
+<group name="g1">
+<item value="1"><sub>2</sub></item>
+<item value="3"><sub>4</sub></item>
+</group>
+<group name="g2">
+<item value="5"><sub>6</sub></item>
+</group>
+</root>
+""")
+        parser = n.ValidatingXmlParser({'value': int, 'sub': int})
+        # a small buffer, so that the nodes are split across the chunks
+        nodes = list(parser.parse_lazy(xmlfile, ['group'], bufsize=7))
+        self.assertEqual([node.tag for node in nodes],
+                         ['item', 'item', 'group', 'item', 'group', 'root'])
+        self.assertEqual([node['value'] for node in nodes[:2]], [1, 3])
+        self.assertEqual(nodes[1].sub.text, 4)
+        # the groups do not contain the items
+        self.assertEqual(nodes[2].attrib, {'name': 'g1'})
+        self.assertEqual(len(nodes[2]), 0)
+        self.assertEqual(len(nodes[-1]), 0)
@@ -16,10 +16,15 @@
 # You should have received a copy of the GNU Affero General Public License
 # along with OpenQuake. If not, see <http://www.gnu.org/licenses/>.
 
+import os
+import time
 import mock
+import shutil
+import tempfile
 import unittest
 import numpy
-from openquake.baselib import parallel
+from openquake.baselib import parallel, hdf5
+from openquake.baselib.python3compat import pickle
 
 try:
     import celery
@@ -38,6 +43,11 @@ def get_len(data, monitor):
     return result
 
 
+def sleepy(seconds, monitor):
+    time.sleep(seconds)
+    return {'n': 1}
+
+
 class StarmapTestCase(unittest.TestCase):
     monitor = parallel.Monitor()
 
@@ -75,6 +85,21 @@ class StarmapTestCase(unittest.TestCase):
         parallel.Starmap.restart()
         self.assertEqual(res, {'a': {'n': 10}, 'c': {'n': 15}, 'b': {'n': 20}})
 
+    def test_resubmit(self):
+        for distribute in ('no', 'futures'):
+            with mock.patch.dict(os.environ, OQ_DISTRIBUTE=distribute):
+                smap = parallel.Starmap(get_length, [('aaa',), ('bb',)])
+
+                def agg(acc, res):
+                    if res['n'] == 3:  # send a new task
+                        smap.resubmit('cccc')
+                    return acc + res['n']
+                ires = smap.submit_all()
+                self.assertEqual(ires.reduce(agg, 0), 9)
+            self.assertEqual(ires.num_tasks, 3)
+            # the progress generator stops with the last task
+            self.assertEqual(list(ires.log_percent), [])
+
     def test_no_flush(self):
         mon = parallel.Monitor('test')
         res = parallel.safely_call(get_len, ('ab', mon))
@@ -82,3 +107,179 @@ class StarmapTestCase(unittest.TestCase):
             'Monitor(\'test\').flush() must not be called in a worker', res[0])
         self.assertEqual(res[1], RuntimeError)
         self.assertEqual(res[2].operation, mon.operation)
+
+
+class CompressionTestCase(unittest.TestCase):
+    def setUp(self):
+        patcher = mock.patch.dict(parallel.config.distribution,
+                                  compress_threshold=1000)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_pickled(self):
+        small = parallel.Pickled(numpy.zeros(10), compress=True)
+        self.assertFalse(small.compressed)  # below the threshold
+        big = parallel.Pickled(numpy.zeros(10000), compress=True)
+        self.assertTrue(big.compressed)
+        self.assertEqual(len(parallel.Pickled(numpy.zeros(10000))),
+                         big.rawsize)
+        self.assertLess(len(big), big.rawsize)
+        numpy.testing.assert_equal(big.unpickle(), numpy.zeros(10000))
+
+        # incompressible data are not compressed
+        noise = parallel.Pickled(os.urandom(10000), compress=True)
+        self.assertFalse(noise.compressed)
+
+    def test_safely_call(self):
+        args = parallel.pickle_sequence([numpy.zeros(10000)], compress=True)
+        res = parallel.safely_call(get_length, args)
+        self.assertTrue(res.compress)
+        self.assertEqual(res.unpickle()[0], {'n': 10000})
+
+    def test_starmap(self):
+        allargs = [(numpy.zeros(10000),), (numpy.zeros(20000),)]
+        for distribute in ('no', 'futures'):
+            with mock.patch.dict(os.environ, OQ_DISTRIBUTE=distribute):
+                ires = parallel.Starmap(get_length, allargs).submit_all()
+                self.assertEqual(ires.reduce(), {'n': 30000})
+            if distribute == 'no':  # nothing to compress
+                self.assertEqual(ires.zinfo, {})
+            else:  # the arguments and the results were compressed
+                self.assertGreater(ires.zinfo['rawsize'],
+                                   ires.zinfo['size'] * 10)
+
+
+def get_shared_sum(shared, monitor):
+    return {'sum': shared['array'].sum(),
+            'memmap': isinstance(shared['array'], numpy.memmap)}
+
+
+class SharedTestCase(unittest.TestCase):
+    def test_pickle(self):
+        obj = {'array': numpy.arange(1000.), 'small': numpy.arange(3.)}
+        shared = parallel.Shared(obj)
+        self.addCleanup(shared.close)
+        self.assertEqual(shared.nbytes, 8000)  # only the big array
+        self.assertLess(len(pickle.dumps(shared)), 200)
+        got = pickle.loads(pickle.dumps(shared))
+        self.assertIsInstance(got['array'], numpy.memmap)
+        self.assertFalse(got['array'].flags.writeable)
+        numpy.testing.assert_equal(got['array'], obj['array'])
+        numpy.testing.assert_equal(got['small'], obj['small'])
+
+        # the object is sent in full to remote workers
+        with mock.patch.dict(os.environ, OQ_DISTRIBUTE='celery'):
+            got = pickle.loads(pickle.dumps(shared))
+        self.assertNotIsInstance(got['array'], numpy.memmap)
+
+    def test_starmap(self):
+        for distribute, memmap in [('no', False), ('futures', True)]:
+            with mock.patch.dict(os.environ, OQ_DISTRIBUTE=distribute):
+                shared = parallel.Shared({'array': numpy.ones(1000)})
+                allargs = [(shared, parallel.Monitor())] * 3
+                res = list(parallel.Starmap(get_shared_sum, allargs))
+            self.assertEqual(res, [{'sum': 1000, 'memmap': memmap}] * 3)
+            if distribute == 'no':  # nothing is stored
+                self.assertIsNone(shared.dirname)
+            else:  # the shared object is removed at the end
+                self.assertFalse(os.path.exists(shared.dirname))
+
+    def test_single_task(self):
+        shared = parallel.Shared({'array': numpy.ones(1000)})
+        allargs = [(shared, parallel.Monitor())]
+        [res] = parallel.Starmap(get_shared_sum, allargs)
+        self.assertEqual(res, {'sum': 1000, 'memmap': False})
+        self.assertFalse(os.path.exists(shared.dirname))
+
+    def test_resubmit(self):
+        # the objects resolved from a Shared argument are resubmitted
+        # as handles
+        with mock.patch.dict(os.environ, OQ_DISTRIBUTE='futures'):
+            shared = parallel.Shared({'array': numpy.ones(1000)})
+            smap = parallel.Starmap(
+                get_shared_sum, [(shared, parallel.Monitor())] * 2)
+            resolved = pickle.loads(pickle.dumps(shared))
+
+            def agg(acc, res):
+                if acc == 0:
+                    smap.resubmit(resolved, parallel.Monitor())
+                return acc + res['sum']
+            self.assertEqual(smap.submit_all().reduce(agg, 0), 3000)
+        self.assertLess(smap.sent['shared'], 1000)
+
+    def test_fallback(self):
+        # if the object cannot be stored in the given directory (for
+        # instance because /dev/shm is full) the temporary directory is used
+        with mock.patch('logging.warn') as warn:
+            shared = parallel.Shared({'array': numpy.ones(1000)},
+                                     dirname='/non/existing/dir')
+        self.addCleanup(shared.close)
+        self.assertIn('Could not store', warn.call_args[0][0])
+        self.assertEqual(os.path.dirname(shared.dirname),
+                         tempfile.gettempdir())
+
+    def test_get_handle(self):
+        obj = {'array': numpy.ones(1000)}
+        shared = parallel.Shared(obj)
+        self.addCleanup(shared.close)
+        # the object as received by a task
+        got = pickle.loads(pickle.dumps(shared))
+        handle = parallel.Shared.get_handle(got)
+        self.assertIsInstance(handle, parallel.Shared)
+        self.assertLess(len(pickle.dumps(handle)), 200)
+        self.assertIs(parallel.Shared.get_handle(obj), obj)
+
+
+class TaskStatsTestCase(unittest.TestCase):
+    def test_quantiles(self):
+        stats = parallel.TaskStats('task', factor=10)
+        for taskno, duration in enumerate([4, 1, 3, 2, 5], 1):
+            self.assertFalse(stats.add(taskno, duration))
+        self.assertEqual(stats.durations, [1, 2, 3, 4, 5])
+        self.assertEqual(stats.quantile(.5), 3)
+        self.assertEqual(stats.quantile(.9), 4.6)
+        self.assertTrue(stats.add(6, 31))  # more than 10 times the median
+        self.assertEqual(stats.stragglers, [(6, 31, 3)])
+        [row] = stats.get_stats()
+        self.assertEqual(row['num_tasks'], 6)
+        self.assertEqual(row['median'], 3.5)
+        self.assertEqual(row['num_stragglers'], 1)
+        self.assertEqual(row['histogram'].sum(), 6)
+
+    def test_no_factor(self):
+        stats = parallel.TaskStats('task', factor=0)
+        for taskno in range(10):
+            stats.add(taskno, 1)
+        self.assertFalse(stats.add(10, 100))
+
+    def check_stragglers(self, distribute):
+        tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmpdir)
+        hdf5path = os.path.join(tmpdir, 'calc.hdf5')
+        mon = parallel.Monitor('sleepy', hdf5path=hdf5path)
+        mon.weight = 1
+        # the last task is much slower than the others
+        allargs = [(.02, mon)] * 9 + [(1, mon)]
+        with mock.patch.dict(os.environ, OQ_DISTRIBUTE=distribute), \
+                mock.patch.dict(parallel.config.distribution,
+                                straggler_factor=10), \
+                mock.patch('logging.warn') as warn:
+            ires = parallel.Starmap(sleepy, allargs).submit_all()
+            self.assertEqual(sum(res['n'] for res in ires), 10)
+        [(taskno, duration, median)] = ires.stats.stragglers
+        self.assertEqual(taskno, 10)
+        self.assertGreater(duration, 1)
+        self.assertIn('more than', warn.call_args[0][0])
+        with hdf5.File(hdf5path, 'r') as h5:
+            [row] = h5['task_stats'].value
+            [straggler] = h5['task_stragglers'].value
+        self.assertEqual(row['operation'], b'sleepy')
+        self.assertEqual(row['num_tasks'], 10)
+        self.assertEqual(row['num_stragglers'], 1)
+        self.assertEqual(straggler['taskno'], 10)
+
+    def test_no_distribute(self):
+        self.check_stragglers('no')
+
+    def test_futures(self):
+        self.check_stragglers('futures')
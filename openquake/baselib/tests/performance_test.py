@@ -15,11 +15,27 @@
 
 #  You should have received a copy of the GNU Affero General Public License
 #  along with OpenQuake.  If not, see <http://www.gnu.org/licenses/>.
+import os
 import time
 import unittest
 import pickle
+import tempfile
 import numpy
-from openquake.baselib.performance import Monitor
+import h5py
+from openquake.baselib.performance import Monitor, Sampler
+from openquake.baselib.workerpool import safely_call
+
+
+def busy(seconds, monitor):
+    t0 = time.time()
+    while time.time() - t0 < seconds:
+        sum(range(1000))
+    return seconds
+
+
+def busy_and_fail(seconds, monitor):
+    busy(seconds, monitor)
+    raise ValueError('failed after %s seconds' % seconds)
 
 
 class MonitorTestCase(unittest.TestCase):
@@ -63,3 +79,39 @@ class MonitorTestCase(unittest.TestCase):
 
     def test_pickleable(self):
         pickle.loads(pickle.dumps(self.mon))
+
+
+class SamplerTestCase(unittest.TestCase):
+    def test_sampler(self):
+        with Sampler(0.001) as sampler:
+            busy(0.2, None)
+        self.assertGreater(sum(sampler.stacks.values()), 0)
+        for stack in sampler.stacks:
+            self.assertIn('%s:busy' % __name__, stack.split(';'))
+
+    def test_safely_call(self):
+        fd, hdf5path = tempfile.mkstemp(suffix='.hdf5')
+        os.close(fd)
+        mon = Monitor('busy', hdf5path)
+        mon.profiling_interval = 0.001
+        res, etype, mon = safely_call(busy, (0.2, mon))
+        self.assertEqual(res, 0.2)
+        [child] = mon.children
+        self.assertGreater(sum(child.stacks.values()), 0)
+        mon.flush()
+        self.assertEqual(len(child.stacks), 0)  # reset by flush
+        with h5py.File(hdf5path, 'r') as f:
+            stacks = f['performance_stacks'].value
+        self.assertEqual(set(stacks['operation']), {b'total busy'})
+        self.assertGreater(stacks['counts'].sum(), 0)
+        os.remove(hdf5path)
+
+    def test_safely_call_error(self):
+        # the stacks sampled before the error are not lost
+        mon = Monitor('busy_and_fail')
+        mon.profiling_interval = 0.001
+        res, etype, mon = safely_call(busy_and_fail, (0.2, mon))
+        self.assertIs(etype, ValueError)
+        [child] = mon.children
+        self.assertGreater(sum(child.stacks.values()), 0)
+
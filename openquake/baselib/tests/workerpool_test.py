@@ -16,10 +16,13 @@
 #  You should have received a copy of the GNU Affero General Public License
 #  along with OpenQuake.  If not, see <http://www.gnu.org/licenses/>.
 
+import os
 import time
+import signal
 import unittest
 import multiprocessing
-from openquake.baselib.workerpool import WorkerMaster, _starmap, streamer
+from openquake.baselib.workerpool import (
+    WorkerMaster, _starmap, _collect, streamer)
 from openquake.baselib.general import _get_free_port
 from openquake.baselib.performance import Monitor
 
@@ -28,6 +31,20 @@ def double(x, mon):
     return 2 * x
 
 
+def slow_double(x, mon):
+    time.sleep(.5)
+    return 2 * x
+
+
+def hang(x, mon):
+    time.sleep(1E6)  # the heartbeats are still sent
+
+
+def die(x, mon):
+    time.sleep(.2)
+    os._exit(1)  # kill the worker running the task
+
+
 class WorkerPoolTestCase(unittest.TestCase):
     @classmethod
     def setUpClass(cls):
@@ -58,7 +75,107 @@ class WorkerPoolTestCase(unittest.TestCase):
         time.sleep(1)  # wait a bit for the workerpool to start
         self.assertEqual(self.master.status(), [('127.0.0.1', 'running')])
 
+    def test_workers_status(self):
+        time.sleep(1)  # wait a bit for the workerpool to start
+        statuses = self.master.workers_status()
+        self.assertEqual(len(statuses), 4)
+        self.assertEqual(set(st[0] for st in statuses), {'127.0.0.1'})
+
+    def test_resend(self):
+        # kill a worker while it is running a task: the task is sent again
+        mon = Monitor()
+        iterargs = ((i, mon) for i in range(8))
+        res = _starmap(slow_double, iterargs, self.host, self.task_in_port,
+                       _get_free_port(), heartbeat_interval=.1,
+                       lease_timeout=1)
+        self.assertEqual(next(res), 8)
+        time.sleep(.2)  # wait for the tasks to start
+        busy = [pid for host, pid, status in self.master.workers_status()
+                if status.startswith('slow_double#')]
+        os.kill(busy[0], signal.SIGKILL)
+        results = [r[0] for r in res]
+        self.assertEqual(sorted(results), list(range(0, 16, 2)))
+        time.sleep(1.5)  # wait for the watchdog to replace the dead worker
+        statuses = self.master.workers_status()
+        self.assertEqual(len(statuses), 4)
+        self.assertNotIn(busy[0], [st[1] for st in statuses])
+        self.assertNotIn('dead', [st[2] for st in statuses])
+
+    def test_max_retries(self):
+        # a task killing its worker is sent again only max_retries times
+        mon = Monitor()
+        res = _starmap(die, [(1, mon)], self.host, self.task_in_port,
+                       _get_free_port(), heartbeat_interval=.1,
+                       lease_timeout=.5, max_retries=1)
+        self.assertEqual(next(res), 1)
+        [(msg, etype, mon)] = list(res)
+        self.assertEqual(etype, RuntimeError)
+        self.assertEqual(msg, 'Task die#0 was lost 2 times')
+
+    def test_max_task_duration(self):
+        # a hanged task is sent again, counting a retry
+        mon = Monitor()
+        res = _starmap(hang, [(1, mon)], self.host, self.task_in_port,
+                       _get_free_port(), heartbeat_interval=.1,
+                       lease_timeout=.5, max_retries=1, max_task_duration=1)
+        self.assertEqual(next(res), 1)
+        [(msg, etype, mon)] = list(res)
+        self.assertEqual(etype, RuntimeError)
+        self.assertEqual(msg, 'Task hang#0 was lost 2 times')
+        # kill the hanged workers, which are replaced by the watchdog
+        for host, pid, status in self.master.workers_status():
+            if status.startswith('hang#'):
+                os.kill(pid, signal.SIGKILL)
+
     @classmethod
     def tearDownClass(cls):
         cls.master.stop()
         cls.proc.terminate()
+
+
+class FakeSender(object):
+    def __init__(self):
+        self.sent = []
+
+    def send(self, obj):
+        self.sent.append(obj)
+
+
+class FakeReceiver(object):
+    # worker A died while running task 0, with task 1 queued; worker B
+    # is running task 2 and it returns the results once 0 and 1 are resent
+    def __init__(self, sender):
+        self.zsocket = self
+        self.sender = sender
+        self.messages = [('heartbeat', 0, 'A'), ('heartbeat', 2, 'B')]
+        self.finished = False
+        self.t0 = time.time()
+
+    def poll(self, timeout):
+        time.sleep(timeout / 1000.)
+        return True
+
+    def recv_pyobj(self):
+        if self.messages:
+            return self.messages.pop(0)
+        resent = [args[2] for args in self.sender.sent]
+        if sorted(resent) == [0, 1] and not self.finished:
+            self.messages = [('result', no, (2 * no, None, None))
+                             for no in (2, 0, 1)]
+            self.finished = True
+        elif len(resent) > 2 or time.time() - self.t0 > 10:
+            raise RuntimeError('Wrong resent tasks %s' % resent)
+        return 'heartbeat', 2, 'B'
+
+
+class CollectTestCase(unittest.TestCase):
+    def test_resend_queued(self):
+        # the tasks of a dead worker are resent while the other workers
+        # are still sending heartbeats, including the queued tasks
+        sender = FakeSender()
+        allargs = [(i, Monitor()) for i in range(3)]
+        res = _collect(FakeReceiver(sender), sender, double, allargs,
+                       heartbeat_interval=.01, lease_timeout=.1,
+                       max_retries=2)
+        self.assertEqual([r[0] for r in res], [4, 0, 2])
+        self.assertEqual([args[2] for args in sender.sent], [0, 1])
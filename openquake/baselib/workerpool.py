@@ -1,13 +1,17 @@
 import os
 import sys
+import time
 import signal
+import socket
 import logging
 import inspect
+import threading
 import subprocess
 import traceback
+import collections
 import multiprocessing
-from openquake.baselib import zeromq as z, general
-from openquake.baselib.performance import Monitor
+from openquake.baselib import zeromq as z, general, config
+from openquake.baselib.performance import Monitor, Sampler
 try:
     from setproctitle import setproctitle
 except ImportError:
@@ -26,6 +30,8 @@ def safely_call(func, args):
     :param func: the function to call
     :param args: the arguments
     """
+    # if the arguments were compressed, compress the result too
+    compress = args and hasattr(args[0], 'unpickle') and args[0].compress
     with Monitor('total ' + func.__name__, measuremem=True) as child:
         if args and hasattr(args[0], 'unpickle'):
             # args is a list of Pickled objects
@@ -44,9 +50,19 @@ def safely_call(func, args):
         # FIXME: this approach does not work with the Threadmap
         mon._flush = False
         try:
-            got = func(*args)
-            if inspect.isgenerator(got):
-                got = list(got)
+            if mon.profiling_interval > 0:
+                sampler = Sampler(mon.profiling_interval)
+                try:
+                    with sampler:
+                        got = func(*args)
+                        if inspect.isgenerator(got):
+                            got = list(got)
+                finally:  # keep the stacks sampled before an error too
+                    child.stacks.update(sampler.stacks)
+            else:
+                got = func(*args)
+                if inspect.isgenerator(got):
+                    got = list(got)
             res = got, None, mon
         except:
             etype, exc, tb = sys.exc_info()
@@ -55,6 +71,9 @@ def safely_call(func, args):
                    etype, mon)
         finally:
             mon._flush = True
+    if compress:
+        from openquake.baselib.parallel import Pickled
+        return Pickled(res, compress=True)
     return res
 
 
@@ -67,33 +86,167 @@ def streamer(host, task_in_port, task_out_port):
     :param task_out_port: port from where to receive the tasks
     """
     try:
+        # a small high water mark on the side of the workers, so that
+        # few tasks are queued (and possibly lost) in each worker
         z.zmq.proxy(z.bind('tcp://%s:%s' % (host, task_in_port), z.zmq.PULL),
-                    z.bind('tcp://%s:%s' % (host, task_out_port), z.zmq.PUSH))
+                    z.bind('tcp://%s:%s' % (host, task_out_port), z.zmq.PUSH,
+                           hwm=1))
     except (KeyboardInterrupt, z.zmq.ZMQError):
         pass  # killed cleanly by SIGINT/SIGTERM
 
 
-def _starmap(func, iterargs, host, task_in_port, receiver_ports):
+class Heartbeat(threading.Thread):
+    """
+    A thread sending a message ('heartbeat', task_no, worker) to the
+    master every `interval` seconds, while a task is running. The first
+    message is sent immediately and tells the master that the task started.
+
+    :param backurl: zmq address of the receiver of the master
+    :param task_no: the number of the task being run
+    :param interval: number of seconds between two heartbeats
+    """
+    def __init__(self, backurl, task_no, interval):
+        threading.Thread.__init__(self)
+        self.daemon = True
+        self.backurl = backurl
+        self.task_no = task_no
+        self.interval = interval
+        self.worker = '%s:%d' % (socket.gethostname(), os.getpid())
+        self.stopped = threading.Event()
+
+    def run(self):
+        # a zmq socket cannot be shared between threads, so a new one is used
+        with z.Socket(self.backurl, z.zmq.PUSH, 'connect') as sock:
+            while True:
+                sock.send(('heartbeat', self.task_no, self.worker))
+                if self.stopped.wait(self.interval):
+                    break
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *args):
+        self.stopped.set()
+        self.join()
+
+
+def _starmap(func, iterargs, host, task_in_port, receiver_ports,
+             heartbeat_interval=None, lease_timeout=None, max_retries=None,
+             max_task_duration=None):
     # called by parallel.Starmap.submit_all; should not be used directly
+    w = config.zworkers
+    if heartbeat_interval is None:
+        heartbeat_interval = float(w.get('heartbeat_interval', 5))
+    if lease_timeout is None:
+        lease_timeout = float(w.get('lease_timeout', 30))
+    if max_retries is None:
+        max_retries = int(w.get('max_retries', 2))
+    if max_task_duration is None:
+        max_task_duration = float(w.get('max_task_duration', 0))
     receiver_url = 'tcp://%s:%s' % (host, receiver_ports)
     task_in_url = 'tcp://%s:%s' % (host, task_in_port)
-    with z.Socket(receiver_url, z.zmq.PULL, 'bind') as receiver:
+    with z.Socket(receiver_url, z.zmq.PULL, 'bind') as receiver, \
+            z.Socket(task_in_url, z.zmq.PUSH, 'connect') as sender:
         logging.info('Receiver port for %s=%s', func.__name__, receiver.port)
         receiver_host = receiver.end_point.rsplit(':', 1)[0]
         backurl = '%s:%s' % (receiver_host, receiver.port)
-        with z.Socket(task_in_url, z.zmq.PUSH, 'connect') as sender:
-            n = 0
-            for args in iterargs:
-                args[-1].backurl = backurl  # args[-1] is a Monitor instance
-                sender.send((func, args))
-                n += 1
-        yield n
-        for _ in range(n):
-            obj = receiver.zsocket.recv_pyobj()
-            # receive n responses for the n requests sent
+        allargs = []
+        for args in iterargs:
+            args[-1].backurl = backurl  # args[-1] is a Monitor instance
+            sender.send((func, args, len(allargs), heartbeat_interval))
+            allargs.append(args)
+        yield len(allargs)
+        for obj in _collect(receiver, sender, func, allargs,
+                            heartbeat_interval, lease_timeout, max_retries,
+                            max_task_duration):
             yield obj
 
 
+def _collect(receiver, sender, func, allargs, heartbeat_interval,
+             lease_timeout, max_retries, max_task_duration=0):
+    # receive the results of the tasks, resending the tasks of the workers
+    # which died, i.e. the tasks whose heartbeats stopped, the tasks running
+    # for more than max_task_duration seconds (if positive), i.e. the tasks
+    # of the workers which hanged, and the tasks which were possibly queued
+    # in those workers
+    pending = set(range(len(allargs)))
+    now = time.time()
+    sent = {no: (no, now) for no in pending}  # task_no -> (seqno, time)
+    nsent = len(allargs)  # number of tasks sent, including the resent ones
+    leases = {}  # task_no -> (worker, time of the last heartbeat)
+    started = {}  # task_no -> time of the first heartbeat
+    retries = collections.Counter()
+    latest = -1  # seqno of the last sent task which started
+    death = 0  # time when the last dead or hanged worker was detected
+    last = now  # time of the last message received
+    while pending:
+        if receiver.zsocket.poll(heartbeat_interval * 1000):
+            kind, task_no, obj = receiver.zsocket.recv_pyobj()
+            last = time.time()
+            if task_no not in pending:  # result of a resent task, discard
+                pass
+            elif kind == 'heartbeat':  # obj is the worker
+                leases[task_no] = obj, last
+                started.setdefault(task_no, last)
+                latest = max(latest, sent[task_no][0])
+            else:  # kind == 'result'
+                pending.remove(task_no)
+                leases.pop(task_no, None)
+                started.pop(task_no, None)
+                yield obj
+        now = time.time()
+        expired = [no for no, (worker, beat) in leases.items()
+                   if now - beat > lease_timeout or max_task_duration and
+                   now - started[no] > max_task_duration]
+        for task_no in sorted(expired):  # the worker died or hanged
+            worker, beat = leases.pop(task_no)
+            del started[task_no]
+            death = now
+            retries[task_no] += 1
+            if retries[task_no] > max_retries:
+                pending.remove(task_no)
+                mon = allargs[task_no][-1]
+                if hasattr(mon, 'unpickle'):
+                    mon = mon.unpickle()
+                msg = 'Task %s#%d was lost %d times' % (
+                    func.__name__, task_no, retries[task_no])
+                yield msg, RuntimeError, mon
+            else:
+                logging.warn('Resending task %s#%d of worker %s (retry %d)%s',
+                             func.__name__, task_no, worker, retries[task_no],
+                             '' if now - beat > lease_timeout else
+                             ', running for too long')
+                sender.send((func, allargs[task_no], task_no,
+                             heartbeat_interval))
+                sent[task_no] = nsent, now
+                nsent += 1
+        # a task sent before the death (or hang) of a worker, which has not
+        # started while a task sent after it has, may have been queued in
+        # that worker: it is resent without counting a retry, since it never
+        # ran; if it was queued in a live worker the duplicate is discarded
+        for task_no in sorted(pending - set(leases)):
+            seqno, sent_time = sent[task_no]
+            if sent_time < death and seqno < latest:
+                logging.warn('Resending task %s#%d, possibly queued in a '
+                             'dead or hanged worker', func.__name__, task_no)
+                sender.send((func, allargs[task_no], task_no,
+                             heartbeat_interval))
+                sent[task_no] = nsent, now
+                nsent += 1
+        if now - last > lease_timeout:
+            # nothing arrived for a while: the tasks not started yet may
+            # have been lost in the queue of a dead worker; they are resent
+            # without counting a retry, since they never ran
+            for task_no in sorted(pending - set(leases)):
+                logging.warn('Resending task %s#%d', func.__name__, task_no)
+                sender.send((func, allargs[task_no], task_no,
+                             heartbeat_interval))
+                sent[task_no] = nsent, now
+                nsent += 1
+            last = now
+
+
 class WorkerMaster(object):
     """
     :param master_host: hostname or IP of the master node
@@ -104,8 +257,9 @@ class WorkerMaster(object):
     :param remote_python: path of the Python executable on the remote hosts
     """
     def __init__(self, master_host, task_in_port, task_out_port, ctrl_port,
-                 host_cores, remote_python=None, receiver_ports=None):
-        # receiver_ports is not used
+                 host_cores, remote_python=None, receiver_ports=None,
+                 **kw):
+        # receiver_ports and the parameters of the leases are not used
         self.task_in_port = task_in_port
         self.task_out_url = 'tcp://%s:%s' % (master_host, task_out_port)
         self.ctrl_port = int(ctrl_port)
@@ -126,6 +280,21 @@ class WorkerMaster(object):
             lst.append((host, 'running' if ready else 'not-running'))
         return lst
 
+    def workers_status(self):
+        """
+        :returns: a list of tuples (hostname, pid, status) for each worker,
+                  where status is 'idle', 'dead' or the running task
+        """
+        lst = []
+        for host, status in self.status():
+            if status == 'not-running':
+                continue
+            ctrl_url = 'tcp://%s:%s' % (host, self.ctrl_port)
+            with z.Socket(ctrl_url, z.zmq.REQ, 'connect') as sock:
+                for pid, status in sock.send('get_status'):
+                    lst.append((host, pid, status))
+        return lst
+
     def start(self):
         """
         Start multiple workerpools, possibly on remote servers via ssh
@@ -188,7 +357,8 @@ class WorkerMaster(object):
 class WorkerPool(object):
     """
     A pool of workers accepting the command 'stop' and 'kill' and reading
-    tasks to perform from the task_out_port.
+    tasks to perform from the task_out_port. The workers which die
+    are replaced by new ones.
 
     :param ctrl_url: zmq address of the control socket
     :param task_out_port: zmq address of the task streamer
@@ -200,16 +370,64 @@ class WorkerPool(object):
         self.num_workers = (multiprocessing.cpu_count()
                             if num_workers == '-1' else int(num_workers))
         self.pid = os.getpid()
+        self.stopping = False
 
-    def worker(self, sock):
+    def worker(self, sock, status):
         """
-        :param sock: a zeromq.Socket of kind PULL receiving (cmd, args)
+        :param sock:
+            a zeromq.Socket of kind PULL receiving (cmd, args, task_no,
+            heartbeat_interval)
+        :param status:
+            a shared array of characters where the running task is stored
         """
         setproctitle('oq-zworker')
-        for cmd, args in sock:
+        # the zmq context inherited from the pool is not usable after a fork,
+        # since the pool has already open sockets, so a new one is needed
+        z.context = z.zmq.Context()
+        for cmd, args, task_no, heartbeat_interval in sock:
             backurl = args[-1].backurl  # attached to the monitor
+            task = '%s#%d' % (cmd.__name__, task_no)
+            status.value = task.encode('utf8')[:len(status) - 1]
+            with Heartbeat(backurl, task_no, heartbeat_interval):
+                res = safely_call(cmd, args)
             with z.Socket(backurl, z.zmq.PUSH, 'connect') as s:
-                s.send(safely_call(cmd, args))
+                s.send(('result', task_no, res))
+            status.value = b''
+
+    def _start_worker(self):
+        # start a worker process reading at most one task in advance
+        sock = z.Socket(self.task_out_port, z.zmq.PULL, 'connect', hwm=1)
+        sock.status = multiprocessing.Array('c', 128)
+        sock.proc = multiprocessing.Process(
+            target=self.worker, args=(sock, sock.status))
+        sock.proc.start()
+        sock.pid = sock.proc.pid
+        return sock
+
+    def _watchdog(self):
+        # replace the dead workers, until the pool is stopped
+        while not self.stopping:
+            for i, sock in enumerate(self.workers):
+                if not self.stopping and not sock.proc.is_alive():
+                    sock.proc.join()
+                    logging.warn('Worker %d died with exit code %s, '
+                                 'starting a new one', sock.pid,
+                                 sock.proc.exitcode)
+                    self.workers[i] = self._start_worker()
+            time.sleep(1)
+
+    def get_status(self):
+        """
+        :returns: a list of pairs (pid, status) for each worker
+        """
+        lst = []
+        for sock in self.workers:
+            if not sock.proc.is_alive():
+                status = 'dead'
+            else:
+                status = sock.status.value.decode('utf8') or 'idle'
+            lst.append((sock.pid, status))
+        return lst
 
     def start(self):
         """
@@ -217,13 +435,10 @@ class WorkerPool(object):
         """
         setproctitle('oq-zworkerpool %s' % self.ctrl_url[6:])  # strip tcp://
         # start workers
-        self.workers = []
-        for _ in range(self.num_workers):
-            sock = z.Socket(self.task_out_port, z.zmq.PULL, 'connect')
-            proc = multiprocessing.Process(target=self.worker, args=(sock,))
-            proc.start()
-            sock.pid = proc.pid
-            self.workers.append(sock)
+        self.workers = [self._start_worker() for _ in range(self.num_workers)]
+        watchdog = threading.Thread(target=self._watchdog)
+        watchdog.daemon = True
+        watchdog.start()
 
         # start control loop accepting the commands stop and kill
         ctrlsock = z.Socket(self.ctrl_url, z.zmq.REP, 'bind')
@@ -236,21 +451,27 @@ class WorkerPool(object):
                 ctrlsock.send(self.pid)
             elif cmd == 'get_num_workers':
                 ctrlsock.send(self.num_workers)
+            elif cmd == 'get_status':
+                ctrlsock.send(self.get_status())
 
     def stop(self):
         """
         Send a SIGTERM to all worker processes
         """
+        self.stopping = True
         for sock in self.workers:
-            os.kill(sock.pid, signal.SIGTERM)
+            if sock.proc.is_alive():
+                os.kill(sock.pid, signal.SIGTERM)
         return 'WorkerPool %s stopped' % self.ctrl_url
 
     def kill(self):
         """
         Send a SIGKILL to all worker processes
         """
+        self.stopping = True
         for sock in self.workers:
-            os.kill(sock.pid, signal.SIGKILL)
+            if sock.proc.is_alive():
+                os.kill(sock.pid, signal.SIGKILL)
         return 'WorkerPool %s killed' % self.ctrl_url
 
 
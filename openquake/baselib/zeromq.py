@@ -26,12 +26,22 @@ SOCKTYPE = {zmq.REQ: 'REQ', zmq.REP: 'REP',
             zmq.ROUTER: 'ROUTER', zmq.DEALER: 'DEALER'}
 
 
-def bind(end_point, socket_type):
+def _socket(socket_type, hwm=None):
+    # a new zmq socket, possibly with a high water mark, i.e. a maximum
+    # number of messages queued
+    sock = context.socket(socket_type)
+    if hwm is not None:
+        sock.setsockopt(zmq.SNDHWM, hwm)
+        sock.setsockopt(zmq.RCVHWM, hwm)
+    return sock
+
+
+def bind(end_point, socket_type, hwm=None):
     """
     Bind to a zmq URL; raise a proper error if the URL is invalid; return
-    a zmq socket.
+    a zmq socket, possibly with the given high water mark.
     """
-    sock = context.socket(socket_type)
+    sock = _socket(socket_type, hwm)
     try:
         sock.bind(end_point)
     except zmq.error.ZMQError as exc:
@@ -40,12 +50,12 @@ def bind(end_point, socket_type):
     return sock
 
 
-def connect(end_point, socket_type):
+def connect(end_point, socket_type, hwm=None):
     """
     Connect to a zmq URL; raise a proper error if the URL is invalid; return
-    a zmq socket.
+    a zmq socket, possibly with the given high water mark.
     """
-    sock = context.socket(socket_type)
+    sock = _socket(socket_type, hwm)
     try:
         sock.connect(end_point)
     except zmq.error.ZMQError as exc:
@@ -72,14 +82,17 @@ class Socket(object):
     :param socket_type: zmq socket type (integer)
     :param mode: default 'bind', accepts also 'connect'
     :param timeout: default 1000 ms, used when polling the underlying socket
+    :param hwm: high water mark of the underlying socket (default zmq's)
     """
-    def __init__(self, end_point, socket_type, mode='bind', timeout=1000):
+    def __init__(self, end_point, socket_type, mode='bind', timeout=1000,
+                 hwm=None):
         assert socket_type in (zmq.REP, zmq.REQ, zmq.PULL, zmq.PUSH)
         assert mode in ('bind', 'connect'), mode
         self.end_point = end_point
         self.socket_type = socket_type
         self.mode = mode
         self.timeout = timeout
+        self.hwm = hwm
         self.running = False
 
     def __enter__(self):
@@ -90,13 +103,13 @@ class Socket(object):
             assert self.mode == 'bind', self.mode
             p1, p2 = map(int, port_range.groups())
             end_point = self.end_point.rsplit(':', 1)[0]  # strip port range
-            self.zsocket = context.socket(self.socket_type)
+            self.zsocket = _socket(self.socket_type, self.hwm)
             port = self.zsocket.bind_to_random_port(end_point, p1, p2)
             self.port = port
         elif self.mode == 'bind':
-            self.zsocket = bind(self.end_point, self.socket_type)
+            self.zsocket = bind(self.end_point, self.socket_type, self.hwm)
         else:  # connect
-            self.zsocket = connect(self.end_point, self.socket_type)
+            self.zsocket = connect(self.end_point, self.socket_type, self.hwm)
         port = re.search(r':(\d+)$', self.end_point)
         if port:
             self.port = int(port.group(1))
@@ -147,6 +147,7 @@ class BaseCalculator(with_metaclass(abc.ABCMeta)):
         """
         mon = self._monitor(operation, hdf5path=self.datastore.hdf5path)
         self._monitor.calc_id = mon.calc_id = self.datastore.calc_id
+        mon.profiling_interval = self.oqparam.profiling_interval
         vars(mon).update(kw)
         return mon
 
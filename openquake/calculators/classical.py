@@ -93,6 +93,8 @@ class PSHACalculator(base.HazardCalculator):
         :param acc: accumulator dictionary
         :param pmap: dictionary grp_id -> ProbabilityMap
         """
+        for args in getattr(pmap, 'subtasks', ()):  # slow task
+            self.smap.resubmit(*args + (self.monitor('classical'),))
         with self.monitor('aggregate curves', autoflush=True):
             acc.eff_ruptures += pmap.eff_ruptures
             for grp_id in pmap:
@@ -140,8 +142,8 @@ class PSHACalculator(base.HazardCalculator):
                 # then the Starmap will understand the case of a single
                 # argument tuple and it will run in core the task
                 iterargs = list(iterargs)
-            ires = parallel.Starmap(
-                self.core_task.__func__, iterargs).submit_all()
+            self.smap = parallel.Starmap(self.core_task.__func__, iterargs)
+            ires = self.smap.submit_all()
         acc = ires.reduce(self.agg_dicts, self.zerodict())
         with self.monitor('store source_info', autoflush=True):
             self.store_source_info(self.csm.infos, acc)
@@ -163,6 +165,11 @@ class PSHACalculator(base.HazardCalculator):
         else:
             tiles = [self.sitecol]
         param = dict(truncation_level=oq.truncation_level, imtls=oq.imtls)
+        if oq.task_duration and parallel.oq_distribute() in ('zmq', 'qsub'):
+            logging.warn('task_duration is ignored with OQ_DISTRIBUTE=%s',
+                         parallel.oq_distribute())
+        elif oq.task_duration:
+            param['task_duration'] = oq.task_duration
         for tile_i, tile in enumerate(tiles, 1):
             num_tasks = 0
             num_sources = 0
@@ -170,6 +177,7 @@ class PSHACalculator(base.HazardCalculator):
                 logging.info('Prefiltering tile %d of %d', tile_i, len(tiles))
                 src_filter = SourceFilter(tile, oq.maximum_distance)
                 csm = self.csm.filter(src_filter)
+            src_filter = parallel.Shared(csm.src_filter)  # read-only
             maxweight = csm.get_maxweight(tasks_per_tile)
             numheavy = len(csm.get_sources('heavy', maxweight))
             logging.info('Using maxweight=%d, numheavy=%d',
@@ -180,14 +188,14 @@ class PSHACalculator(base.HazardCalculator):
             for sg in csm.src_groups:
                 if sg.src_interdep == 'mutex':
                     gsims = self.csm.info.gsim_lt.get_gsims(sg.trt)
-                    yield sg, csm.src_filter, gsims, param, monitor
+                    yield sg, src_filter, gsims, param, monitor
                     num_tasks += 1
                     num_sources += len(sg.sources)
             # NB: csm.get_sources_by_trt discards the mutex sources
             for trt, sources in csm.get_sources_by_trt(opt).items():
                 gsims = self.csm.info.gsim_lt.get_gsims(trt)
                 for block in csm.split_in_blocks(maxweight, sources):
-                    yield block, csm.src_filter, gsims, param, monitor
+                    yield block, src_filter, gsims, param, monitor
                     num_tasks += 1
                     num_sources += len(block)
             logging.info('Sent %d sources in %d tasks', num_sources, num_tasks)
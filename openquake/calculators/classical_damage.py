@@ -18,7 +18,7 @@
 
 import numpy
 
-from openquake.baselib.general import AccumDict
+from openquake.baselib.general import groupby
 from openquake.hazardlib.stats import compute_stats2
 from openquake.calculators import base, classical_risk
 
@@ -36,14 +36,24 @@ def classical_damage(riskinput, riskmodel, param, monitor):
     :param monitor:
         :class:`openquake.baselib.performance.Monitor` instance
     :returns:
-        a nested dictionary rlz_idx -> asset -> <damage array>
+        a dictionary with a list of pairs (asset ordinals, damages), where
+        the damages are arrays of shape (N, R, D), being N the number of
+        assets in the block, R the number of realizations and D the number
+        of damage states
     """
     R = riskinput.hazard_getter.num_rlzs
-    result = {i: AccumDict() for i in range(R)}
-    for outputs in riskmodel.gen_outputs(riskinput, monitor):
-        for l, out in enumerate(outputs):
-            ordinals = [a.ordinal for a in outputs.assets]
-            result[outputs.rlzi] += dict(zip(ordinals, out))
+    D = len(riskmodel.damage_states)
+    result = dict(damages=[])
+    # group the outputs for the same block of assets, one per realization
+    outputs_by_assets = groupby(riskmodel.gen_outputs(riskinput, monitor),
+                                lambda o: tuple(o.assets))
+    for assets, outs in outputs_by_assets.items():
+        aids = numpy.array([asset.ordinal for asset in assets])
+        damages = numpy.zeros((len(aids), R, D))
+        for out in outs:
+            for l in range(len(riskmodel.lti)):
+                damages[:, out.rlzi] += out[l]
+        result['damages'].append((aids, damages))
     return result
 
 
@@ -59,14 +69,16 @@ class ClassicalDamageCalculator(classical_risk.ClassicalRiskCalculator):
         Export the result in CSV format.
 
         :param result:
-            a dictionary asset -> fractions per damage state
+            a dictionary with a list of pairs (asset ordinals, damages)
         """
         damages_dt = numpy.dtype([(ds, numpy.float32)
                                   for ds in self.riskmodel.damage_states])
+        array = numpy.zeros((self.A, self.R, len(damages_dt.names)))
+        for aids, dmg in result['damages']:
+            array[aids] += dmg
         damages = numpy.zeros((self.A, self.R), damages_dt)
-        for r in result:
-            for aid, fractions in result[r].items():
-                damages[aid, r] = tuple(fractions)
+        for d, ds in enumerate(damages_dt.names):
+            damages[ds] = array[:, :, d]
         self.datastore['damages-rlzs'] = damages
         weights = [rlz.weight for rlz in self.rlzs_assoc.realizations]
         if len(weights) > 1:  # compute stats
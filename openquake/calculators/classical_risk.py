@@ -16,9 +16,9 @@
 # You should have received a copy of the GNU Affero General Public License
 # along with OpenQuake. If not, see <http://www.gnu.org/licenses/>.
 import numpy
-from openquake.baselib.general import groupby, AccumDict
+from openquake.baselib.general import groupby
 from openquake.baselib.python3compat import encode
-from openquake.hazardlib.stats import compute_stats
+from openquake.hazardlib.stats import compute_stats2
 from openquake.risklib import scientific
 from openquake.commonlib import readinput, source
 from openquake.calculators import base
@@ -41,46 +41,44 @@ def classical_risk(riskinput, riskmodel, param, monitor):
         :class:`openquake.baselib.performance.Monitor` instance
     """
     result = dict(loss_curves=[], stat_curves=[])
-    all_outputs = list(riskmodel.gen_outputs(riskinput, monitor))
-    for outputs in all_outputs:
-        r = outputs.rlzi
-        outputs.average_losses = AccumDict(accum=[])  # l -> array
-        for l, loss_curves in enumerate(outputs):
-            # loss_curves has shape (C, N, 2)
-            for i, asset in enumerate(outputs.assets):
-                aid = asset.ordinal
-                avg = scientific.average_loss(loss_curves[:, i].T)
-                outputs.average_losses[l].append(avg)
-                lcurve = (loss_curves[:, i, 0], loss_curves[:, i, 1], avg)
-                result['loss_curves'].append((l, r, aid, lcurve))
-
-    # compute statistics
     R = riskinput.hazard_getter.num_rlzs
-    w = param['weights']
     statnames, stats = zip(*param['stats'])
-    l_idxs = range(len(riskmodel.lti))
-    for assets, outs in groupby(
-            all_outputs, lambda o: tuple(o.assets)).items():
-        weights = [w[out.rlzi] for out in outs]
-        out = outs[0]
-        for l in l_idxs:
-            for i, asset in enumerate(assets):
-                avgs = numpy.array([r.average_losses[l][i] for r in outs])
-                avg_stats = compute_stats(avgs, stats, weights)
-                # is a pair loss_curves, insured_loss_curves
-                # out[l][:, i, 0] are the i-th losses
-                # out[l][:, i, 1] are the i-th poes
-                losses = out[l][:, i, 0]
-                poes_stats = compute_stats(
-                    numpy.array([out[l][:, i, 1] for out in outs]),
-                    stats, weights)
-                result['stat_curves'].append(
-                    (l, asset.ordinal, losses, poes_stats, avg_stats))
-    if R == 1:  # the realization is the same as the mean
-        del result['loss_curves']
+    # group the outputs for the same block of assets, one per realization
+    outputs_by_assets = groupby(riskmodel.gen_outputs(riskinput, monitor),
+                                lambda o: tuple(o.assets))
+    for assets, outs in outputs_by_assets.items():
+        aids = numpy.array([asset.ordinal for asset in assets])
+        rlzs = [out.rlzi for out in outs]
+        weights = [param['weights'][r] for r in rlzs]
+        for l in range(len(riskmodel.lti)):
+            # each out[l] has shape (C, N, 2), curves has shape (N, R, C, 2)
+            curves = numpy.array([out[l] for out in outs]).transpose(
+                2, 0, 1, 3)
+            losses = curves[:, :, :, 0]
+            poes = curves[:, :, :, 1]
+            avgs = scientific.average_losses(losses, poes)  # shape (N, R)
+            if R > 1:  # otherwise the realization is the same as the mean
+                result['loss_curves'].append(
+                    (l, aids, rlzs, losses, poes, avgs))
+            result['stat_curves'].append(
+                (l, aids, losses[:, 0],
+                 compute_stats2(poes, stats, weights),
+                 compute_stats2(avgs, stats, weights)))
     return result
 
 
+def set_curves(longarray, aids, shortarray):
+    """
+    Fill the rows `aids` of `longarray` with the values of `shortarray`,
+    starting from the left; the remaining elements on the right are filled
+    with `numpy.nan` values, as in
+    :func:`openquake.calculators.base.set_array`.
+    """
+    C = shortarray.shape[-1]
+    longarray[aids, ..., :C] = shortarray
+    longarray[aids, ..., C:] = numpy.nan
+
+
 @base.calculators.add('classical_risk')
 class ClassicalRiskCalculator(base.RiskCalculator):
     """
@@ -137,13 +135,12 @@ class ClassicalRiskCalculator(base.RiskCalculator):
         # loss curves stats are generated always
         stats = [encode(n) for (n, f) in self.oqparam.risk_stats()]
         stat_curves = numpy.zeros((self.A, self.S), self.loss_curve_dt)
-        avg_losses = numpy.zeros((self.A, self.R, self.L * self.I), F32)
-        for l, a, losses, statpoes, statloss in result['stat_curves']:
+        avg_losses = numpy.zeros((self.A, self.S, self.L * self.I), F32)
+        for l, aids, losses, statpoes, statloss in result['stat_curves']:
             stat_curves_lt = stat_curves[ltypes[l]]
-            for s in range(self.S):
-                avg_losses[a, s, l] = statloss[s]
-                base.set_array(stat_curves_lt['poes'][a, s], statpoes[s])
-                base.set_array(stat_curves_lt['losses'][a, s], losses)
+            avg_losses[aids, :, l] = statloss
+            set_curves(stat_curves_lt['poes'], aids, statpoes)
+            set_curves(stat_curves_lt['losses'], aids, losses[:, None])
         self.datastore['avg_losses-stats'] = avg_losses
         self.datastore.set_attrs('avg_losses-stats', stats=stats)
         self.datastore['loss_curves-stats'] = stat_curves
@@ -152,10 +149,11 @@ class ClassicalRiskCalculator(base.RiskCalculator):
         if self.R > 1:  # individual realizations saved only if many
             loss_curves = numpy.zeros((self.A, self.R), self.loss_curve_dt)
             avg_losses = numpy.zeros((self.A, self.R, self.L * self.I), F32)
-            for l, r, a, (losses, poes, avg) in result['loss_curves']:
-                lc = loss_curves[a, r][ltypes[l]]
-                avg_losses[a, r, l] = avg
-                base.set_array(lc['losses'], losses)
-                base.set_array(lc['poes'], poes)
+            for l, aids, rlzs, losses, poes, avgs in result['loss_curves']:
+                lc = loss_curves[ltypes[l]]
+                for i, r in enumerate(rlzs):
+                    avg_losses[aids, r, l] = avgs[:, i]
+                    set_curves(lc['losses'][:, r], aids, losses[:, i])
+                    set_curves(lc['poes'][:, r], aids, poes[:, i])
             self.datastore['avg_losses-rlzs'] = avg_losses
             self.datastore['loss_curves-rlzs'] = loss_curves
@@ -272,13 +272,14 @@ class EventBasedRuptureCalculator(base.HazardCalculator):
 
         num_tasks = 0
         num_sources = 0
+        src_filter = parallel.Shared(csm.src_filter)  # read-only
         for sm in csm.source_models:
             for sg in sm.src_groups:
                 gsims = csm.info.gsim_lt.get_gsims(sg.trt)
                 csm.add_infos(sg.sources)
                 for block in csm.split_in_blocks(maxweight, sg.sources):
                     block.samples = sm.samples
-                    yield block, csm.src_filter, gsims, param, monitor
+                    yield block, src_filter, gsims, param, monitor
                     num_tasks += 1
                     num_sources += len(block)
         logging.info('Sent %d sources in %d tasks', num_sources, num_tasks)
@@ -360,18 +361,17 @@ def compute_gmfs_and_curves(getters, oq, monitor):
             duration = oq.investigation_time * oq.ses_per_logic_tree_path
             with monitor('building hazard', measuremem=True):
                 gmfdata = numpy.fromiter(getter.gen_gmv(), getter.gmf_data_dt)
-                hazard = getter.get_hazard(data=gmfdata)
-            for sid, hazardr in zip(getter.sids, hazard):
-                for rlzi, array in hazardr.items():
-                    if len(array) == 0:  # no data
-                        continue
-                    with hc_mon:
-                        gmvs = array['gmv']
-                        for imti, imt in enumerate(getter.imtls):
-                            poes = calc._gmvs_to_haz_curve(
-                                gmvs[:, imti], oq.imtls[imt],
-                                oq.investigation_time, duration)
-                            hcurves[rsi2str(rlzi, sid, imt)] = poes
+            with hc_mon:
+                for rlzi in numpy.unique(gmfdata['rlzi']):
+                    data = gmfdata[gmfdata['rlzi'] == rlzi]
+                    # consider only the sites with data
+                    sids, idxs = numpy.unique(data['sid'], return_inverse=True)
+                    for imti, imt in enumerate(getter.imtls):
+                        poes = calc.gmvs_to_poes(
+                            data['gmv'][:, imti], oq.imtls[imt],
+                            oq.investigation_time, duration, idxs)
+                        for sid, poes_ in zip(sids, poes):
+                            hcurves[rsi2str(rlzi, sid, imt)] = poes_
         else:  # fast lane
             with monitor('building hazard', measuremem=True):
                 gmfdata = numpy.fromiter(getter.gen_gmv(), getter.gmf_data_dt)
@@ -293,6 +293,25 @@ hazard_uhs-mean.csv
         self.assertEqual(sorted(ra.by_grp()), ['grp-00', 'grp-01'])
         numpy.testing.assert_equal(ra.by_grp()['grp-00'][0], [0, [0, 1]])
 
+    @attr('qa', 'hazard', 'classical')
+    def test_case_15_task_duration(self):
+        # the tasks exceeding the task_duration send back their unprocessed
+        # sources as new tasks; the PoEs must not change, apart from
+        # rounding: the probability maps of the sources are composed with
+        # |=, i.e. 1 - (1 - p1) * (1 - p2), in a different order, and the
+        # composition is not associative in floating point arithmetic
+        self.run_calc(case_15.__file__, 'job.ini')
+        poes = {key: self.calc.datastore['poes/' + key].array
+                for key in self.calc.datastore['poes']}
+        ntasks = len(self.calc.datastore['task_info/classical'])
+        self.run_calc(case_15.__file__, 'job.ini', task_duration='1E-9')
+        self.assertGreater(
+            len(self.calc.datastore['task_info/classical']), ntasks)
+        for key in poes:
+            numpy.testing.assert_allclose(
+                self.calc.datastore['poes/' + key].array, poes[key],
+                rtol=1E-12)
+
     @attr('qa', 'hazard', 'classical')
     def test_case_16(self):   # sampling
         self.assert_curves_ok(
@@ -31,7 +31,7 @@ from openquake.baselib.general import (
     humansize, groupby, DictArray, AccumDict, CallableDict)
 from openquake.baselib.performance import perf_dt
 from openquake.baselib.general import get_array
-from openquake.baselib.python3compat import unicode, decode
+from openquake.baselib.python3compat import unicode, decode, encode
 from openquake.baselib.general import group_array
 from openquake.hazardlib import valid, stats as hstats
 from openquake.hazardlib.gsim.base import ContextMaker
@@ -510,6 +510,33 @@ def view_performance(token, dstore):
     return rst_table(performance_view(dstore))
 
 
+@view.add('performance_stacks')
+def view_performance_stacks(token, dstore):
+    """
+    Display the stacks sampled by the profiler in the folded format
+    used by the flame graph tools, i.e. one line per stack with the
+    number of samples at the end. Here are a few examples of usage::
+
+     $ oq show performance_stacks > stacks.txt  # all operations
+     $ oq show performance_stacks:classical > stacks.txt  # a single task
+     $ flamegraph.pl stacks.txt > flamegraph.svg
+
+    The sampling profiler is enabled by setting the parameter
+    `profiling_interval` in the job.ini, for instance to 0.01 seconds.
+    """
+    if 'performance_stacks' not in dstore:
+        return 'No stacks sampled: set profiling_interval in the job.ini'
+    if ':' in token:
+        operation = encode('total ' + token.split(':', 1)[1])
+    else:
+        operation = None
+    counts = collections.Counter()
+    for op, stack, n in dstore['performance_stacks'].value:
+        if operation is None or op == operation:
+            counts[decode(stack)] += n
+    return '\n'.join('%s %d' % item for item in sorted(counts.items()))
+
+
 def stats(name, array, *extras):
     """
     Returns statistics from an array of numbers.
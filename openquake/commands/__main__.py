@@ -31,14 +31,32 @@ if os.environ['OQ_DISTRIBUTE'] == 'celery' and 'run' in sys.argv:
              'Use oq engine --run instead!')
 
 
+def get_scripts(cmd=None):
+    """
+    Import the modules in openquake.commands and return the associated
+    scripts. If `cmd` is the name of a module defining a script with the
+    same name, import only that module, so that commands like `oq show`
+    do not pay the cost of importing all the other commands.
+
+    :param cmd: the name of the subcommand, or None
+    :returns: a list of :class:`openquake.baselib.sap.Script` instances
+    """
+    cmds = [mod[:-3] for mod in os.listdir(commands.__path__[0])
+            if mod.endswith('.py') and not mod.startswith('_')]
+    if cmd in cmds:
+        importlib.import_module('openquake.commands.' + cmd)
+        script = sap.Script.registry.get(
+            'openquake.commands.%s.%s' % (cmd, cmd))
+        if script:
+            return [script]
+    for modname in cmds:
+        importlib.import_module('openquake.commands.' + modname)
+    return list(sap.Script.registry.values())
+
+
 def oq():
-    modnames = ['openquake.commands.%s' % mod[:-3]
-                for mod in os.listdir(commands.__path__[0])
-                if mod.endswith('.py') and not mod.startswith('_')]
-    for modname in modnames:
-        importlib.import_module(modname)
-    parser = sap.compose(sap.Script.registry.values(),
-                         prog='oq', version=__version__)
+    cmd = sys.argv[1] if len(sys.argv) > 1 else None
+    parser = sap.compose(get_scripts(cmd), prog='oq', version=__version__)
     parser.callfunc()
 
 if __name__ == '__main__':
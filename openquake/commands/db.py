@@ -19,7 +19,6 @@ import ast
 import inspect
 from decorator import getfullargspec
 from openquake.baselib import sap
-from openquake.calculators.views import rst_table
 from openquake.commonlib import logs
 from openquake.server import dbserver
 from openquake.server.db import actions
@@ -60,6 +59,8 @@ def db(cmd, args=()):
         dbserver.ensure_on()
         res = logs.dbcmd(cmd, *convert(args))
         if hasattr(res, '_fields') and res.__class__.__name__ != 'Row':
+            # imported here since importing the calculators is slow
+            from openquake.calculators.views import rst_table
             print(rst_table(res))
         else:
             print(res)
@@ -21,7 +21,6 @@ import os
 import logging
 
 from openquake.baselib import general, performance, sap, datastore
-from openquake.calculators.export import export as export_
 
 
 # the export is tested in the demos
@@ -30,6 +29,8 @@ def export(datastore_key, calc_id=-1, exports='csv', export_dir='.'):
     """
     Export an output from the datastore.
     """
+    # imported here since importing the calculators is slow
+    from openquake.calculators.export import export as export_
     logging.basicConfig(level=logging.INFO)
     dstore = datastore.read(calc_id)
     parent_id = dstore['oqparam'].hazard_calculation_id
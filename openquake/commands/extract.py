@@ -23,7 +23,6 @@ import logging
 from openquake.baselib import performance, sap, hdf5, datastore
 
 from openquake.commonlib.logs import dbcmd
-from openquake.calculators.extract import extract as extract_
 from openquake.server import dbserver
 
 
@@ -33,6 +32,8 @@ def extract(calc_id, what, extra):
     """
     Extract an output from the datastore and save it into an .hdf5 file.
     """
+    # imported here since importing the calculators is slow
+    from openquake.calculators.extract import extract as extract_
     logging.basicConfig(level=logging.INFO)
     if dbserver.get_status() == 'running':
         job = dbcmd('get_job', calc_id)
@@ -30,16 +30,16 @@ from openquake.baselib.performance import Monitor
 from openquake.baselib.parallel import get_pickled_sizes
 from openquake.hazardlib import gsim, nrml, InvalidFile
 from openquake.commonlib import readinput
-from openquake.calculators.export import export
-from openquake.calculators.extract import extract
-from openquake.calculators import base, reportwriter
-from openquake.calculators.views import view, rst_table
+
+# NB: the modules in openquake.calculators are imported only when needed,
+# since importing them is expensive and slows down `oq info --help`
 
 
 def source_model_info(node):
     """
     Extract information about a NRML/0.5 source model
     """
+    from openquake.calculators.views import rst_table
     trts = []
     counters = []
     src_classes = set()
@@ -69,6 +69,7 @@ def print_csm_info(fname):
     Parse the composite source model without instantiating the sources and
     prints information about its composition and the full logic tree
     """
+    from openquake.calculators.views import rst_table
     oqparam = readinput.get_oqparam(fname)
     csm = readinput.get_composite_source_model(oqparam, in_memory=False)
     print(csm.info)
@@ -88,6 +89,7 @@ def do_build_reports(directory):
     Walk the directory and builds pre-calculation reports for all the
     job.ini files found.
     """
+    from openquake.calculators import reportwriter
     for cwd, dirs, files in os.walk(directory):
         for f in sorted(files):
             if f in ('job.ini', 'job_h.ini', 'job_haz.ini', 'job_hazard.ini'):
@@ -109,15 +111,18 @@ def info(calculators, gsims, views, exports, extracts, report, input_file=''):
     """
     logging.basicConfig(level=logging.INFO)
     if calculators:
+        from openquake.calculators import base
         for calc in sorted(base.calculators):
             print(calc)
     if gsims:
-        for gs in gsim.get_available_gsims():
+        for gs in gsim.registry:
             print(gs)
     if views:
+        from openquake.calculators.views import view
         for name in sorted(view):
             print(name)
     if exports:
+        from openquake.calculators.export import export
         dic = groupby(export, operator.itemgetter(0),
                       lambda group: [r[1] for r in group])
         n = 0
@@ -126,6 +131,7 @@ def info(calculators, gsims, views, exports, extracts, report, input_file=''):
             n += len(formats)
         print('There are %d exporters defined.' % n)
     if extracts:
+        from openquake.calculators.extract import extract
         for key in extract:
             func = extract[key]
             if hasattr(func, '__wrapped__'):
@@ -152,6 +158,7 @@ def info(calculators, gsims, views, exports, extracts, report, input_file=''):
     elif input_file.endswith(('.ini', '.zip')):
         with Monitor('info', measuremem=True) as mon:
             if report:
+                from openquake.calculators import reportwriter
                 print('Generated', reportwriter.build_report(input_file))
             else:
                 print_csm_info(input_file)
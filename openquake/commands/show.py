@@ -23,13 +23,8 @@ import logging
 import numpy
 
 from openquake.baselib import sap, config
-from openquake.hazardlib import stats
 from openquake.baselib import datastore
-from openquake.commonlib.writers import write_csv
-from openquake.commonlib.util import rmsep
-from openquake.commonlib import logs, calc
-from openquake.calculators.views import view
-from openquake.calculators.extract import extract
+from openquake.commonlib import logs
 
 if config.dbserver.multi_user:
     def read(calc_id):
@@ -49,6 +44,7 @@ def get_hcurves_and_means(dstore):
 
     :returns: curves_by_rlz, mean_curves
     """
+    from openquake.commonlib import calc
     getter = calc.PmapGetter(dstore)
     sitecol = dstore['sitecol']
     pmaps = getter.get_pmaps(sitecol.sids)
@@ -82,6 +78,14 @@ def show(what='contents', calc_id=-1, extra=()):
             print('#%d %s: %s' % row)
         return
 
+    # NB: the imports are here to make `oq show all` and `oq show --help`
+    # fast, since importing the calculators is expensive
+    from openquake.hazardlib import stats
+    from openquake.commonlib.writers import write_csv
+    from openquake.commonlib.util import rmsep
+    from openquake.commonlib import calc
+    from openquake.calculators.views import view
+    from openquake.calculators.extract import extract
     ds = read(calc_id)
 
     # this part is experimental
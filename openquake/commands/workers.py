@@ -30,5 +30,8 @@ def workers(cmd):
 
     master = workerpool.WorkerMaster(**config.zworkers)
     print(getattr(master, cmd)())
+    if cmd == 'status':
+        for host, pid, status in master.workers_status():
+            print('%s %d %s' % (host, pid, status))
 
 workers.arg('cmd', 'command', choices='start stop status restart'.split())
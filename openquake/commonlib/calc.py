@@ -337,6 +337,62 @@ def _gmvs_to_haz_curve(gmvs, imls, invest_time, duration):
     return poes
 
 
+def count_exceedances(gmvs, imls, idxs, num):
+    """
+    Count the ground motion values greater or equal than each intensity
+    measure level, for each group of values (typically a site). The counting
+    is performed by sorting the levels and locating each value among them
+    with `numpy.searchsorted`, so the cost is O(G log L) instead of O(G L).
+
+    :param gmvs: an array of G ground motion values
+    :param imls: an array of L intensity measure levels
+    :param idxs: an array of G group indices in the range 0 .. num - 1
+    :param num: the number of groups
+    :returns: an array of integers of shape (num, L)
+    """
+    imls = numpy.asarray(imls)
+    L = len(imls)
+    order = numpy.argsort(imls, kind='mergesort')
+    # a value exceeds the sorted level l iff more than l levels are <= value
+    nlevels = numpy.searchsorted(imls[order], gmvs, 'right')
+    hist = numpy.bincount(idxs * (L + 1) + nlevels,
+                          minlength=num * (L + 1)).reshape(num, L + 1)
+    counts = numpy.empty((num, L), hist.dtype)
+    counts[:, order] = hist[:, ::-1].cumsum(axis=1)[:, -2::-1]
+    return counts
+
+
+def gmvs_to_poes(gmvs, imls, invest_time, duration, idxs=None):
+    """
+    Vectorized version of :func:`_gmvs_to_haz_curve`, computing the hazard
+    curves of several sites at once.
+
+    :param gmvs:
+        an array of shape (N, E) with the ground motion values of N sites
+        and E events, or an array of shape G if `idxs` is given
+    :param imls:
+        an array of L intensity measure levels
+    :param float invest_time:
+        investigation time, in years
+    :param float duration:
+        time window during which the GMFs occur
+    :param idxs:
+        if given, an array of G site indices in the range 0 .. N - 1, each
+        index appearing at least once
+    :returns:
+        an array of PoEs of shape (N, L)
+    """
+    gmvs = numpy.asarray(gmvs)
+    if idxs is None:
+        N, E = gmvs.shape
+        idxs = numpy.repeat(numpy.arange(N), E)
+        gmvs = gmvs.reshape(-1)
+    else:
+        N = idxs.max() + 1 if len(idxs) else 0
+    num_exceeding = count_exceedances(gmvs, imls, idxs, N)
+    return 1 - numpy.exp(- (invest_time / duration) * num_exceeding)
+
+
 # ################## utilities for classical calculators ################ #
 
 def get_imts_periods(imtls):
@@ -167,12 +167,26 @@ def sample(weighted_objects, num_samples, seed):
         A subsequence of the original sequence with `num_samples` elements
     """
     weights = numpy.array([float(obj.weight) for obj in weighted_objects])
-    numpy.random.seed(seed)
-    idxs = numpy.random.choice(len(weights), num_samples, p=weights)
+    # NB: a local random state leaves the global numpy RNG untouched
+    idxs = numpy.random.RandomState(seed).choice(
+        len(weights), num_samples, p=weights)
     # NB: returning an array would break things
     return [weighted_objects[idx] for idx in idxs]
 
 
+def get_cdf(weighted_objects):
+    """
+    :param weighted_objects:
+        A finite sequence of objects with a `.weight` attribute
+    :returns:
+        An array with the cumulative weights normalized to 1, computed
+        exactly as in `numpy.random.choice`
+    """
+    cdf = numpy.array([float(obj.weight) for obj in weighted_objects]).cumsum()
+    cdf /= cdf[-1]
+    return cdf
+
+
 class Branch(object):
     """
     Branch object, represents a ``<logicTreeBranch />`` element.
@@ -604,14 +618,45 @@ class SourceModelLogicTree(object):
 
         :param seed: the seed used for the sampling
         """
-        branchset = self.root_branchset
-        branch_ids = []
-        while branchset is not None:
-            [branch] = sample(branchset.branches, 1, seed)
-            branch_ids.append(branch.branch_id)
-            branchset = branch.child_branchset
-        modelname = self.root_branchset.get_branch_by_id(branch_ids[0]).value
-        return modelname, branch_ids
+        [branch_ids] = self.sample_paths([seed])
+        return self.branches[branch_ids[0]].value, branch_ids
+
+    def sample_paths(self, seeds):
+        """
+        Sample a path for each seed in a single pass over the tree. The path
+        for a given seed is the one returned by `sample(branches, 1, seed)`
+        at each branchset, since such calls all draw the same uniform number.
+
+        :param seeds: a sequence of S seeds
+        :returns: a list of S lists of branch ids
+        """
+        rng = numpy.random.RandomState()  # reseeding is cheaper than creating
+        uniforms = numpy.zeros(len(seeds))
+        for i, seed in enumerate(seeds):
+            rng.seed(seed)
+            uniforms[i] = rng.random_sample()
+        paths = [[] for _ in uniforms]
+        self._sample_branches(self.root_branchset, numpy.arange(len(paths)),
+                              uniforms, paths, {})
+        return paths
+
+    def _sample_branches(self, branchset, sids, uniforms, paths, cdfs):
+        # append to the paths of the samples `sids` the branches sampled
+        # from the given branchset and from its children
+        try:
+            cdf = cdfs[branchset]
+        except KeyError:
+            cdf = cdfs[branchset] = get_cdf(branchset.branches)
+        idxs = cdf.searchsorted(uniforms[sids], side='right')
+        for idx, branch in enumerate(branchset.branches):
+            bsids = sids[idxs == idx]
+            if not len(bsids):
+                continue
+            for sid in bsids:
+                paths[sid].append(branch.branch_id)
+            if branch.child_branchset is not None:
+                self._sample_branches(
+                    branch.child_branchset, bsids, uniforms, paths, cdfs)
 
     def __iter__(self):
         """
@@ -622,8 +667,9 @@ class SourceModelLogicTree(object):
         if self.num_samples:
             # random sampling of the logic tree
             weight = 1. / self.num_samples
-            for i in range(self.num_samples):
-                name, sm_lt_path = self.sample_path(self.seed + i)
+            seeds = range(self.seed, self.seed + self.num_samples)
+            for sm_lt_path in self.sample_paths(seeds):
+                name = self.branches[sm_lt_path[0]].value
                 yield Realization(name, weight, tuple(sm_lt_path), None,
                                   tuple(sm_lt_path))
         else:  # full enumeration
@@ -1058,21 +1104,31 @@ class SourceModelLogicTree(object):
             Function to be applied to all the sources as they get read from
             the database and converted to hazardlib representation. Function
             takes one argument, that is the hazardlib source object, and
-            applies uncertainties to it in-place.
+            applies uncertainties to it in-place. It has an attribute
+            `get_branch_ids`, a function returning the IDs of the branches
+            whose uncertainties modify the given source; sources with
+            the same ID of branches are modified in the same way.
         """
         branchset = self.root_branchset
         branchsets_and_uncertainties = []
+        branchsets_and_ids = []
         branch_ids = list(branch_ids[::-1])
 
         while branchset is not None:
             branch = branchset.get_branch_by_id(branch_ids.pop(-1))
             if not branchset.uncertainty_type == 'sourceModel':
                 branchsets_and_uncertainties.append((branchset, branch.value))
+                branchsets_and_ids.append((branchset, branch.branch_id))
             branchset = branch.child_branchset
 
         def apply_uncertainties(source):
             for branchset, value in branchsets_and_uncertainties:
                 branchset.apply_uncertainty(value, source)
+
+        def get_branch_ids(source):
+            return tuple(branch_id for branchset, branch_id in
+                         branchsets_and_ids if branchset.filter_source(source))
+        apply_uncertainties.get_branch_ids = get_branch_ids
         return apply_uncertainties
 
     def samples_by_lt_path(self):
@@ -1292,21 +1348,17 @@ class GsimLogicTree(object):
         groups = []
         # NB: branches are already sorted
         for trt in self.all_trts:
-            groups.append([b for b in self.branches
+            groups.append([(b.id, b.id if b.effective else '@',
+                            b.weight, b.uncertainty) for b in self.branches
                            if b.bset['applyToTectonicRegionType'] == trt])
         # with T tectonic region types there are T groups and T branches
         for i, branches in enumerate(itertools.product(*groups)):
+            lt_path, lt_uid, weights, value = (
+                zip(*branches) if branches else ((), (), (), ()))
             weight = 1
-            lt_path = []
-            lt_uid = []
-            value = []
-            for trt, branch in zip(self.all_trts, branches):
-                lt_path.append(branch.id)
-                lt_uid.append(branch.id if branch.effective else '@')
-                weight *= branch.weight
-                value.append(branch.uncertainty)
-            yield Realization(tuple(value), weight, tuple(lt_path),
-                              i, tuple(lt_uid))
+            for w in weights:
+                weight *= w
+            yield Realization(value, weight, lt_path, i, lt_uid)
 
     def __repr__(self):
         lines = ['%s,%s,%s,w=%s' % (b.bset['applyToTectonicRegionType'],
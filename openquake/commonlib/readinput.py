@@ -24,14 +24,17 @@ import zipfile
 import logging
 import operator
 import tempfile
+import functools
 import collections
 import numpy
 from shapely import wkt, geometry
 
-from openquake.baselib.general import groupby, AccumDict, DictArray, deprecated
+from openquake.baselib.general import (
+    groupby, AccumDict, DictArray, deprecated, block_splitter)
 from openquake.baselib.python3compat import configparser, decode
 from openquake.baselib.node import Node, context
-from openquake.baselib import hdf5
+from openquake.baselib import hdf5, config, parallel
+from openquake.baselib.performance import Monitor
 from openquake.hazardlib import (
     calc, geo, site, imt, valid, sourceconverter, nrml, InvalidFile)
 from openquake.hazardlib.source.rupture import EBRupture
@@ -401,6 +404,62 @@ def get_source_model_lt(oqparam):
         num_samples=oqparam.number_of_logic_tree_samples)
 
 
+def get_source_cache_dir():
+    """
+    :returns: the directory where to cache the parsed source models,
+              as set in the configuration file, or None
+    """
+    cache_dir = config.directory.get('source_cache_dir')
+    if cache_dir:
+        return os.path.expanduser(cache_dir)
+
+
+def convert_sources(src_nodes, blockno, converter, monitor):
+    """
+    Convert a block of source nodes.
+
+    :param src_nodes:
+        a block of source nodes
+    :param blockno:
+        the ordinal of the block
+    :param converter:
+        a :class:`openquake.hazardlib.sourceconverter.SourceConverter`
+    :param monitor:
+        a :class:`openquake.baselib.performance.Monitor` instance
+    :returns:
+        a dictionary blockno -> list of converted sources
+    """
+    return {blockno: [converter.convert_node(node) for node in src_nodes]}
+
+
+def convert_sources_in_parallel(src_nodes, converter, sources_per_task):
+    """
+    Convert the source nodes in parallel with blocks of `sources_per_task`
+    nodes. The blocks are sent while the nodes are being read and the
+    sources are returned in the same order of the nodes.
+
+    The nodes and the converted sources are pickled and transferred, so
+    this is worth it only with several cores and sources which are slow to
+    convert: on a single core utils/bench_source_conversion runs at 0.6x
+    the speed of the serial conversion. For this reason the parallel
+    conversion is disabled by default (sources_per_conversion_task = 0).
+
+    :param src_nodes:
+        an iterator over source nodes
+    :param converter:
+        a :class:`openquake.hazardlib.sourceconverter.SourceConverter`
+    :param sources_per_task:
+        the maximum number of source nodes per task
+    :returns:
+        the list of converted sources
+    """
+    mon = Monitor('convert sources')
+    allargs = ((block, blockno, converter, mon) for blockno, block in
+               enumerate(block_splitter(src_nodes, sources_per_task)))
+    acc = parallel.Starmap(convert_sources, allargs).reduce()
+    return [src for blockno in sorted(acc) for src in acc[blockno]]
+
+
 def get_source_models(oqparam, gsim_lt, source_model_lt, in_memory=True):
     """
     Build all the source models generated by the logic tree.
@@ -423,7 +482,13 @@ def get_source_models(oqparam, gsim_lt, source_model_lt, in_memory=True):
         oqparam.complex_fault_mesh_spacing,
         oqparam.width_of_mfd_bin,
         oqparam.area_source_discretization)
-    psr = nrml.SourceModelParser(converter)
+    if oqparam.sources_per_conversion_task:
+        convert = functools.partial(
+            convert_sources_in_parallel, converter=converter,
+            sources_per_task=oqparam.sources_per_conversion_task)
+    else:  # convert in process
+        convert = None
+    psr = nrml.SourceModelParser(converter, get_source_cache_dir(), convert)
 
     # consider only the effective realizations
     for sm in source_model_lt.gen_source_models(gsim_lt):
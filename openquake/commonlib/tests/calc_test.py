@@ -1,6 +1,10 @@
 import unittest
+import mock
 import numpy
-from openquake.baselib import general
+from openquake.baselib import general, datastore
+from openquake.hazardlib import nrml
+from openquake.hazardlib.geo.mesh import surface_to_mesh, point3d
+from openquake.hazardlib.source.rupture import EBRupture
 from openquake.hazardlib.sourceconverter import SourceConverter
 from openquake.commonlib import calc
 
@@ -30,6 +34,30 @@ planar = general.writetmp('''\
     </singlePlaneRupture>
 </nrml>''')
 
+fault = general.writetmp('''\
+<?xml version='1.0' encoding='utf-8'?>
+<nrml xmlns:gml="http://www.opengis.net/gml"
+      xmlns="http://openquake.org/xmlns/nrml/0.4">
+    <simpleFaultRupture>
+        <magnitude>8.1</magnitude>
+        <rake>90</rake>
+        <hypocenter lat="27.6" lon="84.4" depth="30.0"/>
+        <simpleFaultGeometry>
+            <gml:LineString>
+                <gml:posList>85.0 27.3 83.8 27.8</gml:posList>
+            </gml:LineString>
+            <dip>30.0</dip>
+            <upperSeismoDepth>20.0</upperSeismoDepth>
+            <lowerSeismoDepth>50.0</lowerSeismoDepth>
+        </simpleFaultGeometry>
+    </simpleFaultRupture>
+</nrml>''')
+
+
+class FakeDataStore(dict):
+    def open(self):
+        pass
+
 
 class HazardMapsTestCase(unittest.TestCase):
 
@@ -64,3 +92,67 @@ class HazardMapsTestCase(unittest.TestCase):
         ]
         actual = calc.compute_hazard_maps(numpy.array(curves), imls, poes)
         aaae(expected, actual.T)
+
+
+class GmvsToPoesTestCase(unittest.TestCase):
+    imls = [0.03, 0.04, 0.05, 0.01, 0.1]  # unsorted on purpose
+
+    def test_block(self):
+        gmvs = numpy.random.RandomState(42).lognormal(-3, 1, (20, 50))
+        gmvs[0, :5] = 0.04  # values equal to a level
+        poes = calc.gmvs_to_poes(gmvs, self.imls, 50., 500.)
+        self.assertEqual(poes.shape, (20, 5))
+        for gmvs_, poes_ in zip(gmvs, poes):
+            numpy.testing.assert_array_equal(
+                poes_, calc._gmvs_to_haz_curve(gmvs_, self.imls, 50., 500.))
+
+    def test_ragged(self):
+        rnd = numpy.random.RandomState(42)
+        gmvs = rnd.lognormal(-3, 1, 100).astype(numpy.float32)
+        idxs = rnd.randint(0, 7, 100)
+        poes = calc.gmvs_to_poes(gmvs, self.imls, 1., 10., idxs)
+        self.assertEqual(poes.shape, (7, 5))
+        for idx, poes_ in enumerate(poes):
+            numpy.testing.assert_array_equal(
+                poes_, calc._gmvs_to_haz_curve(
+                    gmvs[idxs == idx], self.imls, 1., 10.))
+
+
+class RuptureSerializerTestCase(unittest.TestCase):
+    def setUp(self):
+        self.dstore = datastore.DataStore()
+        self.dstore.open()
+
+    def tearDown(self):
+        self.dstore.clear()
+
+    def read_ruptures(self, fnames, serial=1):
+        ebrs = []
+        for i, fname in enumerate(fnames):
+            rup = converter.convert_node(nrml.read(fname)[0])
+            rup.seed = 42 + serial + i
+            events = numpy.zeros(2, calc.event_dt)
+            ebrs.append(EBRupture(rup, (), events, serial + i))
+        return ebrs
+
+    def test_round_trip(self):
+        ser = calc.RuptureSerializer(self.dstore)
+        ser.save(self.read_ruptures([planar, fault, planar]))
+        ser.save(self.read_ruptures([fault, planar], serial=4), eidx=6)
+        self.dstore['events'] = numpy.zeros(10, calc.event_dt)
+
+        # read the ruptures back
+        dstore = FakeDataStore(
+            (key, self.dstore[key]) for key in ('ruptures', 'events'))
+        dstore['oqparam'] = mock.Mock(
+            rupture_mesh_spacing=1, complex_fault_mesh_spacing=1)
+        dstore['csm_info'] = mock.Mock(grp_trt=lambda: {0: 'Active'})
+        ebrs = list(calc.RuptureGetter(dstore, slice(1, None)))
+        self.assertEqual([ebr.serial for ebr in ebrs], [2, 3, 4, 5])
+        self.assertEqual([ebr.eidx1 for ebr in ebrs], [2, 4, 6, 8])
+        expected = self.read_ruptures([fault, planar, fault, planar], 2)
+        for ebr, exp in zip(ebrs, expected):
+            self.assertEqual(ebr.rupture.seed, exp.rupture.seed)
+            numpy.testing.assert_array_equal(
+                surface_to_mesh(ebr.rupture.surface),
+                surface_to_mesh(exp.rupture.surface).astype(point3d))
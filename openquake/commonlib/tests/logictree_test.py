@@ -1383,6 +1383,16 @@ class SampleTestCase(unittest.TestCase):
         with self.assertRaises(ValueError):
             logictree.sample(branches, 1000, 42)
 
+    def test_sample_global_rng(self):
+        # the global numpy RNG is not reseeded
+        branches = [logictree.Branch(0, Decimal('0.5'), 0),
+                    logictree.Branch(1, Decimal('0.5'), 1)]
+        numpy.random.seed(0)
+        expected = numpy.random.random_sample()
+        numpy.random.seed(0)
+        logictree.sample(branches, 10, 42)
+        self.assertEqual(numpy.random.random_sample(), expected)
+
     def test_sample_one_branch(self):
         # always the same branch is returned
         branches = [logictree.Branch(0, Decimal('1.0'), 0)]
@@ -2389,6 +2399,24 @@ class LogicTreeProcessorTestCase(unittest.TestCase):
         finally:
             self.source_model_lt.num_samples = orig_samples
 
+    def test_sample_paths(self):
+        # the bulk sampling returns the same paths of a branchset-by-branchset
+        # sampling reseeding the global numpy RNG each time
+        def sample_path(seed):
+            branchset = self.source_model_lt.root_branchset
+            branch_ids = []
+            while branchset is not None:
+                weights = [float(br.weight) for br in branchset.branches]
+                numpy.random.seed(seed)
+                [idx] = numpy.random.choice(len(weights), 1, p=weights)
+                branch = branchset.branches[idx]
+                branch_ids.append(branch.branch_id)
+                branchset = branch.child_branchset
+            return branch_ids
+        seeds = range(self.seed, self.seed + 100)
+        self.assertEqual(self.source_model_lt.sample_paths(seeds),
+                         [sample_path(seed) for seed in seeds])
+
     def test_sample_gmpe(self):
         [(value, weight, branch_ids, _, _)] = logictree.sample(
             list(self.gmpe_lt), 1, self.seed)
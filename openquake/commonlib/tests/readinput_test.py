@@ -17,6 +17,7 @@
 # along with OpenQuake. If not, see <http://www.gnu.org/licenses/>.
 
 import os
+import pickle
 import shutil
 import tempfile
 import mock
@@ -31,7 +32,7 @@ from openquake.baselib import general
 from openquake.hazardlib import valid, InvalidFile
 from openquake.risklib.riskinput import ValidationError
 from openquake.commonlib import readinput, writers, oqvalidation
-from openquake.qa_tests_data.classical import case_1, case_2
+from openquake.qa_tests_data.classical import case_1, case_2, case_21
 from openquake.qa_tests_data.event_based_risk import case_caracas
 
 
@@ -795,6 +796,18 @@ class GetCompositeSourceModelTestCase(unittest.TestCase):
         srcs = csm.get_sources()  # a single PointSource
         self.assertEqual(len(srcs), 1)
 
+    def test_parallel_conversion(self):
+        # converting the sources in parallel gives the same sources
+        oq = readinput.get_oqparam('job.ini', case_21)
+        csm = readinput.get_composite_source_model(oq)
+        oq.sources_per_conversion_task = 2
+        csm_par = readinput.get_composite_source_model(oq)
+        self.assertEqual(repr(csm_par.info), repr(csm.info))
+        srcs = csm.get_sources()
+        self.assertGreater(len(srcs), 2)
+        self.assertEqual([pickle.dumps(src) for src in csm_par.get_sources()],
+                         [pickle.dumps(src) for src in srcs])
+
 
 class GetCompositeRiskModelTestCase(unittest.TestCase):
     def test_missing_vulnerability_function(self):
@@ -17,21 +17,26 @@
 # along with OpenQuake. If not, see <http://www.gnu.org/licenses/>.
 
 import os
+import copy
 import mock
+import pickle
+import shutil
+import tempfile
 import unittest
+import collections
 from io import BytesIO
 
 import numpy
 from numpy.testing import assert_allclose
 
 from openquake.hazardlib import site, geo, mfd, pmf, scalerel, tests as htests
-from openquake.hazardlib import source, sourceconverter as s
+from openquake.hazardlib import source, sourceconverter as s, sourcewriter
 from openquake.hazardlib.tom import PoissonTOM
 from openquake.hazardlib.calc.filters import context
 from openquake.commonlib import tests, readinput
 from openquake.commonlib.source import CompositionInfo
 from openquake.hazardlib import nrml
-from openquake.baselib.general import assert_close
+from openquake.baselib.general import assert_close, writetmp
 
 # directory where the example files are
 NRML_DIR = os.path.dirname(htests.__file__)
@@ -685,6 +690,175 @@ class SourceGroupTestCase(unittest.TestCase):
             ' effective rupture(s)>')
 
 
+class StreamSourceModelTestCase(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.conv = s.SourceConverter(
+            investigation_time=50.,
+            rupture_mesh_spacing=1,
+            complex_fault_mesh_spacing=1,
+            width_of_mfd_bin=1.,
+            area_source_discretization=1.)
+
+    def check(self, fname):
+        # the streamed source groups are the same as the parsed ones
+        groups = nrml.parse(fname, self.conv)
+        streamed = nrml.stream_source_model(fname, self.conv)
+        self.assertEqual(pickle.dumps(streamed), pickle.dumps(groups))
+        return streamed
+
+    def test_nrml04(self):
+        self.assertEqual(len(self.check(MIXED_SRC_MODEL)), 4)
+        self.check(ALT_MFDS_SRC_MODEL)
+
+    def test_nrml05(self):
+        self.check(NONPARAMETRIC_SOURCE)
+        groups = self.check(os.path.join(
+            NRML_DIR, 'source_model/source_group_collection.xml'))
+        [grp] = groups
+        self.assertEqual(
+            (grp.name, grp.grp_probability, grp.rup_interdep, len(grp)),
+            ('group1', 0.5, 'mutex', 3))
+
+    def test_wrong_root(self):
+        # the root node is checked before converting the first source
+        fname = writetmp('''<?xml version="1.0" encoding="utf-8"?>
+<sourceModel xmlns="http://openquake.org/xmlns/nrml/0.5" name="model">
+    <pointSource id="1" name="point"/>
+</sourceModel>''', suffix='.xml')
+        conv = mock.Mock()
+        with self.assertRaises(ValueError) as ctx:
+            nrml.stream_source_model(fname, conv)
+        self.assertIn('expected a node of kind nrml, got '
+                      '{http://openquake.org/xmlns/nrml/0.5}sourceModel',
+                      str(ctx.exception))
+        self.assertFalse(conv.convert_node.called)
+
+
+class SourceCacheTestCase(unittest.TestCase):
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+        with open(MIXED_SRC_MODEL, 'rb') as f:
+            self.fname = writetmp(f.read(), suffix='.xml')
+
+    def tearDown(self):
+        shutil.rmtree(self.cache_dir)
+        os.remove(self.fname)
+
+    def parse(self, rupture_mesh_spacing=1):
+        conv = s.SourceConverter(
+            investigation_time=50.,
+            rupture_mesh_spacing=rupture_mesh_spacing,
+            complex_fault_mesh_spacing=1,
+            width_of_mfd_bin=1.,
+            area_source_discretization=1.)
+        parser = nrml.SourceModelParser(conv, self.cache_dir)
+        with mock.patch.object(nrml.SourceModelParser, '_parse_groups',
+                               side_effect=parser._parse_groups) as p:
+            groups = parser.parse_groups(self.fname)
+        return groups, p.called
+
+    def to_xml(self, groups):
+        return [sourcewriter.build_source_group(grp).to_str()
+                for grp in groups]
+
+    def test_cold_warm(self):
+        groups, parsed = self.parse()
+        self.assertTrue(parsed)
+        self.assertEqual(len(os.listdir(self.cache_dir)), 1)
+        cached, parsed = self.parse()
+        self.assertFalse(parsed)
+        self.assertEqual(self.to_xml(cached), self.to_xml(groups))
+        self.assertEqual([[src.count_ruptures() for src in grp]
+                          for grp in cached],
+                         [[src.count_ruptures() for src in grp]
+                          for grp in groups])
+
+    def test_changed_file(self):
+        self.parse()
+        with open(self.fname, 'ab') as f:
+            f.write(b'\n')  # a change that does not affect the sources
+        _, parsed = self.parse()
+        self.assertTrue(parsed)
+        self.assertEqual(len(os.listdir(self.cache_dir)), 2)
+
+    def test_changed_params(self):
+        self.parse(rupture_mesh_spacing=1)
+        _, parsed = self.parse(rupture_mesh_spacing=2)
+        self.assertTrue(parsed)
+        self.assertEqual(len(os.listdir(self.cache_dir)), 2)
+
+    def test_corrupted_cache(self):
+        self.parse()
+        [cache] = os.listdir(self.cache_dir)
+        with open(os.path.join(self.cache_dir, cache), 'wb') as f:
+            f.write(b'corrupted')
+        groups, parsed = self.parse()
+        self.assertTrue(parsed)
+        self.assertEqual(len(groups), 4)
+        _, parsed = self.parse()  # the cache has been regenerated
+        self.assertFalse(parsed)
+
+
+class CopyOnWriteTestCase(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        from openquake.qa_tests_data.classical import case_21
+        cls.oq = oq = readinput.get_oqparam(
+            os.path.join(os.path.dirname(case_21.__file__), 'job.ini'))
+        cls.fname = os.path.join(oq.base_path, 'source_model.xml')
+        cls.conv = s.SourceConverter(
+            oq.investigation_time, oq.rupture_mesh_spacing,
+            oq.complex_fault_mesh_spacing, oq.width_of_mfd_bin,
+            oq.area_source_discretization)
+
+    def test_untouched_sources(self):
+        def apply_unc(src):
+            raise AssertionError('never called')
+        apply_unc.get_branch_ids = lambda src: ()
+        parser = nrml.SourceModelParser(self.conv)
+        groups1 = parser.parse_src_groups(self.fname, apply_unc)
+        groups2 = parser.parse_src_groups(self.fname, apply_unc)
+        for cached, grp1, grp2 in zip(
+                parser.groups[self.fname], groups1, groups2):
+            for src, src1, src2 in zip(cached, grp1, grp2):
+                # distinct sources sharing the MFD and the geometry
+                self.assertIsNot(src1, src2)
+                self.assertIs(src1.mfd, src.mfd)
+                self.assertIs(src2.fault_trace, src.fault_trace)
+                self.assertEqual(src1.num_ruptures, src.count_ruptures())
+        # the rupture counts are memoised
+        self.assertEqual(len(parser.sources), 2)
+
+    def test_modified_sources(self):
+        # the logic tree of classical/case_21 has 27 paths: the source SFLT1
+        # is modified by 9 combinations of branches and SFLT2 by 3
+        smlt = readinput.get_source_model_lt(self.oq)
+        parser = nrml.SourceModelParser(self.conv)
+        cached = {src.source_id: src
+                  for grp in parser.parse_groups(self.fname) for src in grp}
+        srcs = collections.defaultdict(list)  # source_id -> sources
+        for rlz in smlt:
+            apply_unc = smlt.make_apply_uncertainties(rlz.lt_path)
+            for grp in parser.parse_src_groups(self.fname, apply_unc):
+                for src in grp:
+                    srcs[src.source_id].append(src)
+                    # same sources as with a deep copy of the original one
+                    orig = copy.deepcopy(cached[src.source_id])
+                    apply_unc(orig)
+                    self.assertEqual(src.num_ruptures, orig.count_ruptures())
+                    self.assertEqual(src.mfd.get_annual_occurrence_rates(),
+                                     orig.mfd.get_annual_occurrence_rates())
+                    self.assertEqual(src.dip, orig.dip)
+        self.assertEqual(len(parser.sources), 9 + 3)
+        for source_id, nmodified in [('SFLT1', 9), ('SFLT2', 3)]:
+            sources = srcs[source_id]
+            self.assertEqual(len(sources), 27)
+            self.assertEqual(len(set(map(id, sources))), 27)
+            self.assertEqual(len(set(id(src.mfd) for src in sources)),
+                             nmodified)
+
+
 class RuptureConverterTestCase(unittest.TestCase):
 
     def test_well_formed_ruptures(self):
@@ -59,8 +59,9 @@ import operator
 
 from openquake.baselib.python3compat import zip
 from openquake.baselib.performance import Monitor
-from openquake.baselib.general import DictArray, groupby, AccumDict
-from openquake.baselib.parallel import Sequential
+from openquake.baselib.general import (
+    DictArray, groupby, AccumDict, block_splitter)
+from openquake.baselib.parallel import Sequential, Shared
 from openquake.hazardlib.source import split_source
 from openquake.hazardlib.probability_map import ProbabilityMap
 from openquake.hazardlib.gsim.base import ContextMaker
@@ -117,10 +118,20 @@ def pmap_from_trt(sources, src_filter, gsims, param, monitor=Monitor()):
     Compute the hazard curves for a set of sources belonging to the same
     tectonic region type for all the GSIMs associated to that TRT.
 
+    If `param` contains a `task_duration` (in seconds) and the computation
+    takes longer than that, the unprocessed sources are not computed: they
+    are returned in blocks in the attribute .subtasks, a list of argument
+    tuples (sources, src_filter, gsims, param) to be sent to new tasks;
+    if the `src_filter` was received as a
+    :class:`openquake.baselib.parallel.Shared` object, the tuples contain
+    the Shared handle and not the filter.
+
     :returns:
         a dictionary {grp_id: pmap} with attributes .grp_ids, .calc_times,
-        .eff_ruptures
+        .eff_ruptures, .subtasks
     """
+    t_start = time.time()
+    task_duration = param.get('task_duration')
     grp_ids = set()
     for src in sources:
         grp_ids.update(src.src_group_ids)
@@ -136,21 +147,42 @@ def pmap_from_trt(sources, src_filter, gsims, param, monitor=Monitor()):
                           for grp_id in grp_ids})
         pmap.calc_times = []  # pairs (src_id, delta_t)
         pmap.eff_ruptures = AccumDict()  # grp_id -> num_ruptures
-        for src, s_sites in src_filter(srcs):  # filter now
-            t0 = time.time()
-            poemap = cmaker.poe_map(
-                src, s_sites, imtls, trunclevel, ctx_mon, poe_mon)
-            if poemap:
-                for grp_id in src.src_group_ids:
-                    pmap[grp_id] |= poemap
-            pmap.calc_times.append(
-                (src.source_id, src.weight, len(s_sites), time.time() - t0))
-            # storing the number of contributing ruptures too
-            pmap.eff_ruptures += {grp_id: getattr(poemap, 'eff_ruptures', 0)
-                                  for grp_id in src.src_group_ids}
+        pmap.subtasks = []
+        for i, src in enumerate(srcs):
+            if task_duration and i and time.time() - t_start > task_duration:
+                # split the remaining sources in blocks with the same
+                # number of ruptures processed so far
+                maxweight = sum(_nrups(s) for s in srcs[:i])
+                # if the filter was broadcast, only its handle is sent back
+                shared_filter = Shared.get_handle(src_filter)
+                pmap.subtasks = [
+                    (block, shared_filter, gsims, param)
+                    for block in block_splitter(srcs[i:], maxweight, _nrups)]
+                break
+            for src, s_sites in src_filter([src]):  # filter now
+                t0 = time.time()
+                poemap = cmaker.poe_map(
+                    src, s_sites, imtls, trunclevel, ctx_mon, poe_mon)
+                if poemap:
+                    for grp_id in src.src_group_ids:
+                        pmap[grp_id] |= poemap
+                pmap.calc_times.append(
+                    (src.source_id, src.weight, len(s_sites),
+                     time.time() - t0))
+                # storing the number of contributing ruptures too
+                pmap.eff_ruptures += {
+                    grp_id: getattr(poemap, 'eff_ruptures', 0)
+                    for grp_id in src.src_group_ids}
         return pmap
 
 
+def _nrups(src):
+    # the number of ruptures of a source, used to split the sources
+    # not processed within the task_duration; it is never zero, otherwise
+    # block_splitter would discard the source
+    return src.num_ruptures or 1
+
+
 def calc_hazard_curves(
         groups, ss_filter, imtls, gsim_by_trt, truncation_level=None,
         apply=Sequential.apply):
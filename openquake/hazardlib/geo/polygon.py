@@ -147,6 +147,26 @@ class Polygon(object):
         return (self.lons.min(), self.lats.min(),
                 self.lons.max(), self.lats.max())
 
+    def get_bounding_circle(self):
+        """
+        Get a circle on the Earth surface containing the polygon, centered
+        in the center of the projection used by :meth:`intersects`.
+
+        :returns:
+            A tuple (longitude, latitude, radius) with the coordinates of
+            the center in decimal degrees and the radius in km. All the
+            points intersecting the polygon are within the circle.
+        """
+        self._init_polygon2d()
+        # in the orthographic projection the distance of a point from the
+        # center is a growing function of its distance on the sphere, so
+        # the farthest point of the polygon from the center is a vertex
+        xx, yy = numpy.transpose(self._polygon2d.exterior.coords)
+        sin_dist = numpy.sqrt(xx ** 2 + yy ** 2).max() / geodetic.EARTH_RADIUS
+        radius = geodetic.EARTH_RADIUS * numpy.arcsin(min(sin_dist, 1.))
+        return (numpy.degrees(self._projection.lambda0),
+                numpy.degrees(self._projection.phi0), radius)
+
     def _init_polygon2d(self):
         """
         Spherical bounding box, projection, and Cartesian polygon are all
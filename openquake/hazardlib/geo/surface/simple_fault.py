@@ -202,6 +202,44 @@ class SimpleFaultSurface(BaseQuadrilateralSurface):
             upper_seismogenic_depth, lower_seismogenic_depth)]
         return self
 
+    @classmethod
+    def get_mesh_shape(cls, fault_trace, upper_seismogenic_depth,
+                       lower_seismogenic_depth, dip, mesh_spacing):
+        """
+        Get the shape of the mesh built by :meth:`from_fault_data`,
+        without building it.
+
+        Parameters are the same as for :meth:`from_fault_data`.
+
+        :returns:
+            A pair (number of points along dip, number of points along
+            strike), i.e. the number of rows and columns of the mesh.
+        """
+        # Similar to :meth:`from_fault_data`, but the points on the top and
+        # bottom edge are computed only for the first point of the trace,
+        # since all the columns of the mesh have the same number of rows
+        vdist_top = upper_seismogenic_depth - fault_trace[0].depth
+        vdist_bottom = lower_seismogenic_depth - fault_trace[0].depth
+
+        hdist_top = vdist_top / math.tan(math.radians(dip))
+        hdist_bottom = vdist_bottom / math.tan(math.radians(dip))
+
+        strike = fault_trace[0].azimuth(fault_trace[-1])
+        azimuth = (strike + 90.0) % 360
+
+        resampled_trace = fault_trace.resample(mesh_spacing)
+        point = resampled_trace[0]
+        top = point.point_at(hdist_top, vdist_top, azimuth)
+        bottom = point.point_at(hdist_bottom, vdist_bottom, azimuth)
+        shape = (len(top.equally_spaced_points(bottom, mesh_spacing)),
+                 len(resampled_trace))
+        assert 1 not in shape, (
+            "Mesh must have at least 2 nodes along both length and width."
+            " Possible cause: Mesh spacing could be too large with respect to"
+            " the fault length and width."
+        )
+        return shape
+
     @classmethod
     def get_fault_patch_vertices(cls, rupture_top_edge,
                                  upper_seismogenic_depth,
@@ -24,9 +24,38 @@ implementations of ground shaking intensity models. See
 import os
 import inspect
 import importlib
+import collections
 from collections import OrderedDict
 from openquake.hazardlib.gsim.base import (
     GMPE, IPE, GroundShakingIntensityModel)
+from openquake.hazardlib.gsim.gsim_index import INDEX
+
+INDEX_TEMPLATE = '''\
+# -*- coding: utf-8 -*-
+# vim: tabstop=4 shiftwidth=4 softtabstop=4
+#
+# Copyright (C) 2017 GEM Foundation
+#
+# OpenQuake is free software: you can redistribute it and/or modify it
+# under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# OpenQuake is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with OpenQuake. If not, see <http://www.gnu.org/licenses/>.
+"""
+Index GSIM class name -> name of the module where the class is defined,
+used by :class:`openquake.hazardlib.gsim.GsimRegistry`.
+Generated by :func:`openquake.hazardlib.gsim.write_index`, do not edit.
+"""
+INDEX = {
+%s}
+'''
 
 
 def get_available_gsims():
@@ -46,3 +75,84 @@ def get_available_gsims():
                         GroundShakingIntensityModel, GMPE, IPE):
                     gsims[cls.__name__] = cls
     return OrderedDict((k, gsims[k]) for k in sorted(gsims))
+
+
+def build_index():
+    """
+    :returns: a dictionary GSIM class name -> module name
+    """
+    return {name: cls.__module__.rsplit('.', 1)[-1]
+            for name, cls in get_available_gsims().items()}
+
+
+def write_index(fname=None):
+    """
+    Regenerate the module :mod:`openquake.hazardlib.gsim.gsim_index`; it
+    must be called every time a GSIM is added, renamed or moved:
+
+    $ python -c "from openquake.hazardlib.gsim import write_index; \\
+                 write_index()"
+
+    :param fname: the path of the module (by default the one in the package)
+    """
+    fname = fname or os.path.join(os.path.dirname(__file__), 'gsim_index.py')
+    lines = ['    %r: %r,\n' % item for item in sorted(build_index().items())]
+    with open(fname, 'w') as f:
+        f.write(INDEX_TEMPLATE % ''.join(lines))
+
+
+class GsimRegistry(collections.MutableMapping):
+    """
+    A dictionary GSIM class name -> GSIM class, importing the module
+    containing a GSIM only when the GSIM is requested for the first time.
+    The modules are found by looking at an index name -> module name,
+    so that the (slow) import of all the GSIM modules is avoided; if a
+    name is missing from the index, for instance because the index has
+    not been regenerated after adding a GSIM, all the GSIM modules are
+    imported as a fallback. Classes can also be registered manually.
+
+    :param index: a dictionary GSIM class name -> module name
+    """
+    def __init__(self, index):
+        self.index = index
+        self.classes = {}  # populated lazily
+        self.complete = False  # True if all the modules have been imported
+
+    def _load_all(self):
+        if not self.complete:
+            for name, cls in get_available_gsims().items():
+                self.classes.setdefault(name, cls)
+            self.complete = True
+
+    def __getitem__(self, name):
+        try:
+            return self.classes[name]
+        except KeyError:
+            pass
+        modname = self.index.get(name)
+        if modname:
+            mod = importlib.import_module(
+                'openquake.hazardlib.gsim.' + modname)
+            cls = getattr(mod, name, None)
+            if cls is not None:
+                self.classes[name] = cls
+                return cls
+        # the index is out of date, look everywhere
+        self._load_all()
+        return self.classes[name]
+
+    def __setitem__(self, name, cls):
+        self.classes[name] = cls
+
+    def __delitem__(self, name):
+        del self.classes[name]
+
+    def __iter__(self):
+        return iter(sorted(set(self.index) | set(self.classes)))
+
+    def __len__(self):
+        return len(set(self.index) | set(self.classes))
+
+
+#: lazy dictionary of the GSIM classes, keyed by class name
+registry = GsimRegistry(INDEX)
@@ -0,0 +1,378 @@
+# -*- coding: utf-8 -*-
+# vim: tabstop=4 shiftwidth=4 softtabstop=4
+#
+# Copyright (C) 2017 GEM Foundation
+#
+# OpenQuake is free software: you can redistribute it and/or modify it
+# under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# OpenQuake is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with OpenQuake. If not, see <http://www.gnu.org/licenses/>.
+"""
+Index GSIM class name -> name of the module where the class is defined,
+used by :class:`openquake.hazardlib.gsim.GsimRegistry`.
+Generated by :func:`openquake.hazardlib.gsim.write_index`, do not edit.
+"""
+INDEX = {
+    'AbrahamsonEtAl2014': 'abrahamson_2014',
+    'AbrahamsonEtAl2014NSHMPLower': 'nshmp_2014',
+    'AbrahamsonEtAl2014NSHMPMean': 'nshmp_2014',
+    'AbrahamsonEtAl2014NSHMPUpper': 'nshmp_2014',
+    'AbrahamsonEtAl2014RegCHN': 'abrahamson_2014',
+    'AbrahamsonEtAl2014RegJPN': 'abrahamson_2014',
+    'AbrahamsonEtAl2014RegTWN': 'abrahamson_2014',
+    'AbrahamsonEtAl2015SInter': 'abrahamson_2015',
+    'AbrahamsonEtAl2015SInterHigh': 'abrahamson_2015',
+    'AbrahamsonEtAl2015SInterLow': 'abrahamson_2015',
+    'AbrahamsonEtAl2015SSlab': 'abrahamson_2015',
+    'AbrahamsonEtAl2015SSlabHigh': 'abrahamson_2015',
+    'AbrahamsonEtAl2015SSlabLow': 'abrahamson_2015',
+    'AbrahamsonSilva1997': 'abrahamson_silva_1997',
+    'AbrahamsonSilva2008': 'abrahamson_silva_2008',
+    'AkkarBommer2010': 'akkar_bommer_2010',
+    'AkkarBommer2010SWISS01': 'akkar_bommer_2010',
+    'AkkarBommer2010SWISS04': 'akkar_bommer_2010',
+    'AkkarBommer2010SWISS08': 'akkar_bommer_2010',
+    'AkkarCagnan2010': 'akkar_cagnan_2010',
+    'AkkarEtAl2013': 'akkar_2013',
+    'AkkarEtAlRepi2014': 'akkar_2014',
+    'AkkarEtAlRhyp2014': 'akkar_2014',
+    'AkkarEtAlRjb2014': 'akkar_2014',
+    'AkkarEtAlRjb2014Armenia': 'armenia_2016',
+    'AlNomanCramer2015NGAEast': 'nga_east',
+    'AlNomanCramer2015NGAEastTotalSigma': 'nga_east',
+    'Allen2012': 'allen_2012',
+    'AllenEtAl2012': 'allen_2012_ipe',
+    'AllenEtAl2012Rhypo': 'allen_2012_ipe',
+    'Atkinson2008prime': 'boore_atkinson_2011',
+    'Atkinson2010Hawaii': 'boore_atkinson_2008',
+    'Atkinson2015': 'atkinson_2015',
+    'AtkinsonBoore1995GSCBest': 'atkinson_boore_1995',
+    'AtkinsonBoore1995GSCLowerLimit': 'atkinson_boore_1995',
+    'AtkinsonBoore1995GSCUpperLimit': 'atkinson_boore_1995',
+    'AtkinsonBoore2003SInter': 'atkinson_boore_2003',
+    'AtkinsonBoore2003SInterNSHMP2008': 'atkinson_boore_2003',
+    'AtkinsonBoore2003SSlab': 'atkinson_boore_2003',
+    'AtkinsonBoore2003SSlabCascadia': 'atkinson_boore_2003',
+    'AtkinsonBoore2003SSlabCascadiaNSHMP2008': 'atkinson_boore_2003',
+    'AtkinsonBoore2003SSlabJapan': 'atkinson_boore_2003',
+    'AtkinsonBoore2003SSlabJapanNSHMP2008': 'atkinson_boore_2003',
+    'AtkinsonBoore2003SSlabNSHMP2008': 'atkinson_boore_2003',
+    'AtkinsonBoore2006': 'atkinson_boore_2006',
+    'AtkinsonBoore2006MblgAB1987bar140NSHMP2008': 'atkinson_boore_2006',
+    'AtkinsonBoore2006MblgAB1987bar200NSHMP2008': 'atkinson_boore_2006',
+    'AtkinsonBoore2006MblgJ1996bar140NSHMP2008': 'atkinson_boore_2006',
+    'AtkinsonBoore2006MblgJ1996bar200NSHMP2008': 'atkinson_boore_2006',
+    'AtkinsonBoore2006Modified2011': 'atkinson_boore_2006',
+    'AtkinsonBoore2006Mwbar140NSHMP2008': 'atkinson_boore_2006',
+    'AtkinsonBoore2006Mwbar200NSHMP2008': 'atkinson_boore_2006',
+    'AtkinsonBoore2006SGS': 'atkinson_boore_2006',
+    'AtkinsonMacias2009': 'atkinson_macias_2009',
+    'BergeThierryEtAl2003SIGMA': 'berge_thierry_2003',
+    'BindiEtAl2011': 'bindi_2011',
+    'BindiEtAl2014Rhyp': 'bindi_2014',
+    'BindiEtAl2014RhypEC8': 'bindi_2014',
+    'BindiEtAl2014RhypEC8NoSOF': 'bindi_2014',
+    'BindiEtAl2014Rjb': 'bindi_2014',
+    'BindiEtAl2014RjbArmenia': 'armenia_2016',
+    'BindiEtAl2014RjbEC8': 'bindi_2014',
+    'BindiEtAl2014RjbEC8NoSOF': 'bindi_2014',
+    'BindiEtAl2017Rhypo': 'bindi_2017',
+    'BindiEtAl2017Rjb': 'bindi_2017',
+    'Boore2015NGAEastA04': 'nga_east',
+    'Boore2015NGAEastA04TotalSigma': 'nga_east',
+    'Boore2015NGAEastAB14': 'nga_east',
+    'Boore2015NGAEastAB14TotalSigma': 'nga_east',
+    'Boore2015NGAEastAB95': 'nga_east',
+    'Boore2015NGAEastAB95TotalSigma': 'nga_east',
+    'Boore2015NGAEastBCA10D': 'nga_east',
+    'Boore2015NGAEastBCA10DTotalSigma': 'nga_east',
+    'Boore2015NGAEastBS11': 'nga_east',
+    'Boore2015NGAEastBS11TotalSigma': 'nga_east',
+    'Boore2015NGAEastSGD02': 'nga_east',
+    'Boore2015NGAEastSGD02TotalSigma': 'nga_east',
+    'BooreAtkinson2008': 'boore_atkinson_2008',
+    'BooreAtkinson2011': 'boore_atkinson_2011',
+    'BooreEtAl1993GSCBest': 'boore_1993',
+    'BooreEtAl1993GSCLowerLimit': 'boore_1993',
+    'BooreEtAl1993GSCUpperLimit': 'boore_1993',
+    'BooreEtAl1997ArbitraryHorizontal': 'boore_1997',
+    'BooreEtAl1997ArbitraryHorizontalUnspecified': 'boore_1997',
+    'BooreEtAl1997GeometricMean': 'boore_1997',
+    'BooreEtAl1997GeometricMeanUnspecified': 'boore_1997',
+    'BooreEtAl2014': 'boore_2014',
+    'BooreEtAl2014CaliforniaBasin': 'boore_2014',
+    'BooreEtAl2014CaliforniaBasinNoSOF': 'boore_2014',
+    'BooreEtAl2014HighQ': 'boore_2014',
+    'BooreEtAl2014HighQCaliforniaBasin': 'boore_2014',
+    'BooreEtAl2014HighQCaliforniaBasinNoSOF': 'boore_2014',
+    'BooreEtAl2014HighQJapanBasin': 'boore_2014',
+    'BooreEtAl2014HighQJapanBasinNoSOF': 'boore_2014',
+    'BooreEtAl2014HighQNoSOF': 'boore_2014',
+    'BooreEtAl2014JapanBasin': 'boore_2014',
+    'BooreEtAl2014JapanBasinNoSOF': 'boore_2014',
+    'BooreEtAl2014LowQ': 'boore_2014',
+    'BooreEtAl2014LowQArmenia': 'armenia_2016',
+    'BooreEtAl2014LowQCaliforniaBasin': 'boore_2014',
+    'BooreEtAl2014LowQCaliforniaBasinNoSOF': 'boore_2014',
+    'BooreEtAl2014LowQJapanBasin': 'boore_2014',
+    'BooreEtAl2014LowQJapanBasinNoSOF': 'boore_2014',
+    'BooreEtAl2014LowQNoSOF': 'boore_2014',
+    'BooreEtAl2014NSHMPLower': 'nshmp_2014',
+    'BooreEtAl2014NSHMPMean': 'nshmp_2014',
+    'BooreEtAl2014NSHMPUpper': 'nshmp_2014',
+    'BooreEtAl2014NoSOF': 'boore_2014',
+    'Bradley2013': 'bradley_2013',
+    'Bradley2013Volc': 'bradley_2013',
+    'Campbell2003': 'campbell_2003',
+    'Campbell2003MblgAB1987NSHMP2008': 'campbell_2003',
+    'Campbell2003MblgJ1996NSHMP2008': 'campbell_2003',
+    'Campbell2003MwNSHMP2008': 'campbell_2003',
+    'Campbell2003SHARE': 'campbell_2003',
+    'CampbellBozorgnia2003NSHMP2007': 'campbell_bozorgnia_2003',
+    'CampbellBozorgnia2008': 'campbell_bozorgnia_2008',
+    'CampbellBozorgnia2008Arbitrary': 'campbell_bozorgnia_2008',
+    'CampbellBozorgnia2014': 'campbell_bozorgnia_2014',
+    'CampbellBozorgnia2014HighQ': 'campbell_bozorgnia_2014',
+    'CampbellBozorgnia2014HighQJapanSite': 'campbell_bozorgnia_2014',
+    'CampbellBozorgnia2014JapanSite': 'campbell_bozorgnia_2014',
+    'CampbellBozorgnia2014LowQ': 'campbell_bozorgnia_2014',
+    'CampbellBozorgnia2014LowQJapanSite': 'campbell_bozorgnia_2014',
+    'CampbellBozorgnia2014NSHMPLower': 'nshmp_2014',
+    'CampbellBozorgnia2014NSHMPMean': 'nshmp_2014',
+    'CampbellBozorgnia2014NSHMPUpper': 'nshmp_2014',
+    'CauzziEtAl2014': 'cauzzi_2014',
+    'CauzziEtAl2014Armenia': 'armenia_2016',
+    'CauzziEtAl2014Eurocode8': 'cauzzi_2014',
+    'CauzziEtAl2014Eurocode8NoSOF': 'cauzzi_2014',
+    'CauzziEtAl2014FixedVs30': 'cauzzi_2014',
+    'CauzziEtAl2014FixedVs30NoSOF': 'cauzzi_2014',
+    'CauzziEtAl2014NoSOF': 'cauzzi_2014',
+    'CauzziFaccioli2008': 'cauzzi_faccioli_2008',
+    'CauzziFaccioli2008SWISS01': 'cauzzi_faccioli_2008_swiss',
+    'CauzziFaccioli2008SWISS04': 'cauzzi_faccioli_2008_swiss',
+    'CauzziFaccioli2008SWISS08': 'cauzzi_faccioli_2008_swiss',
+    'ChiouYoungs2008': 'chiou_youngs_2008',
+    'ChiouYoungs2008SWISS01': 'chiou_youngs_2008_swiss',
+    'ChiouYoungs2008SWISS04': 'chiou_youngs_2008_swiss',
+    'ChiouYoungs2008SWISS06': 'chiou_youngs_2008_swiss',
+    'ChiouYoungs2014': 'chiou_youngs_2014',
+    'ChiouYoungs2014Armenia': 'armenia_2016',
+    'ChiouYoungs2014NSHMPLower': 'nshmp_2014',
+    'ChiouYoungs2014NSHMPMean': 'nshmp_2014',
+    'ChiouYoungs2014NSHMPUpper': 'nshmp_2014',
+    'ChiouYoungs2014NearFaultEffect': 'chiou_youngs_2014',
+    'ChiouYoungs2014PEER': 'chiou_youngs_2014',
+    'ClimentEtAl1994': 'climent_1994',
+    'ConvertitoEtAl2012Geysers': 'convertito_2012',
+    'DarraghEtAl2015NGAEast1CCSP': 'nga_east',
+    'DarraghEtAl2015NGAEast1CCSPTotalSigma': 'nga_east',
+    'DarraghEtAl2015NGAEast1CVSP': 'nga_east',
+    'DarraghEtAl2015NGAEast1CVSPTotalSigma': 'nga_east',
+    'DarraghEtAl2015NGAEast2CCSP': 'nga_east',
+    'DarraghEtAl2015NGAEast2CCSPTotalSigma': 'nga_east',
+    'DarraghEtAl2015NGAEast2CVSP': 'nga_east',
+    'DarraghEtAl2015NGAEast2CVSPTotalSigma': 'nga_east',
+    'DerrasEtAl2014': 'derras_2014',
+    'DostEtAl2004': 'dost_2004',
+    'DostEtAl2004BommerAdaptation': 'dost_2004',
+    'DouglasEtAl2013StochasticSD001Q1800K005': 'douglas_stochastic_2013',
+    'DouglasEtAl2013StochasticSD001Q1800K020': 'douglas_stochastic_2013',
+    'DouglasEtAl2013StochasticSD001Q1800K040': 'douglas_stochastic_2013',
+    'DouglasEtAl2013StochasticSD001Q1800K060': 'douglas_stochastic_2013',
+    'DouglasEtAl2013StochasticSD001Q200K005': 'douglas_stochastic_2013',
+    'DouglasEtAl2013StochasticSD001Q200K020': 'douglas_stochastic_2013',
+    'DouglasEtAl2013StochasticSD001Q200K040': 'douglas_stochastic_2013',
+    'DouglasEtAl2013StochasticSD001Q200K060': 'douglas_stochastic_2013',
+    'DouglasEtAl2013StochasticSD001Q600K005': 'douglas_stochastic_2013',
+    'DouglasEtAl2013StochasticSD001Q600K020': 'douglas_stochastic_2013',
+    'DouglasEtAl2013StochasticSD001Q600K040': 'douglas_stochastic_2013',
+    'DouglasEtAl2013StochasticSD001Q600K060': 'douglas_stochastic_2013',
+    'DouglasEtAl2013StochasticSD010Q1800K005': 'douglas_stochastic_2013',
+    'DouglasEtAl2013StochasticSD010Q1800K020': 'douglas_stochastic_2013',
+    'DouglasEtAl2013StochasticSD010Q1800K040': 'douglas_stochastic_2013',
+    'DouglasEtAl2013StochasticSD010Q1800K060': 'douglas_stochastic_2013',
+    'DouglasEtAl2013StochasticSD010Q200K005': 'douglas_stochastic_2013',
+    'DouglasEtAl2013StochasticSD010Q200K020': 'douglas_stochastic_2013',
+    'DouglasEtAl2013StochasticSD010Q200K040': 'douglas_stochastic_2013',
+    'DouglasEtAl2013StochasticSD010Q200K060': 'douglas_stochastic_2013',
+    'DouglasEtAl2013StochasticSD010Q600K005': 'douglas_stochastic_2013',
+    'DouglasEtAl2013StochasticSD010Q600K020': 'douglas_stochastic_2013',
+    'DouglasEtAl2013StochasticSD010Q600K040': 'douglas_stochastic_2013',
+    'DouglasEtAl2013StochasticSD010Q600K060': 'douglas_stochastic_2013',
+    'DouglasEtAl2013StochasticSD100Q1800K005': 'douglas_stochastic_2013',
+    'DouglasEtAl2013StochasticSD100Q1800K020': 'douglas_stochastic_2013',
+    'DouglasEtAl2013StochasticSD100Q1800K040': 'douglas_stochastic_2013',
+    'DouglasEtAl2013StochasticSD100Q1800K060': 'douglas_stochastic_2013',
+    'DouglasEtAl2013StochasticSD100Q200K005': 'douglas_stochastic_2013',
+    'DouglasEtAl2013StochasticSD100Q200K020': 'douglas_stochastic_2013',
+    'DouglasEtAl2013StochasticSD100Q200K040': 'douglas_stochastic_2013',
+    'DouglasEtAl2013StochasticSD100Q200K060': 'douglas_stochastic_2013',
+    'DouglasEtAl2013StochasticSD100Q600K005': 'douglas_stochastic_2013',
+    'DouglasEtAl2013StochasticSD100Q600K020': 'douglas_stochastic_2013',
+    'DouglasEtAl2013StochasticSD100Q600K040': 'douglas_stochastic_2013',
+    'DouglasEtAl2013StochasticSD100Q600K060': 'douglas_stochastic_2013',
+    'DowrickRhoades2005Asc': 'dowrickrhoades_2005',
+    'DowrickRhoades2005SInter': 'dowrickrhoades_2005',
+    'DowrickRhoades2005SSlab': 'dowrickrhoades_2005',
+    'DowrickRhoades2005Volc': 'dowrickrhoades_2005',
+    'DrouetBrazil2015': 'drouet_2015_brazil',
+    'DrouetBrazil2015withDepth': 'drouet_2015_brazil',
+    'EdwardsFah2013Alpine10Bars': 'edwards_fah_2013a',
+    'EdwardsFah2013Alpine120Bars': 'edwards_fah_2013a',
+    'EdwardsFah2013Alpine20Bars': 'edwards_fah_2013a',
+    'EdwardsFah2013Alpine30Bars': 'edwards_fah_2013a',
+    'EdwardsFah2013Alpine50Bars': 'edwards_fah_2013a',
+    'EdwardsFah2013Alpine60Bars': 'edwards_fah_2013a',
+    'EdwardsFah2013Alpine75Bars': 'edwards_fah_2013a',
+    'EdwardsFah2013Alpine90Bars': 'edwards_fah_2013a',
+    'EdwardsFah2013Foreland10Bars': 'edwards_fah_2013f',
+    'EdwardsFah2013Foreland120Bars': 'edwards_fah_2013f',
+    'EdwardsFah2013Foreland20Bars': 'edwards_fah_2013f',
+    'EdwardsFah2013Foreland30Bars': 'edwards_fah_2013f',
+    'EdwardsFah2013Foreland50Bars': 'edwards_fah_2013f',
+    'EdwardsFah2013Foreland60Bars': 'edwards_fah_2013f',
+    'EdwardsFah2013Foreland75Bars': 'edwards_fah_2013f',
+    'EdwardsFah2013Foreland90Bars': 'edwards_fah_2013f',
+    'FaccioliEtAl2010': 'faccioli_2010',
+    'Frankel2015NGAEast': 'nga_east',
+    'Frankel2015NGAEastTotalSigma': 'nga_east',
+    'FrankelEtAl1996MblgAB1987NSHMP2008': 'frankel_1996',
+    'FrankelEtAl1996MblgJ1996NSHMP2008': 'frankel_1996',
+    'FrankelEtAl1996MwNSHMP2008': 'frankel_1996',
+    'FukushimaTanaka1990': 'fukushima_tanaka_1990',
+    'FukushimaTanakaSite1990': 'fukushima_tanaka_1990',
+    'GMPETable': 'gsim_table',
+    'GarciaEtAl2005SSlab': 'garcia_2005',
+    'GarciaEtAl2005SSlabVert': 'garcia_2005',
+    'Geomatrix1993SSlabNSHMP2008': 'geomatrix_1993',
+    'GhofraniAtkinson2014': 'ghofrani_atkinson_2014',
+    'GhofraniAtkinson2014Cascadia': 'ghofrani_atkinson_2014',
+    'GhofraniAtkinson2014CascadiaLower': 'ghofrani_atkinson_2014',
+    'GhofraniAtkinson2014CascadiaUpper': 'ghofrani_atkinson_2014',
+    'GhofraniAtkinson2014Lower': 'ghofrani_atkinson_2014',
+    'GhofraniAtkinson2014Upper': 'ghofrani_atkinson_2014',
+    'Graizer2015NGAEast': 'nga_east',
+    'Graizer2015NGAEastTotalSigma': 'nga_east',
+    'Gupta2010SSlab': 'gupta_2010',
+    'HassaniAtkinson2015NGAEast': 'nga_east',
+    'HassaniAtkinson2015NGAEastTotalSigma': 'nga_east',
+    'HollenbackEtAl2015NGAEastEX': 'nga_east',
+    'HollenbackEtAl2015NGAEastEXTotalSigma': 'nga_east',
+    'HollenbackEtAl2015NGAEastGP': 'nga_east',
+    'HollenbackEtAl2015NGAEastGPTotalSigma': 'nga_east',
+    'HongGoda2007': 'hong_goda_2007',
+    'Idriss2014': 'idriss_2014',
+    'Idriss2014NSHMPLower': 'nshmp_2014',
+    'Idriss2014NSHMPMean': 'nshmp_2014',
+    'Idriss2014NSHMPUpper': 'nshmp_2014',
+    'KaleEtAl2015Armenia': 'armenia_2016',
+    'KaleEtAl2015Iran': 'kale_2015',
+    'KaleEtAl2015Turkey': 'kale_2015',
+    'Kanno2006Deep': 'kanno_2006',
+    'Kanno2006Shallow': 'kanno_2006',
+    'KothaEtAl2016': 'kotha_2016',
+    'KothaEtAl2016Armenia': 'armenia_2016',
+    'KothaEtAl2016Italy': 'kotha_2016',
+    'KothaEtAl2016Other': 'kotha_2016',
+    'KothaEtAl2016Turkey': 'kotha_2016',
+    'Lin2009': 'lin_2009',
+    'Lin2009AdjustedSigma': 'lin_2009',
+    'LinLee2008SInter': 'lin_lee_2008',
+    'LinLee2008SSlab': 'lin_lee_2008',
+    'McVerry2006Asc': 'mcverry_2006',
+    'McVerry2006SInter': 'mcverry_2006',
+    'McVerry2006SSlab': 'mcverry_2006',
+    'McVerry2006Volc': 'mcverry_2006',
+    'MegawatiEtAl2003': 'megawati_2003',
+    'MegawatiPan2010': 'megawati_pan_2010',
+    'MontalvaEtAl2016SInter': 'montalva_2016',
+    'MontalvaEtAl2016SSlab': 'montalva_2016',
+    'MunsonThurber1997': 'munson_thurber_1997',
+    'MunsonThurber1997Vector': 'munson_thurber_1997',
+    'NGAEastBaseGMPE': 'nga_east',
+    'NGAEastBaseGMPETotalSigma': 'nga_east',
+    'NGAEastGMPE': 'nga_east',
+    'NGAEastGMPETotalSigma': 'nga_east',
+    'NathEtAl2012Lower': 'nath_2012',
+    'NathEtAl2012Upper': 'nath_2012',
+    'PankowPechmann2004': 'pankow_pechmann_2004',
+    'PezeschkEtAl2015NGAEastM1SS': 'nga_east',
+    'PezeschkEtAl2015NGAEastM1SSTotalSigma': 'nga_east',
+    'PezeschkEtAl2015NGAEastM2ES': 'nga_east',
+    'PezeschkEtAl2015NGAEastM2ESTotalSigma': 'nga_east',
+    'PezeshkEtAl2011': 'pezeshk_2011',
+    'PezeshkEtAl2011NEHRPBC': 'pezeshk_2011',
+    'RaghukanthIyengar2007': 'raghukanth_iyengar_2007',
+    'RaghukanthIyengar2007KoynaWarna': 'raghukanth_iyengar_2007',
+    'RaghukanthIyengar2007Southern': 'raghukanth_iyengar_2007',
+    'RaghukanthIyengar2007WesternCentral': 'raghukanth_iyengar_2007',
+    'RietbrockEtAl2013MagDependent': 'rietbrock_2013',
+    'RietbrockEtAl2013SelfSimilar': 'rietbrock_2013',
+    'SadighEtAl1997': 'sadigh_1997',
+    'ShahjoueiPezeschk2015NGAEast': 'nga_east',
+    'ShahjoueiPezeschk2015NGAEastTotalSigma': 'nga_east',
+    'ShahjoueiPezeshk2016': 'shahjouei_pezeshk_2016',
+    'SharmaEtAl2009': 'sharma_2009',
+    'SiMidorikawa1999Asc': 'si_midorikawa_1999',
+    'SiMidorikawa1999SInter': 'si_midorikawa_1999',
+    'SiMidorikawa1999SInterNorthEastCorrection': 'si_midorikawa_1999',
+    'SiMidorikawa1999SInterSouthWestCorrection': 'si_midorikawa_1999',
+    'SiMidorikawa1999SSlab': 'si_midorikawa_1999',
+    'SiMidorikawa1999SSlabNorthEastCorrection': 'si_midorikawa_1999',
+    'SiMidorikawa1999SSlabSouthWestCorrection': 'si_midorikawa_1999',
+    'SilvaEtAl2002MblgAB1987NSHMP2008': 'silva_2002',
+    'SilvaEtAl2002MblgJ1996NSHMP2008': 'silva_2002',
+    'SilvaEtAl2002MwNSHMP2008': 'silva_2002',
+    'SomervilleEtAl2001NSHMP2008': 'somerville_2001',
+    'SomervilleEtAl2009NonCratonic': 'somerville_2009',
+    'SomervilleEtAl2009YilgarnCraton': 'somerville_2009',
+    'TavakoliPezeshk2005': 'tavakoli_pezeshk_2005',
+    'TavakoliPezeshk2005MblgAB1987NSHMP2008': 'tavakoli_pezeshk_2005',
+    'TavakoliPezeshk2005MblgJ1996NSHMP2008': 'tavakoli_pezeshk_2005',
+    'TavakoliPezeshk2005MwNSHMP2008': 'tavakoli_pezeshk_2005',
+    'ToroEtAl1997MblgNSHMP2008': 'toro_1997',
+    'ToroEtAl1997MwNSHMP2008': 'toro_1997',
+    'ToroEtAl2002': 'toro_2002',
+    'ToroEtAl2002SHARE': 'toro_2002',
+    'TravasarouEtAl2003': 'travasarou_2003',
+    'TusaLanger2016RepiBA08DE': 'tusa_langer_2016',
+    'TusaLanger2016RepiBA08SE': 'tusa_langer_2016',
+    'TusaLanger2016RepiSP87DE': 'tusa_langer_2016',
+    'TusaLanger2016RepiSP87SE': 'tusa_langer_2016',
+    'TusaLanger2016Rhypo': 'tusa_langer_2016',
+    'YenierAtkinson2015NGAEast': 'nga_east',
+    'YenierAtkinson2015NGAEastTotalSigma': 'nga_east',
+    'YoungsEtAl1997GSCSSlabBest': 'youngs_1997',
+    'YoungsEtAl1997GSCSSlabLowerLimit': 'youngs_1997',
+    'YoungsEtAl1997GSCSSlabUpperLimit': 'youngs_1997',
+    'YoungsEtAl1997SInter': 'youngs_1997',
+    'YoungsEtAl1997SInterNSHMP2008': 'youngs_1997',
+    'YoungsEtAl1997SSlab': 'youngs_1997',
+    'ZhaoEtAl2006Asc': 'zhao_2006',
+    'ZhaoEtAl2006AscSGS': 'zhao_2006',
+    'ZhaoEtAl2006AscSWISS03': 'zhao_2006_swiss',
+    'ZhaoEtAl2006AscSWISS05': 'zhao_2006_swiss',
+    'ZhaoEtAl2006AscSWISS08': 'zhao_2006_swiss',
+    'ZhaoEtAl2006SInter': 'zhao_2006',
+    'ZhaoEtAl2006SInterCascadia': 'zhao_2006',
+    'ZhaoEtAl2006SInterNSHMP2008': 'zhao_2006',
+    'ZhaoEtAl2006SSlab': 'zhao_2006',
+    'ZhaoEtAl2006SSlabCascadia': 'zhao_2006',
+    'ZhaoEtAl2006SSlabNSHMP2014': 'zhao_2006',
+    'ZhaoEtAl2016Asc': 'zhao_2016',
+    'ZhaoEtAl2016AscSiteSigma': 'zhao_2016',
+    'ZhaoEtAl2016SInter': 'zhao_2016',
+    'ZhaoEtAl2016SInterSiteSigma': 'zhao_2016',
+    'ZhaoEtAl2016SSlab': 'zhao_2016',
+    'ZhaoEtAl2016SSlabSiteSigma': 'zhao_2016',
+    'ZhaoEtAl2016UpperMantle': 'zhao_2016',
+    'ZhaoEtAl2016UpperMantleSiteSigma': 'zhao_2016',
+}
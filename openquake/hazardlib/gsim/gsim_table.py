@@ -53,6 +53,48 @@ def hdf_arrays_to_dict(hdfgroup):
     return {key: hdfgroup[key][:] for key in hdfgroup}
 
 
+class MagnitudeInterpolator(object):
+    """
+    Linear interpolation of a table along the magnitude axis, giving the
+    same results as `interp1d(magnitudes, table, axis=axis)(mag)` for a
+    scalar magnitude; the slopes are computed once at instantiation time,
+    so that the evaluation is a `searchsorted` plus a multiply-add.
+
+    :param magnitudes: array of M magnitudes
+    :param table: array with M elements along the given axis
+    :param axis: the magnitude axis of the table
+    """
+    def __init__(self, magnitudes, table, axis):
+        ind = numpy.argsort(magnitudes, kind="mergesort")
+        self.magnitudes = numpy.asarray(magnitudes)[ind]
+        table = numpy.asarray(table)
+        if not numpy.issubdtype(table.dtype, numpy.inexact):
+            table = table.astype(float)
+        # magnitudes on the first axis
+        self.table = numpy.rollaxis(numpy.take(table, ind, axis=axis), axis)
+        dmags = self.magnitudes[1:] - self.magnitudes[:-1]
+        self.slopes = (self.table[1:] - self.table[:-1]) / dmags.reshape(
+            (-1,) + (1,) * (self.table.ndim - 1))
+
+    def __call__(self, mag):
+        if mag < self.magnitudes[0]:
+            raise ValueError("A value in x_new is below the interpolation "
+                             "range.")
+        elif mag > self.magnitudes[-1]:
+            raise ValueError("A value in x_new is above the interpolation "
+                             "range.")
+        idx = numpy.searchsorted(self.magnitudes, mag)
+        lo = min(max(idx, 1), len(self.magnitudes) - 1) - 1
+        # use 1-element arrays and not scalars, to get the same dtypes
+        # (and therefore the same numbers) as scipy
+        mags = numpy.asarray(mag).reshape(1)
+        if not numpy.issubdtype(mags.dtype, numpy.inexact):
+            mags = mags.astype(float)
+        dmag = (mags - self.magnitudes[lo:lo + 1]).reshape(
+            (1,) * self.table.ndim)
+        return (self.slopes[lo:lo + 1] * dmag + self.table[lo:lo + 1])[0]
+
+
 class AmplificationTable(object):
     """
     Class to apply amplification from the GMPE tables.
@@ -99,6 +141,7 @@ class AmplificationTable(object):
         self.sigma = None
         self.magnitudes = magnitudes
         self.distances = distances
+        self.interpolators = {}  # (imt, mean or stddev type) -> interpolator
         self.parameter = amplification_group.attrs["apply_to"].decode('utf8')
         self.values = numpy.array([float(key) for key in amplification_group])
         self.argidx = numpy.argsort(self.values)
@@ -112,6 +155,11 @@ class AmplificationTable(object):
                              % self.parameter)
         self._build_data(amplification_group)
 
+    def __getstate__(self):
+        # the interpolators are a cache, rebuilt when needed after
+        # unpickling, so they are not sent to the workers
+        return dict(self.__dict__, interpolators={})
+
     def _build_data(self, amplification_group):
         """
         Creates the numpy array tables from the hdf5 tables
@@ -206,6 +254,34 @@ class AmplificationTable(object):
                     numpy.ones_like(dists))
         return mean_amp, sigma_amps
 
+    def _get_mean_interpolator(self, imt):
+        # the magnitude interpolator of the mean amplification table
+        if isinstance(imt, (imt_module.PGA, imt_module.PGV)):
+            return MagnitudeInterpolator(
+                self.magnitudes, numpy.log10(self.mean[str(imt)]), axis=2)
+        # For spectral accelerations - need two step process
+        # Interpolate period - log-log space
+        interpolator = interp1d(numpy.log10(self.periods),
+                                numpy.log10(self.mean["SA"]),
+                                axis=1)
+        period_table = interpolator(numpy.log10(imt.period))
+        # Interpolate magnitude - linear-log space
+        return MagnitudeInterpolator(self.magnitudes, period_table, axis=1)
+
+    def _get_sigma_interpolator(self, imt, stddev_type):
+        # the magnitude interpolator of the standard deviation table
+        # For PGA and PGV only needs to apply magnitude interpolation
+        if isinstance(imt, (imt_module.PGA, imt_module.PGV)):
+            return MagnitudeInterpolator(
+                self.magnitudes, self.sigma[stddev_type][str(imt)], axis=2)
+        # For spectral accelerations - need two step process
+        # Interpolate period
+        interpolator = interp1d(numpy.log10(self.periods),
+                                self.sigma[stddev_type]["SA"],
+                                axis=1)
+        period_table = interpolator(numpy.log10(imt.period))
+        return MagnitudeInterpolator(self.magnitudes, period_table, axis=1)
+
     def get_mean_table(self, imt, rctx):
         """
         Returns amplification factors for the mean, given the rupture and
@@ -216,22 +292,12 @@ class AmplificationTable(object):
             Number Levels]
         """
         # Levels by Distances
+        key = (str(imt), "Mean")
+        if key not in self.interpolators:
+            self.interpolators[key] = self._get_mean_interpolator(imt)
+        output_table = 10.0 ** self.interpolators[key](rctx.mag)
         if isinstance(imt, (imt_module.PGA, imt_module.PGV)):
-            interpolator = interp1d(self.magnitudes,
-                                    numpy.log10(self.mean[str(imt)]), axis=2)
-            output_table = 10.0 ** (
-                interpolator(rctx.mag).reshape(self.shape[0], self.shape[3])
-                )
-        else:
-            # For spectral accelerations - need two step process
-            # Interpolate period - log-log space
-            interpolator = interp1d(numpy.log10(self.periods),
-                                    numpy.log10(self.mean["SA"]),
-                                    axis=1)
-            period_table = interpolator(numpy.log10(imt.period))
-            # Interpolate magnitude - linear-log space
-            mag_interpolator = interp1d(self.magnitudes, period_table, axis=1)
-            output_table = 10.0 ** mag_interpolator(rctx.mag)
+            output_table = output_table.reshape(self.shape[0], self.shape[3])
         return output_table
 
     def get_sigma_tables(self, imt, rctx, stddev_types):
@@ -246,26 +312,15 @@ class AmplificationTable(object):
         """
         output_tables = []
         for stddev_type in stddev_types:
-            # For PGA and PGV only needs to apply magnitude interpolation
+            key = (str(imt), stddev_type)
+            if key not in self.interpolators:
+                self.interpolators[key] = self._get_sigma_interpolator(
+                    imt, stddev_type)
+            output_table = self.interpolators[key](rctx.mag)
             if isinstance(imt, (imt_module.PGA, imt_module.PGV)):
-                interpolator = interp1d(self.magnitudes,
-                                        self.sigma[stddev_type][str(imt)],
-                                        axis=2)
-                output_tables.append(
-                    interpolator(rctx.mag).reshape(self.shape[0],
-                                                   self.shape[3]))
-
-            else:
-                # For spectral accelerations - need two step process
-                # Interpolate period
-                interpolator = interp1d(numpy.log10(self.periods),
-                                        self.sigma[stddev_type]["SA"],
-                                        axis=1)
-                period_table = interpolator(numpy.log10(imt.period))
-                mag_interpolator = interp1d(self.magnitudes,
-                                            period_table,
-                                            axis=1)
-                output_tables.append(mag_interpolator(rctx.mag))
+                output_table = output_table.reshape(self.shape[0],
+                                                    self.shape[3])
+            output_tables.append(output_table)
         return output_tables
 
 
@@ -338,8 +393,15 @@ class GMPETable(GMPE):
         self.distances = None
         self.distance_type = None
         self.amplification = None
+        # (imt, val_type) -> MagnitudeInterpolator, see _return_tables
+        self.interpolators = {}
         self._run_setup()
 
+    def __getstate__(self):
+        # the interpolators are a cache, rebuilt when needed after
+        # unpickling, so they are not sent to the workers
+        return dict(self.__dict__, interpolators={})
+
     def _run_setup(self):
         """
         Executes the preprocessing steps at the instantiation stage to read in
@@ -507,6 +569,15 @@ class GMPETable(GMPE):
         :param val_type:
             String indicating the type of data {"IMLs", "Total", "Inter" etc}
         """
+        # the interpolator depends only on the IMT and the value type, so
+        # it is stored and reused for all the magnitudes
+        key = (str(imt), val_type)
+        if key not in self.interpolators:
+            self.interpolators[key] = self._get_interpolator(imt, val_type)
+        return self._interpolate_magnitude(mag, self.interpolators[key])
+
+    def _get_interpolator(self, imt, val_type):
+        # the magnitude interpolator of the table of the given value type
         if isinstance(imt, (imt_module.PGA, imt_module.PGV)):
             # Get scalar imt
             if val_type == "IMLs":
@@ -535,7 +606,7 @@ class GMPETable(GMPE):
                                     numpy.log10(iml_table),
                                     axis=1)
             iml_table = 10. ** interpolator(numpy.log10(imt.period))
-        return self.apply_magnitude_interpolation(mag, iml_table)
+        return MagnitudeInterpolator(self.m_w, numpy.log10(iml_table), axis=1)
 
     def apply_magnitude_interpolation(self, mag, iml_table):
         """
@@ -546,6 +617,12 @@ class GMPETable(GMPE):
         :param iml_table:
             Intensity measure level table
         """
+        # It is assumed that log10 of the spectral acceleration scales
+        # linearly (or approximately linearly) with magnitude
+        return self._interpolate_magnitude(mag, MagnitudeInterpolator(
+            self.m_w, numpy.log10(iml_table), axis=1))
+
+    def _interpolate_magnitude(self, mag, interpolator):
         # do not allow "mag" to exceed maximum table magnitude
         if mag > self.m_w[-1]:
             mag = self.m_w[-1]
@@ -556,7 +633,4 @@ class GMPETable(GMPE):
                              "(%.2f to %.2f)" % (mag,
                                                  self.m_w[0],
                                                  self.m_w[-1]))
-        # It is assumed that log10 of the spectral acceleration scales
-        # linearly (or approximately linearly) with magnitude
-        m_interpolator = interp1d(self.m_w, numpy.log10(iml_table), axis=1)
-        return 10.0 ** m_interpolator(mag)
+        return 10.0 ** interpolator(mag)
@@ -73,16 +73,21 @@ supplemented by a dictionary of validators.
 """
 from __future__ import print_function
 import io
+import os
 import re
 import sys
 import copy
+import pickle
+import hashlib
 import decimal
+import tempfile
 import logging
 import operator
 import collections
 
 import numpy
 
+from openquake.baselib import __version__
 from openquake.baselib.general import CallableDict, groupby
 from openquake.baselib.node import (
     node_to_xml, Node, striptag, ValidatingXmlParser, floatformat)
@@ -157,6 +162,70 @@ def get_source_model_05(node, fname, converter):
         groups.append(converter.convert_node(src_group))
     return sorted(groups)
 
+
+def stream_source_model(fname, converter, convert_sources=None):
+    """
+    Parse a NRML source model and return its source groups, like
+    `parse(fname, converter)`, without building the full tree of nodes:
+    each source node is converted as soon as it has been read and then
+    discarded, so that the memory occupation is bounded by the largest
+    source and not by the size of the file.
+
+    :param fname:
+        the full pathname of the source model file
+    :param converter:
+        a :class:`openquake.hazardlib.sourceconverter.SourceConverter`
+    :param convert_sources:
+        a function taking an iterator over source nodes and returning the
+        list of the converted sources in the same order (by default each
+        node is converted by the converter)
+    """
+    converter.fname = fname
+    ends = []  # pairs (group or model node, number of sources before it)
+    root = []
+
+    def gen_src_nodes():
+        num_nodes = 0
+        for node in read_lazy(fname, ['sourceModel', 'sourceGroup']):
+            tag = striptag(node.tag)
+            if tag in ('sourceGroup', 'sourceModel'):
+                ends.append((node, num_nodes))
+            elif tag == 'nrml':  # the root node, always the last one
+                root.append(node)
+            else:  # a source node
+                num_nodes += 1
+                if num_nodes % 10000 == 0:  # log every 10,000 sources
+                    logging.info('Read %d sources from %s', num_nodes, fname)
+                yield node
+    if convert_sources is None:
+        sources = [converter.convert_node(node) for node in gen_src_nodes()]
+    else:
+        sources = convert_sources(gen_src_nodes())
+    if not ends:  # not a source model
+        [model] = root[0]
+        return node_to_obj(model, fname, converter)
+    groups = []
+    start = 0
+    for node, stop in ends:
+        srcs = sources[start:stop]
+        start = stop
+        if striptag(node.tag) == 'sourceGroup':
+            groups.append(converter.convert_sourceGroup(node, srcs))
+        elif get_tag_version(node)[1] == 'nrml/0.4':
+            source_ids = set()
+            for src in srcs:
+                if src.source_id in source_ids:
+                    raise DuplicatedID(
+                        'The source ID %s is duplicated!' % src.source_id)
+                source_ids.add(src.source_id)
+            grouped = groupby(
+                srcs, operator.attrgetter('tectonic_region_type'))
+            groups = [sourceconverter.SourceGroup(trt, srcs)
+                      for trt, srcs in grouped.items()]
+        elif srcs:
+            raise ValueError('expected sourceGroup')
+    return sorted(groups)
+
 validators = {
     'strike': valid.strike_range,
     'dip': valid.dip_range,
@@ -247,20 +316,60 @@ validators = {
 }
 
 
+def get_cache_key(fname, converter):
+    """
+    :param fname: the full pathname of a source model file
+    :param converter: a :class:`SourceConverter` instance
+    :returns: a hex digest depending on the content of the file, on the
+              parameters of the converter and on the engine version
+    """
+    sha = hashlib.sha1()
+    with open(fname, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            sha.update(block)
+    params = (__version__, converter.tom.time_span,
+              converter.rupture_mesh_spacing,
+              converter.complex_fault_mesh_spacing,
+              converter.width_of_mfd_bin,
+              converter.area_source_discretization)
+    sha.update(repr(params).encode('utf-8'))
+    return sha.hexdigest()
+
+
 class SourceModelParser(object):
     """
-    A source model parser featuring a cache.
+    A source model parser featuring a cache. If a `cache_dir` is given,
+    the converted source groups are also pickled on the filesystem, with
+    a name depending on the checksum of the source model file and on the
+    parameters of the converter, so that successive runs do not need to
+    parse the XML again.
 
     :param converter:
         :class:`openquake.commonlib.source.SourceConverter` instance
+    :param cache_dir:
+        directory where to store the parsed source models (or None)
+    :param convert_sources:
+        function converting the source nodes (see
+        :func:`stream_source_model`) or None
     """
-    def __init__(self, converter):
+    def __init__(self, converter, cache_dir=None, convert_sources=None):
         self.converter = converter
+        self.cache_dir = cache_dir
+        self.convert_sources = convert_sources
         self.groups = {}  # cache fname -> groups
         self.fname_hits = collections.Counter()  # fname -> number of calls
+        self.sources = {}  # (fname, grp, src, branch_ids) -> modified source
 
     def parse_src_groups(self, fname, apply_uncertainties=None):
         """
+        The returned sources are copies of the cached ones, since they are
+        modified later on (for instance their src_group_id is set). Sources
+        untouched by the uncertainties are shallow copies, so that they share
+        the MFD and geometry with the cached sources; the others are deep
+        copies. If `apply_uncertainties` has a `get_branch_ids` attribute,
+        the modified sources and their number of ruptures are computed once
+        for each set of branches modifying them, otherwise at each call.
+
         :param fname:
             the full pathname of the source model file
         :param apply_uncertainties:
@@ -270,32 +379,86 @@ class SourceModelParser(object):
             groups = self.groups[fname]
         except KeyError:
             groups = self.groups[fname] = self.parse_groups(fname)
-        # NB: deepcopy is *essential* here
-        groups = [copy.deepcopy(g) for g in groups]
-        for group in groups:
+        get_branch_ids = getattr(apply_uncertainties, 'get_branch_ids', None)
+        new_groups = []
+        for grp_no, group in enumerate(groups):
+            new_group = copy.copy(group)
+            new_group.sources = []
             nrup = 0
-            for src in group:
+            for src_no, src in enumerate(group):
                 if apply_uncertainties:
-                    apply_uncertainties(src)
-                    src.num_ruptures = src.count_ruptures()
+                    if get_branch_ids:
+                        key = fname, grp_no, src_no, get_branch_ids(src)
+                        src = self._get_source(key, src, apply_uncertainties)
+                    else:
+                        src = copy.deepcopy(src)
+                        apply_uncertainties(src)
+                        src.num_ruptures = src.count_ruptures()
                     nrup += src.num_ruptures
+                new_group.sources.append(copy.copy(src))
             # NB: if the user sets a wrong discretization parameter
             # the call to `.count_ruptures()` can be ultra-slow
             logging.debug("%s, %s: parsed %d source(s) with %d ruptures",
                           fname, group.trt, len(group), nrup)
+            new_groups.append(new_group)
         self.fname_hits[fname] += 1
-        return groups
+        return new_groups
+
+    def _get_source(self, key, src, apply_uncertainties):
+        # return the source modified by the uncertainties and with the number
+        # of ruptures set, from the cache if possible; it must be copied
+        try:
+            return self.sources[key]
+        except KeyError:
+            pass
+        if key[-1]:  # the source is modified by some branch
+            src = copy.deepcopy(src)
+            apply_uncertainties(src)
+        else:
+            src = copy.copy(src)
+        src.num_ruptures = src.count_ruptures()
+        self.sources[key] = src
+        return src
 
     def parse_groups(self, fname):
         """
         Parse all the groups and return them ordered by number of sources.
-        It does not count the ruptures, so it is relatively fast.
+        It does not count the ruptures, so it is relatively fast. If the
+        parser has a `cache_dir`, the groups are read from the cache when
+        possible, otherwise they are parsed and stored in the cache.
 
         :param fname:
             the full pathname of the source model file
         """
+        if not self.cache_dir:
+            return self._parse_groups(fname)
+        cache = os.path.join(
+            self.cache_dir, get_cache_key(fname, self.converter) + '.pik')
+        if os.path.exists(cache):
+            try:
+                with open(cache, 'rb') as f:
+                    groups = pickle.load(f)
+            except Exception as exc:  # corrupted or incompatible file
+                logging.warning('Could not read %s: %s', cache, exc)
+            else:
+                logging.info('Read the source model %s from %s',
+                             fname, cache)
+                return groups
+        groups = self._parse_groups(fname)
+        if not os.path.exists(self.cache_dir):
+            os.makedirs(self.cache_dir)
+        # write on a temporary file and then rename it, so that concurrent
+        # calculations never see a partially written cache file
+        fd, tmp = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+        with os.fdopen(fd, 'wb') as f:
+            pickle.dump(groups, f, pickle.HIGHEST_PROTOCOL)
+        os.rename(tmp, cache)
+        return groups
+
+    def _parse_groups(self, fname):
         try:
-            return parse(fname, self.converter)
+            return stream_source_model(fname, self.converter,
+                                       self.convert_sources)
         except ValueError as e:
             err = str(e)
             e1 = 'Surface does not conform with Aki & Richards convention'
@@ -320,17 +483,39 @@ def read(source, chatty=True, stop=None):
     """
     vparser = ValidatingXmlParser(validators, stop)
     nrml = vparser.parse_file(source)
-    if striptag(nrml.tag) != 'nrml':
+    nrml['xmlns'] = _get_xmlns(source, nrml.tag, chatty)
+    nrml['xmlns:gml'] = GML_NAMESPACE
+    return nrml
+
+
+def _get_xmlns(source, tag, chatty=True):
+    # check the tag of the root node and extract the XML namespace URL
+    # ('http://openquake.org/xmlns/nrml/0.5')
+    if striptag(tag) != 'nrml':
         raise ValueError('%s: expected a node of kind nrml, got %s' %
-                         (source, nrml.tag))
-    # extract the XML namespace URL ('http://openquake.org/xmlns/nrml/0.5')
-    xmlns = nrml.tag.split('}')[0][1:]
+                         (source, tag))
+    xmlns = tag.split('}')[0][1:]
     if xmlns != NRML05 and chatty:
         # for the moment NRML04 is still supported, so we hide the warning
         logging.debug('%s is at an outdated version: %s', source, xmlns)
-    nrml['xmlns'] = xmlns
-    nrml['xmlns:gml'] = GML_NAMESPACE
-    return nrml
+    return xmlns
+
+
+def read_lazy(source, lazytags):
+    """
+    Convert a NRML file into a lazy iterator over validated Node objects,
+    see :meth:`openquake.baselib.node.ValidatingXmlParser.parse_lazy`.
+
+    :param source:
+        a file name or file object open for reading
+    :param lazytags:
+        the tags of the nodes whose children must be returned one at the time
+    """
+    vparser = ValidatingXmlParser(validators)
+    for i, node in enumerate(vparser.parse_lazy(source, lazytags)):
+        if i == 0:  # the root node has been opened, check it
+            _get_xmlns(source, vparser.root_tag)
+        yield node
 
 
 def write(nodes, output=sys.stdout, fmt='%.7E', gml=True, xmlns=None):
@@ -48,6 +48,8 @@ class AreaSource(ParametricSeismicSource):
 
     RUPTURE_WEIGHT = 0.1
 
+    _num_points = None  # set by count_ruptures
+
     def __init__(self, source_id, name, tectonic_region_type,
                  mfd, rupture_mesh_spacing,
                  magnitude_scaling_relationship, rupture_aspect_ratio,
@@ -146,9 +148,17 @@ class AreaSource(ParametricSeismicSource):
         See
         :meth:`openquake.hazardlib.source.base.BaseSeismicSource.count_ruptures`
         for description of parameters and return value.
+
+        The number of points of the polygon mesh is cached on the source
+        together with a key identifying the polygon and its discretization,
+        so that the polygon is discretized only once.
         """
-        polygon_mesh = self.polygon.discretize(self.area_discretization)
-        return (len(polygon_mesh) *
+        geom_key = (self.area_discretization, tuple(self.polygon.lons),
+                    tuple(self.polygon.lats))
+        if self._num_points is None or self._num_points[0] != geom_key:
+            polygon_mesh = self.polygon.discretize(self.area_discretization)
+            self._num_points = (geom_key, len(polygon_mesh))
+        return (self._num_points[1] *
                 len(self.get_annual_occurrence_rates()) *
                 len(self.nodal_plane_distribution.data) *
                 len(self.hypocenter_distribution.data))
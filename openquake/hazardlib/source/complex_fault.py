@@ -51,6 +51,8 @@ class ComplexFaultSource(ParametricSeismicSource):
     start = stop = None  # these will be set by the engine to extract
     # a slice of the rupture_slices, thus splitting the source
 
+    _rupture_counts = None  # set by count_ruptures
+
     _slots_ = ParametricSeismicSource._slots_ + '''edges rake'''.split()
 
     MODIFICATIONS = set(('set_geometry',))
@@ -140,25 +142,46 @@ class ComplexFaultSource(ParametricSeismicSource):
         """
         See :meth:
         `openquake.hazardlib.source.base.BaseSeismicSource.count_ruptures`.
+
+        The number of rupture placements for each rupture size is cached
+        on the source together with a key identifying the fault geometry,
+        so that the fault mesh is built only when a new rupture size is
+        found. Counting the ruptures of copies of the same source with
+        different magnitude-frequency distributions (as it happens for
+        the logic tree branches) is then cheap.
         """
-        whole_fault_surface = ComplexFaultSurface.from_fault_data(
-            self.edges, self.rupture_mesh_spacing
-        )
-        whole_fault_mesh = whole_fault_surface.get_mesh()
-        cell_center, cell_length, cell_width, cell_area = (
-            whole_fault_mesh.get_cell_dimensions()
-        )
+        geom_key = self._get_geometry_key()
+        if self._rupture_counts is None or self._rupture_counts[0] != geom_key:
+            self._rupture_counts = (geom_key, {})
+        counts_by_size = self._rupture_counts[1]
+        cell_length = cell_area = None
         counts = 0
         for (mag, mag_occ_rate) in self.get_annual_occurrence_rates():
             rupture_area = self.magnitude_scaling_relationship.get_median_area(
                 mag, self.rake)
             rupture_length = numpy.sqrt(
                 rupture_area * self.rupture_aspect_ratio)
-            rupture_slices = _float_ruptures(
-                rupture_area, rupture_length, cell_area, cell_length)
-            counts += len(rupture_slices[self.start:self.stop])
+            size = (rupture_area, rupture_length)
+            if size not in counts_by_size:
+                if cell_area is None:
+                    whole_fault_mesh = ComplexFaultSurface.from_fault_data(
+                        self.edges, self.rupture_mesh_spacing).get_mesh()
+                    _, cell_length, _, cell_area = (
+                        whole_fault_mesh.get_cell_dimensions())
+                counts_by_size[size] = len(_float_ruptures(
+                    rupture_area, rupture_length, cell_area, cell_length))
+            num_slices = counts_by_size[size]
+            counts += len(range(*slice(self.start, self.stop).indices(
+                num_slices)))
         return counts
 
+    def _get_geometry_key(self):
+        # the coordinates of the edges and the mesh spacing, i.e. all
+        # the parameters determining the mesh of the whole fault
+        return (self.rupture_mesh_spacing,) + tuple(
+            tuple((point.longitude, point.latitude, point.depth)
+                  for point in edge.points) for edge in self.edges)
+
     def modify_set_geometry(self, edges, spacing):
         """
         Modifies the complex fault geometry
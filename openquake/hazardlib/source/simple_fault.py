@@ -215,18 +215,19 @@ class SimpleFaultSource(ParametricSeismicSource):
                                     rupture_slip_direction
                                 )
 
-    # TODO: fix the count in the case of hypo_list and slip_list
     def count_ruptures(self):
         """
         See :meth:
         `openquake.hazardlib.source.base.BaseSeismicSource.count_ruptures`.
+
+        The number of ruptures is computed from the shape of the fault mesh,
+        obtained with SimpleFaultSurface.get_mesh_shape without building
+        the mesh.
         """
-        whole_fault_surface = SimpleFaultSurface.from_fault_data(
+        mesh_rows, mesh_cols = SimpleFaultSurface.get_mesh_shape(
             self.fault_trace, self.upper_seismogenic_depth,
             self.lower_seismogenic_depth, self.dip, self.rupture_mesh_spacing
         )
-        whole_fault_mesh = whole_fault_surface.get_mesh()
-        mesh_rows, mesh_cols = whole_fault_mesh.shape
         fault_length = float((mesh_cols - 1) * self.rupture_mesh_spacing)
         fault_width = float((mesh_rows - 1) * self.rupture_mesh_spacing)
         counts = 0
@@ -236,9 +237,10 @@ class SimpleFaultSource(ParametricSeismicSource):
             num_rup_along_length = mesh_cols - rup_cols + 1
             num_rup_along_width = mesh_rows - rup_rows + 1
             counts += num_rup_along_length * num_rup_along_width
-            n_hypo = len(self.hypo_list) or 1
-            n_slip = len(self.slip_list) or 1
-        return counts * n_hypo * n_slip
+        if not len(self.hypo_list) and not len(self.slip_list):
+            return counts
+        # a rupture for each combination of hypocentre and slip direction
+        return counts * len(self.hypo_list) * len(self.slip_list)
 
     def _get_rupture_dimensions(self, fault_length, fault_width, mag):
         """
@@ -728,12 +728,15 @@ class SourceConverter(RuptureConverter):
     def convert_sourceModel(self, node):
         return [self.convert_node(subnode) for subnode in node]
 
-    def convert_sourceGroup(self, node):
+    def convert_sourceGroup(self, node, sources=None):
         """
         Convert the given node into a SourceGroup object.
 
         :param node:
             a node with tag sourceGroup
+        :param sources:
+            the sources of the group, if they have been already converted
+            (by default the children of the node are converted)
         :returns:
             a :class:`SourceGroup` instance
         """
@@ -743,9 +746,10 @@ class SourceConverter(RuptureConverter):
         grp_attrs = {k: v for k, v in node.attrib.items()
                      if k not in ('name', 'src_interdep', 'rup_interdep',
                                   'srcs_weights')}
+        if sources is None:
+            sources = (self.convert_node(src_node) for src_node in node)
         sg = SourceGroup(trt)
-        for src_node in node:
-            src = self.convert_node(src_node)
+        for src in sources:
             # transmit the group attributes to the underlying source
             for attr, value in grp_attrs.items():
                 if attr == 'tectonicRegion':
@@ -756,9 +760,9 @@ class SourceConverter(RuptureConverter):
                     setattr(src, attr, node[attr])
             sg.update(src)
         if srcs_weights is not None:
-            if len(srcs_weights) != len(node):
+            if len(srcs_weights) != len(sg):
                 raise ValueError('There are %d srcs_weights but %d source(s)'
-                                 % (len(srcs_weights), len(node)))
+                                 % (len(srcs_weights), len(sg)))
         sg.name = node.attrib.get('name')
         sg.src_interdep = node.attrib.get('src_interdep', 'indep')
         sg.rup_interdep = node.attrib.get('rup_interdep', 'indep')
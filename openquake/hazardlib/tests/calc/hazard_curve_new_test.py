@@ -15,11 +15,14 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
 import os
+import pickle
 import unittest
+import mock
 import numpy
 import numpy.testing as npt
 
 from openquake.baselib.general import DictArray
+from openquake.baselib.parallel import Shared
 from openquake.hazardlib.source import NonParametricSeismicSource
 from openquake.hazardlib.source.rupture import BaseRupture
 from openquake.hazardlib.sourceconverter import SourceConverter
@@ -30,6 +33,7 @@ from openquake.hazardlib.geo.geodetic import point_at
 from openquake.hazardlib.calc.filters import SourceFilter
 from openquake.hazardlib.calc.hazard_curve import calc_hazard_curves
 from openquake.hazardlib.calc.hazard_curve import pmap_from_grp
+from openquake.hazardlib.calc.hazard_curve import pmap_from_trt
 from openquake.hazardlib.gsim.sadigh_1997 import SadighEtAl1997
 from openquake.hazardlib.gsim.si_midorikawa_1999 import SiMidorikawa1999SInter
 from openquake.hazardlib.gsim.campbell_2003 import Campbell2003
@@ -221,3 +225,31 @@ class MultiPointTestCase(unittest.TestCase):
         psources = list(mps1) + list(mps2)
         hcurves = calc_hazard_curves(psources, sitecol, imtls, gsim_by_trt)
         npt.assert_almost_equal(hcurves['PGA'][0], expected)
+
+
+class PmapFromTrtTestCase(unittest.TestCase):
+    def test_subtasks_with_shared_filter(self):
+        # the unprocessed sources are sent back with the handle of the
+        # broadcast filter, not with the filter itself
+        src1 = _create_non_param_sourceA(15., 6.3, PMF([(0.6, 0), (0.4, 1)]))
+        src2 = _create_non_param_sourceA(10., 6.0, PMF([(0.7, 0), (0.3, 1)]))
+        site = Site(Point(0.0, 0.0), 800, True, z1pt0=100., z2pt5=1.)
+        imtls = DictArray({'PGA': [0.01, 0.1, 0.3]})
+        with mock.patch.dict(os.environ, OQ_DISTRIBUTE='futures'):
+            shared = Shared(SourceFilter(SiteCollection([site]), {}))
+            self.addCleanup(shared.close)
+            # the filter as received by a task
+            src_filter = pickle.loads(pickle.dumps(shared))
+            srcs = [src1, src2]
+            for src in srcs:
+                src.src_group_id = 0
+                src.num_ruptures = 2
+            param = dict(imtls=imtls, task_duration=1E-9)
+            pmap = pmap_from_trt(srcs, src_filter, [SadighEtAl1997()], param)
+            [args] = pmap.subtasks
+            self.assertEqual(args[0], [src2])
+            self.assertIsInstance(args[1], Shared)
+            self.assertFalse(any(isinstance(arg, SourceFilter)
+                                 for arg in args))
+            self.assertIsInstance(pickle.loads(pickle.dumps(args[1])),
+                                  SourceFilter)
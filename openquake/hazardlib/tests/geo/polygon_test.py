@@ -437,6 +437,25 @@ class PolygonDilateTestCase(unittest.TestCase):
         poly.dilate(dilation)
 
 
+class PolygonBoundingCircleTestCase(unittest.TestCase):
+    def test_points_inside_circle(self):
+        poly = polygon.Polygon([geo.Point(0, 0), geo.Point(0, 1),
+                                geo.Point(1, 0.5)])
+        lons, lats = numpy.meshgrid(numpy.linspace(-1, 2, 61),
+                                    numpy.linspace(-1, 2, 61))
+        mesh = geo.Mesh(lons.flatten(), lats.flatten(), None)
+        for poly in [poly, poly.dilate(20)]:
+            clon, clat, radius = poly.get_bounding_circle()
+            dists = geo.geodetic.geodetic_distance(
+                clon, clat, mesh.lons, mesh.lats)
+            inside = poly.intersects(mesh)
+            self.assertTrue(inside.any())
+            self.assertTrue((dists[inside] <= radius).all())
+            # the vertices are not farther than the radius
+            self.assertLessEqual(geo.geodetic.geodetic_distance(
+                clon, clat, poly.lons, poly.lats).max(), radius + 1E-6)
+
+
 class PolygonWKTTestCase(unittest.TestCase):
     """
     Test generation of WKT from a
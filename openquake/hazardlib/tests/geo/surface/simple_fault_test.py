@@ -144,6 +144,21 @@ class SimpleFaultSurfaceGetMeshTestCase(utils.SurfaceTestCase):
 
         self.assert_mesh_is(fault, test_data.TEST_TOPO_MESH)
 
+    def test_get_mesh_shape(self):
+        # the shape is computed without building the mesh
+        trace = Line([Point(0.0, 0.0), Point(0.0, 0.0359728811759),
+                      Point(0.0190775080917, 0.0550503815182),
+                      Point(0.03974514139, 0.0723925718856)])
+        for args in [(trace, 0.0, 4.2426406871192848, 45.0, 1.0),
+                     (trace, 2.12132034356, 4.2426406871192848, 45.0, 1.0),
+                     (trace, 0.0, 4.0, 90.0, 1.0),
+                     (trace, 0.0, 12.0, 30.0, 0.5),
+                     (Line([Point(179.9, 0.0), Point(180.0, 0.0),
+                            Point(-179.9, 0.0)]), 1.0, 6.0, 90.0, 1.0)]:
+            mesh = SimpleFaultSurface.from_fault_data(*args).get_mesh()
+            self.assertEqual(SimpleFaultSurface.get_mesh_shape(*args),
+                             mesh.shape)
+
 
 class SimpleFaultSurfaceGetStrikeTestCase(utils.SurfaceTestCase):
     def test_get_strike_1(self):
@@ -19,6 +19,8 @@
 import mock
 import unittest
 from nose.tools import assert_equal
+from openquake.baselib.general import run_in_process
+from openquake.hazardlib import gsim
 from openquake.hazardlib.gsim import get_available_gsims
 from openquake.hazardlib.gsim.base import GMPE
 
@@ -55,3 +57,38 @@ class AvailableGSIMTestCase(unittest.TestCase):
                 assert_equal(list(get_available_gsims().values()),
                              [FakeModule.AtkinsonBoore2006,
                               FakeModule.BooreAtkinson2008])
+
+
+class GsimRegistryTestCase(unittest.TestCase):
+
+    def test_index_up_to_date(self):
+        # if this fails, regenerate the index with gsim.write_index()
+        self.assertEqual(gsim.INDEX, gsim.build_index())
+
+    def test_lazy_import(self):
+        # only the module of the requested GSIM is imported
+        modules = run_in_process('''\
+import sys
+from openquake.hazardlib import valid
+valid.gsim('BooreAtkinson2008')
+print(sorted(m for m in sys.modules
+             if m.startswith('openquake.hazardlib.gsim.')))''')
+        self.assertIn('openquake.hazardlib.gsim.boore_atkinson_2008', modules)
+        self.assertNotIn('openquake.hazardlib.gsim.zhao_2006', modules)
+
+    def test_outdated_index(self):
+        registry = gsim.GsimRegistry({'BooreAtkinson2008': 'zhao_2006'})
+        self.assertEqual(registry['BooreAtkinson2008'].__name__,
+                         'BooreAtkinson2008')
+        self.assertEqual(registry['ChiouYoungs2014'].__name__,
+                         'ChiouYoungs2014')
+        with self.assertRaises(KeyError):
+            registry['NotAGsim']
+
+    def test_register(self):
+        registry = gsim.GsimRegistry({})
+        registry['FakeGsim'] = FakeModule.AtkinsonBoore2006
+        self.assertIn('FakeGsim', list(registry))
+        self.assertIs(registry['FakeGsim'], FakeModule.AtkinsonBoore2006)
+        del registry['FakeGsim']
+        self.assertNotIn('FakeGsim', list(registry))
@@ -17,6 +17,7 @@
 # along with OpenQuake. If not, see <http://www.gnu.org/licenses/>.
 
 import os
+import pickle
 import tempfile
 import unittest
 
@@ -733,6 +734,83 @@ class GSIMTableTestCaseNoAmplification(unittest.TestCase):
         np.testing.assert_array_almost_equal(sigma[0], 0.5 * np.ones(5), 5)
 
 
+class MagnitudeInterpolatorTestCase(unittest.TestCase):
+    """
+    Tests that the cached magnitude interpolators give exactly the same
+    results as the scipy interpolators built at each call
+    """
+    MAGS = [5.0, 5.1, 5.5, 6.0, 6.234, 6.5, 6.99, 7.0]
+
+    def test_gmpe_table(self):
+        fname = os.path.join(BASE_DATA_PATH, "Wcrust_rjb_med.hdf5")
+        gsim = GMPETable(gmpe_table=fname)
+        mags = np.linspace(gsim.m_w[0], gsim.m_w[-1], 23)
+        for imt in [imt_module.PGA(), imt_module.SA(0.2),
+                    imt_module.SA(1.0)]:
+            for val_type in ["IMLs", const.StdDev.TOTAL]:
+                if isinstance(imt, imt_module.PGA):
+                    table = (gsim.imls if val_type == "IMLs" else
+                             gsim.stddevs[val_type])["PGA"]
+                    table = table.reshape(table.shape[0], table.shape[2])
+                else:
+                    data = (gsim.imls if val_type == "IMLs" else
+                            gsim.stddevs[val_type])
+                    table = 10. ** interp1d(np.log10(data["T"]),
+                                            np.log10(data["SA"]),
+                                            axis=1)(np.log10(imt.period))
+                for mag in np.concatenate([mags, gsim.m_w]):
+                    expected = 10.0 ** interp1d(
+                        gsim.m_w, np.log10(table), axis=1)(mag)
+                    np.testing.assert_array_equal(
+                        gsim._return_tables(mag, imt, val_type), expected)
+        self.assertEqual(len(gsim.interpolators), 6)
+
+    def test_pickle(self):
+        # the cached interpolators are not pickled with the GSIM
+        fname = os.path.join(BASE_DATA_PATH, "Wcrust_rjb_med.hdf5")
+        gsim = GMPETable(gmpe_table=fname)
+        expected = gsim._return_tables(6.0, imt_module.SA(0.2), "IMLs")
+        self.assertEqual(len(gsim.interpolators), 1)
+        gsim = pickle.loads(pickle.dumps(gsim))
+        self.assertEqual(gsim.interpolators, {})
+        np.testing.assert_array_equal(
+            gsim._return_tables(6.0, imt_module.SA(0.2), "IMLs"), expected)
+
+    def test_amplification_table(self):
+        with h5py.File(os.path.join(
+                BASE_DATA_PATH, "model_amplification_site.hdf5")) as hdf5:
+            amp_table = AmplificationTable(hdf5["Amplification"],
+                                           hdf5["Mw"][:],
+                                           hdf5["Distances"][:])
+        stddev_types = [const.StdDev.TOTAL]
+        rctx = RuptureContext()
+        for mag in self.MAGS:
+            rctx.mag = mag
+            # PGA
+            expected = 10.0 ** interp1d(
+                amp_table.magnitudes, np.log10(amp_table.mean["PGA"]),
+                axis=2)(mag).reshape(amp_table.shape[0], amp_table.shape[3])
+            np.testing.assert_array_equal(
+                amp_table.get_mean_table(imt_module.PGA(), rctx), expected)
+            [sigma] = amp_table.get_sigma_tables(
+                imt_module.PGA(), rctx, stddev_types)
+            expected = interp1d(
+                amp_table.magnitudes, amp_table.sigma["Total"]["PGA"],
+                axis=2)(mag).reshape(amp_table.shape[0], amp_table.shape[3])
+            np.testing.assert_array_equal(sigma, expected)
+            # SA
+            period_table = interp1d(np.log10(amp_table.periods),
+                                    np.log10(amp_table.mean["SA"]),
+                                    axis=1)(np.log10(0.3))
+            expected = 10.0 ** interp1d(amp_table.magnitudes, period_table,
+                                        axis=1)(mag)
+            np.testing.assert_array_equal(
+                amp_table.get_mean_table(imt_module.SA(0.3), rctx), expected)
+        rctx.mag = 8.5
+        with self.assertRaises(ValueError):
+            amp_table.get_mean_table(imt_module.PGA(), rctx)
+
+
 class GSIMTableQATestCase(BaseGSIMTestCase):
     """
     Quality Assurance test case with real data taken from the
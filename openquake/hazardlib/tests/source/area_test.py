@@ -109,6 +109,17 @@ class AreaSourceIterRupturesTestCase(unittest.TestCase):
             self.assertNotEqual(rupture.occurrence_rate, 3)
             self.assertEqual(rupture.occurrence_rate, 3.0 / 8.0)
 
+    def test_count_ruptures_after_changing_discretization(self):
+        # the cached number of points depends on the discretization
+        polygon = Polygon([Point(0, 0), Point(0, -0.2248),
+                           Point(-0.2248, -0.2248), Point(-0.2248, 0)])
+        source = self.make_area_source(polygon, discretization=10)
+        self.assertEqual(source.count_ruptures(),
+                         len(list(source.iter_ruptures())))
+        source.area_discretization = 5
+        self.assertEqual(source.count_ruptures(),
+                         len(list(source.iter_ruptures())))
+
 
 class AreaSourceRupEncPolyTestCase(unittest.TestCase):
     def test_no_dilation(self):
@@ -391,3 +391,20 @@ class ModifyComplexFaultGeometryTestCase(unittest.TestCase):
                                    exp_lats_bot[iloc])
             self.assertAlmostEqual(fault.edges[1].points[iloc].depth,
                                    exp_depths_bot[iloc])
+
+    def test_count_ruptures_after_modify_geometry(self):
+        # the cached number of ruptures depends on the geometry
+        self.mfd = EvenlyDiscretizedMFD(6.0, 0.5, [1.0, 1.0, 1.0])
+        fault = self._make_source(self.edges)
+        self.assertEqual(fault.count_ruptures(),
+                         len(list(fault.iter_ruptures())))
+        top_edge_2 = Line([Point(29.9, 30.0, 2.0), Point(31.1, 30.0, 2.1)])
+        bottom_edge_2 = Line([Point(29.6, 29.9, 29.0),
+                              Point(31.4, 29.9, 33.0)])
+        fault.modify_set_geometry([top_edge_2, bottom_edge_2], 4.0)
+        self.assertEqual(fault.count_ruptures(),
+                         len(list(fault.iter_ruptures())))
+        # and is sliced like the ruptures when splitting the source
+        fault.start, fault.stop = 2, 20
+        self.assertEqual(fault.count_ruptures(),
+                         len(list(fault.iter_ruptures())))
@@ -649,6 +649,22 @@ class HypoLocSlipRupture(unittest.TestCase):
                                    slip[i], delta=0.1)
             self.assertAlmostEqual(rup.occurrence_rate, rate[i], delta=0.01)
 
+    def test_count_ruptures(self):
+        self.src_mfd = mfdeven.EvenlyDiscretizedMFD(6.5, 0.5, [1., 1., 1.])
+        hypo_list = numpy.array([[0.25, 0.25, 0.4], [0.75, 0.75, 0.6]])
+        slip_list = numpy.array([[90., 0.25], [0., 0.75]])
+        for hypos, slips in [([], []), (hypo_list, slip_list)]:
+            src = SimpleFaultSource('test-source', 'test-source',
+                                    TRT.ACTIVE_SHALLOW_CRUST,
+                                    self.src_mfd, 5., self.sarea, 1.,
+                                    self.src_tom,
+                                    self.upper_seismogenic_depth,
+                                    self.lower_seismogenic_depth,
+                                    self.fault_trace, self.dip,
+                                    self.rake, hypos, slips)
+            self.assertEqual(src.count_ruptures(),
+                             len(list(src.iter_ruptures())))
+
 
 class ModifySimpleFaultTestCase(_BaseFaultSourceTestCase):
     """
@@ -36,7 +36,7 @@ from openquake.hazardlib.calc.filters import IntegrationDistance
 
 SCALEREL = scalerel.get_available_magnitude_scalerel()
 
-GSIM = gsim.get_available_gsims()
+GSIM = gsim.registry
 
 disagg_outs = ['_'.join(tup) for tup in sorted(disagg.pmf_map)]
 
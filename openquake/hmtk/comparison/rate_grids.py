@@ -52,13 +52,100 @@ import numpy as np
 from openquake.hazardlib.sourceconverter import SourceConverter
 from openquake.hazardlib.source import area_to_point_sources
 from openquake.hazardlib.nrml import SourceModelParser
-from openquake.hazardlib.source.complex_fault import ComplexFaultSource
+from openquake.hazardlib.source.complex_fault import (
+    ComplexFaultSource, _float_ruptures)
 from openquake.hazardlib.source.characteristic import CharacteristicFaultSource
 from openquake.hazardlib.source.simple_fault import SimpleFaultSource
 from openquake.hazardlib.source.area import AreaSource
 from openquake.hazardlib.source.point import PointSource
 from openquake.hazardlib.geo.mesh import Mesh
 from openquake.hazardlib.geo.polygon import Polygon
+from openquake.hazardlib.geo.surface.simple_fault import SimpleFaultSurface
+from openquake.hazardlib.geo.surface.complex_fault import ComplexFaultSurface
+
+
+def _get_mag_rates(source, mmin, mmax=np.inf):
+    """
+    Returns the magnitudes and the annual rates of the source in the
+    range mmin <= mag < mmax
+    """
+    mag_rates = np.array(source.get_annual_occurrence_rates(),
+                         dtype=float).reshape(-1, 2)
+    idx = np.logical_and(mag_rates[:, 0] >= mmin, mag_rates[:, 0] < mmax)
+    return mag_rates[idx]
+
+
+def _get_coverage(num_nodes, rup_nodes):
+    """
+    Returns the number of ruptures of `rup_nodes` nodes, floating along
+    a line of `num_nodes` nodes, containing each node
+    """
+    return np.convolve(np.ones(num_nodes - rup_nodes + 1), np.ones(rup_nodes))
+
+
+def _get_simple_fault_node_rates(source, mmin, mmax=np.inf):
+    """
+    Returns the mesh of the simple fault and the rate of each node, i.e. the
+    sum of the rates of the ruptures containing the node divided by their
+    number of nodes, as in
+    :meth:`openquake.hazardlib.source.simple_fault.SimpleFaultSource.
+    iter_ruptures`
+    """
+    mesh = SimpleFaultSurface.from_fault_data(
+        source.fault_trace, source.upper_seismogenic_depth,
+        source.lower_seismogenic_depth, source.dip,
+        source.rupture_mesh_spacing).get_mesh()
+    mesh_rows, mesh_cols = mesh.shape
+    fault_length = float((mesh_cols - 1) * source.rupture_mesh_spacing)
+    fault_width = float((mesh_rows - 1) * source.rupture_mesh_spacing)
+    if len(source.hypo_list) or len(source.slip_list):
+        weight = (sum(hypo[2] for hypo in source.hypo_list) *
+                  sum(slip[1] for slip in source.slip_list))
+    else:
+        weight = 1.0
+    node_rates = np.zeros(mesh.shape)
+    for mag, mag_occ_rate in _get_mag_rates(source, mmin, mmax):
+        rup_cols, rup_rows = source._get_rupture_dimensions(
+            fault_length, fault_width, mag)
+        num_rup = (mesh_cols - rup_cols + 1) * (mesh_rows - rup_rows + 1)
+        node_rate = weight * mag_occ_rate / float(num_rup * rup_cols *
+                                                  rup_rows)
+        node_rates += node_rate * np.outer(
+            _get_coverage(mesh_rows, rup_rows),
+            _get_coverage(mesh_cols, rup_cols))
+    return mesh, node_rates
+
+
+def _get_complex_fault_node_rates(source, mmin, mmax=np.inf):
+    """
+    Returns the mesh of the complex fault and the rate of each node, as in
+    :meth:`openquake.hazardlib.source.complex_fault.ComplexFaultSource.
+    iter_ruptures`
+    """
+    mesh = ComplexFaultSurface.from_fault_data(
+        source.edges, source.rupture_mesh_spacing).get_mesh()
+    _, cell_length, _, cell_area = mesh.get_cell_dimensions()
+    node_rates = np.zeros(mesh.shape)
+    for mag, mag_occ_rate in _get_mag_rates(source, mmin, mmax):
+        rupture_area = source.magnitude_scaling_relationship.get_median_area(
+            mag, source.rake)
+        rupture_length = np.sqrt(rupture_area * source.rupture_aspect_ratio)
+        rupture_slices = _float_ruptures(
+            rupture_area, rupture_length, cell_area, cell_length)
+        occurrence_rate = mag_occ_rate / float(len(rupture_slices))
+        for rupture_slice in rupture_slices[source.start:source.stop]:
+            rup_node_rates = node_rates[rupture_slice]
+            rup_node_rates += occurrence_rate / rup_node_rates.size
+    return mesh, node_rates
+
+
+def _get_characteristic_fault_node_rates(source, mmin, mmax=np.inf):
+    """
+    Returns the mesh of the characteristic fault and the rate of each node
+    """
+    mesh = source.surface.mesh
+    rate = _get_mag_rates(source, mmin, mmax)[:, 1].sum()
+    return mesh, np.ones(mesh.lons.shape) * rate / mesh.lons.size
 
 
 class RateGrid(object):
@@ -214,58 +301,91 @@ class RateGrid(object):
         :param float mmax:
             Maximum Magnitude
         """
-        xloc, yloc = self._get_point_location(source.location)
-        if (xloc is None) or (yloc is None):
-            return
-        # Get annual rates
-        annual_rate = source.get_annual_occurrence_rates()
-        mags = np.array([val[0] for val in annual_rate])
-        annual_rate = np.array([val[1] for val in annual_rate])
-        idx = np.logical_and(mags >= mmin, mags < mmax)
-        annual_rate = np.sum(annual_rate[idx])
-        for hypo_depth in source.hypocenter_distribution.data:
-            zloc = int((hypo_depth[1] - self.zlim[0]) / self.zspc)
-            if (zloc < 0) or (zloc >= (self.nz - 1)):
-                continue
-            else:
-                self.rates[xloc, yloc, zloc] += float(hypo_depth[0]) * \
-                                               annual_rate
+        self._add_epicentre_rates(
+            np.array([source.location.longitude]),
+            np.array([source.location.latitude]),
+            _get_mag_rates(source, mmin, mmax)[:, 1].sum(),
+            source.hypocenter_distribution)
 
     def _get_area_rates(self, source, mmin, mmax=np.inf):
         """
-        Adds the rates from the area source by discretising the source
-        to a set of point sources
+        Adds the rates from the area source, shared evenly among the nodes
+        of the discretised polygon as in
+        :func:`openquake.hazardlib.source.area_to_point_sources`, but without
+        building the point sources
 
         :param source:
             Area source as instance of :class:
             openquake.hazardlib.source.area.AreaSource
         """
-        points = list(area_to_point_sources(source))
-        for point in points:
-            self._get_point_rates(point, mmin, mmax)
+        mesh = source.polygon.discretize(source.area_discretization)
+        rate = _get_mag_rates(source, mmin, mmax)[:, 1].sum() / len(mesh)
+        self._add_epicentre_rates(mesh.lons, mesh.lats, rate,
+                                  source.hypocenter_distribution)
+
+    def _add_epicentre_rates(self, lons, lats, rate, hypocenter_distribution):
+        """
+        Adds the rate of each epicentre, distributed over the hypocentral
+        depths, to the cells containing them, as in
+        :meth:`_get_point_location`
+
+        :param np.ndarray lons:
+            Longitudes of the epicentres
+        :param np.ndarray lats:
+            Latitudes of the epicentres
+        :param float rate:
+            Activity rate of each epicentre
+        :param hypocenter_distribution:
+            Hypocentral depth distribution as instance of :class:
+            openquake.hazardlib.pmf.PMF
+        """
+        xloc = ((lons - self.xlim[0]) / self.xspc + 1E-7).astype(int)
+        yloc = ((lats - self.ylim[0]) / self.yspc + 1E-7).astype(int)
+        idx = ((lons >= self.xlim[0]) & (lons <= self.xlim[-1]) &
+               (lats >= self.ylim[0]) & (lats <= self.ylim[-1]) &
+               (xloc < self.nx - 1) & (yloc < self.ny - 1))
+        if not np.any(idx):
+            return
+        # Number of epicentres in each cell
+        counts = np.bincount(
+            xloc[idx] * (self.ny - 1) + yloc[idx],
+            minlength=(self.nx - 1) * (self.ny - 1)
+        ).reshape(self.nx - 1, self.ny - 1)
+        for prob, depth in hypocenter_distribution.data:
+            zloc = int((depth - self.zlim[0]) / self.zspc)
+            if (zloc < 0) or (zloc >= (self.nz - 1)):
+                continue
+            self.rates[:, :, zloc] += float(prob) * rate * counts
 
     def _get_fault_rates(self, source, mmin, mmax=np.inf):
         """
-        Adds the rates for a simple or complex fault source
+        Adds the rates for a simple, complex or characteristic fault source.
+        The rate of each rupture is shared evenly among the nodes of its
+        mesh; the rates of the nodes are computed directly from the MFD and
+        the fault mesh, without generating the ruptures
 
         :param source:
             Fault source as instance of :class:
             openquake.hazardlib.source.simple_fault.SimpleFaultSource or
-            openquake.hazardlib.source.complex_fault.ComplexFaultSource
+            openquake.hazardlib.source.complex_fault.ComplexFaultSource or
+            openquake.hazardlib.source.characteristic.
+            CharacteristicFaultSource
         """
-        for rupt in list(source.iter_ruptures()):
-            valid_rupt = (rupt.mag >= mmin) and (rupt.mag < mmax)
-            if not valid_rupt:
-                continue
-            grd = np.column_stack([rupt.surface.mesh.lons.flatten(),
-                                   rupt.surface.mesh.lats.flatten(),
-                                   rupt.surface.mesh.depths.flatten()])
-            npts = np.shape(grd)[0]
-            counter = np.histogramdd(grd,
-                                     bins=[self.xlim, self.ylim, self.zlim]
-                                     )[0]
-            point_rate = rupt.occurrence_rate / float(npts)
-            self.rates += (point_rate * counter)
+        if isinstance(source, CharacteristicFaultSource):
+            mesh, node_rates = _get_characteristic_fault_node_rates(
+                source, mmin, mmax)
+        elif isinstance(source, ComplexFaultSource):
+            mesh, node_rates = _get_complex_fault_node_rates(
+                source, mmin, mmax)
+        else:
+            mesh, node_rates = _get_simple_fault_node_rates(
+                source, mmin, mmax)
+        grd = np.column_stack([mesh.lons.flatten(),
+                               mesh.lats.flatten(),
+                               mesh.depths.flatten()])
+        self.rates += np.histogramdd(grd,
+                                     bins=[self.xlim, self.ylim, self.zlim],
+                                     weights=node_rates.flatten())[0]
 
 
 class RatePolygon(RateGrid):
@@ -330,6 +450,18 @@ class RatePolygon(RateGrid):
                         else:
                             self.rates += (prob * rate)
 
+    def _get_area_rates(self, source, mmin, mmax=np.inf):
+        """
+        Adds the rates from the area source by discretising the source
+        to a set of point sources
+
+        :param source:
+            Area source as instance of :class:
+            openquake.hazardlib.source.area.AreaSource
+        """
+        for point in area_to_point_sources(source):
+            self._get_point_rates(point, mmin, mmax)
+
     def _get_fault_rates(self, source, mmin, mmax=np.inf):
         """
         Adds the rates for a simple or complex fault source
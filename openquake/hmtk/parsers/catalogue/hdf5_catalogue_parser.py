@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+# vim: tabstop=4 shiftwidth=4 softtabstop=4
+
+#
+# LICENSE
+#
+# Copyright (c) 2010-2017, GEM Foundation, G. Weatherill, M. Pagani,
+# D. Monelli.
+#
+# The Hazard Modeller's Toolkit is free software: you can redistribute
+# it and/or modify it under the terms of the GNU Affero General Public
+# License as published by the Free Software Foundation, either version
+# 3 of the License, or (at your option) any later version.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with OpenQuake. If not, see <http://www.gnu.org/licenses/>
+#
+# DISCLAIMER
+#
+# The software Hazard Modeller's Toolkit (openquake.hmtk) provided herein
+# is released as a prototype implementation on behalf of
+# scientists and engineers working within the GEM Foundation (Global
+# Earthquake Model).
+#
+# It is distributed for the purpose of open collaboration and in the
+# hope that it will be useful to the scientific, engineering, disaster
+# risk and software design communities.
+#
+# The software is NOT distributed as part of GEM’s OpenQuake suite
+# (https://www.globalquakemodel.org/tools-products) and must be considered as a
+# separate entity. The software provided herein is designed and implemented
+# by scientific staff. It is not developed to the design standards, nor
+# subject to same level of critical review by professional software
+# developers, as GEM’s OpenQuake software suite.
+#
+# Feedback and contribution to the software is welcome, and can be
+# directed to the hazard scientific staff of the GEM Model Facility
+# (hazard@globalquakemodel.org).
+#
+# The Hazard Modeller's Toolkit (openquake.hmtk) is therefore distributed WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License
+# for more details.
+#
+# The GEM Foundation, and the authors of the software, assume no
+# liability for use of the software.
+
+"""
+Module :mod:`openquake.hmtk.parsers.catalogue.hdf5_catalogue_parser`
+implements :class:`Hdf5CatalogueParser` and :class:`Hdf5CatalogueWriter`,
+storing the catalogue in a columnar HDF5 file. The numeric columns are
+stored as contiguous datasets, so that they can be memory-mapped when the
+catalogue is read, and the string columns as fixed-width UTF-8 strings.
+"""
+import numpy as np
+from openquake.baselib import hdf5
+from openquake.baselib.python3compat import encode, decode
+from openquake.hmtk.seismicity.catalogue import Catalogue
+from openquake.hmtk.parsers.catalogue.base import (
+    BaseCatalogueParser, BaseCatalogueWriter)
+
+CATALOGUE = 'catalogue'  # name of the group of the columns
+
+
+class Hdf5CatalogueParser(BaseCatalogueParser):
+    """
+    HDF5 Catalogue Parser Class
+    """
+
+    def read_file(self, start_year=None, end_year=None, mmap=True):
+        """
+        Reads the catalogue. The numeric columns are memory-mapped in
+        copy-on-write mode, i.e. they are read from the disk only when
+        accessed and they can be modified without affecting the file.
+
+        :param bool mmap:
+            Memory-map the numeric columns (True) or read them in memory
+        """
+        catalogue = Catalogue()
+        with hdf5.File(self.input_file, 'r') as f:
+            for key, dset in f[CATALOGUE].items():
+                catalogue.data[key] = self._read_column(dset, mmap)
+        if start_year:
+            catalogue.start_year = start_year
+        else:
+            catalogue.update_start_year()
+
+        if end_year:
+            catalogue.end_year = end_year
+        else:
+            catalogue.update_end_year()
+        return catalogue
+
+    def _read_column(self, dset, mmap):
+        """
+        Returns the column as a list of strings or as a numpy array,
+        memory-mapped if possible
+        """
+        if dset.dtype.kind == 'S':
+            return [decode(val) for val in dset[()]]
+        # NB: empty and chunked datasets have no offset
+        offset = dset.id.get_offset()
+        if not mmap or offset is None or dset.chunks:
+            return dset[()]
+        return np.memmap(self.input_file, mode='c', dtype=dset.dtype,
+                         shape=dset.shape, offset=offset)
+
+
+class Hdf5CatalogueWriter(BaseCatalogueWriter):
+    '''
+    Writes catalogue to a columnar HDF5 file
+    '''
+
+    def write_file(self, catalogue, flag_vector=None, magnitude_table=None):
+        '''
+        Writes the catalogue to file, purging events if necessary. The
+        purging is applied to a view of the catalogue, so the data are
+        not copied.
+
+        :param catalogue:
+            Earthquake catalogue as instance of :class:
+            openquake.hmtk.seismicity.catalogue.Catalogue
+        :param numpy.array flag_vector:
+            Boolean vector specifying whether each event is valid (therefore
+            written) or otherwise
+        :param numpy.ndarray magnitude_table:
+            Magnitude-time table specifying the year and magnitudes of
+            completeness
+        '''
+        if magnitude_table is not None:
+            catalogue = catalogue.view()
+            catalogue.catalogue_mt_filter(magnitude_table, flag_vector)
+        elif flag_vector is not None:
+            catalogue = catalogue.view()
+            catalogue.purge_catalogue(flag_vector)
+        with hdf5.File(self.output_file, 'w') as f:
+            group = f.create_group(CATALOGUE)
+            for key in catalogue.data:
+                values = catalogue.data[key]
+                if len(values) == 0:
+                    continue
+                if isinstance(values, list):
+                    values = np.array(encode(values))
+                group.create_dataset(key, data=np.asarray(values))
@@ -51,9 +51,13 @@
 Prototype of a 'Catalogue' class
 """
 
+import collections
+from copy import copy, deepcopy
 import numpy as np
+from scipy.spatial import cKDTree
 from openquake.hazardlib.pmf import PMF
 from openquake.hazardlib.geo.mesh import Mesh
+from openquake.hazardlib.geo.geodetic import EARTH_RADIUS
 from openquake.hazardlib.geo.utils import spherical_to_cartesian
 from openquake.hmtk.seismicity.utils import (decimal_time, bootstrap_histogram_1D,
                                    bootstrap_histogram_2D)
@@ -79,6 +83,8 @@ class Catalogue(object):
             set(INT_ATTRIBUTE_LIST))).union(
                 set(STRING_ATTRIBUTE_LIST)))
 
+    _spatial_index = None  # set by get_spatial_index
+
     def __init__(self):
         """
         Initialise the catalogue dictionary
@@ -240,6 +246,28 @@ class Catalogue(object):
                                       self.data['latitude'],
                                       self.data['depth'])
 
+    def get_spatial_index(self):
+        """
+        Returns the spatial index of the epicentres of the catalogue. The
+        index is built at the first call and rebuilt only when the arrays
+        of longitudes and latitudes of the catalogue are replaced, as it
+        happens when events are purged or selected.
+
+        :returns:
+            Instance of :class:`CatalogueSpatialIndex`
+        """
+        key = self._get_spatial_index_key()
+        if self._spatial_index is None or any(
+                obj is not cached
+                for obj, cached in zip(key, self._spatial_index[0])):
+            self._spatial_index = key, CatalogueSpatialIndex(
+                self.data['longitude'], self.data['latitude'])
+        return self._spatial_index[1]
+
+    def _get_spatial_index_key(self):
+        # the objects which, if replaced, invalidate the spatial index
+        return self.data['longitude'], self.data['latitude']
+
     def sort_catalogue_chronologically(self):
         '''
         Sorts the catalogue into chronological order
@@ -418,6 +446,22 @@ class Catalogue(object):
             normalisation=normalisation,
             number_bootstraps=bootstrap)
 
+    def view(self, id0=None):
+        """
+        Returns a view on the events of the catalogue, backed by an array of
+        indices rather than by a copy of the data
+
+        :param np.ndarray id0:
+            Pointer array (or boolean vector) indicating the selected events.
+            If None all the events are selected
+        :returns:
+            Instance of :class:`CatalogueView`
+        """
+        if id0 is None:
+            # NB: the eventID can be missing, so all the columns are checked
+            id0 = np.arange(max(len(values) for values in self.data.values()))
+        return CatalogueView(self, id0)
+
     def concatenate(self, catalogue):
         """
         This method attaches one catalogue to the current one
@@ -443,6 +487,8 @@ class Catalogue(object):
                     pass
                 elif attrib is 'number_earthquakes':
                     setattr(self, attrib, atts+attn)
+                elif attrib == '_spatial_index':
+                    pass  # rebuilt from the merged data when needed
                 elif attrib is 'processes':
                     if atts != attn:
                         raise ValueError('The catalogues cannot be merged' +
@@ -453,6 +499,185 @@ class Catalogue(object):
         self.sort_catalogue_chronologically()
 
 
+class CatalogueSpatialIndex(object):
+    """
+    A k-d tree on the epicentres of a catalogue, used to find the events
+    close to a geometry before computing their exact distances from it.
+    The epicentres are converted to cartesian coordinates, so the index
+    works across the international date line and close to the poles.
+    Events with undefined longitude or latitude are not indexed.
+
+    :param np.ndarray longitudes:
+        Longitudes of the epicentres
+    :param np.ndarray latitudes:
+        Latitudes of the epicentres
+    """
+    def __init__(self, longitudes, latitudes):
+        longitudes = np.asarray(longitudes, dtype=float)
+        latitudes = np.asarray(latitudes, dtype=float)
+        self.ids = np.where(np.logical_and(np.isfinite(longitudes),
+                                           np.isfinite(latitudes)))[0]
+        self.tree = cKDTree(np.reshape(spherical_to_cartesian(
+            longitudes[self.ids], latitudes[self.ids], None), (-1, 3)))
+
+    def within_distance(self, longitude, latitude, distance):
+        """
+        Returns the events with the epicentre within a given distance
+        from a point on the Earth surface
+
+        :param float longitude:
+            Longitude of the point
+        :param float latitude:
+            Latitude of the point
+        :param float distance:
+            Great circle distance (km)
+        :returns:
+            Sorted array of the indices of the events
+        """
+        if distance < 0. or not len(self.ids):
+            return np.array([], dtype=int)
+        # length of the chord subtending the great circle arc, with a
+        # tolerance for the rounding errors: the events returned are
+        # candidates, to be tested exactly by the caller
+        chord = 2. * EARTH_RADIUS * np.sin(
+            min(distance / (2. * EARTH_RADIUS), np.pi / 2.))
+        found = self.tree.query_ball_point(
+            spherical_to_cartesian(longitude, latitude, None),
+            chord * (1. + 1E-9) + 1E-6)
+        return np.sort(self.ids[np.array(found, dtype=int)])
+
+
+def _take(values, idx):
+    # the values of a column of a catalogue at the given indices
+    if isinstance(values, np.ndarray) and len(values) > 0:
+        return values[idx]
+    elif isinstance(values, list) and len(values) > 0:
+        return [values[iloc] for iloc in idx]
+    return values
+
+
+class _IndexedData(collections.MutableMapping):
+    """
+    Mapping returning the columns of a catalogue data dictionary at the
+    given indices. The columns assigned are stored in the `overlay`
+    dictionary, which takes precedence over the original data and is
+    never written back into them.
+    """
+    def __init__(self, data, idx, overlay):
+        self.data = data
+        self.idx = idx
+        self.overlay = overlay
+
+    def __getitem__(self, key):
+        if key in self.overlay:
+            return self.overlay[key]
+        return _take(self.data[key], self.idx)
+
+    def __setitem__(self, key, values):
+        self.overlay[key] = values
+
+    def __delitem__(self, key):
+        del self.overlay[key]
+
+    def __iter__(self):
+        for key in self.data:
+            yield key
+        for key in self.overlay:
+            if key not in self.data:
+                yield key
+
+    def __len__(self):
+        return len(set(self.data) | set(self.overlay))
+
+
+class CatalogueView(Catalogue):
+    """
+    A selection of the events of a catalogue, backed by an array of indices.
+    The columns of the view are extracted from the original catalogue only
+    when accessed, and selecting events from a view only updates the
+    indices. The columns assigned to the `data` of the view (for instance
+    by the recurrence and depth analyses) are kept in the view and do not
+    modify the original catalogue; use :meth:`to_catalogue` to get a
+    modifiable copy.
+
+    :param catalogue:
+        The original catalogue as instance of :class:`Catalogue`
+    :param np.ndarray idx:
+        Indices of the selected events in the original catalogue
+    """
+    def __init__(self, catalogue, id0, overlay=None):
+        self.catalogue = catalogue
+        id0 = np.asarray(id0)
+        if id0.dtype == bool:
+            id0 = np.where(id0)[0]
+        self.idx = id0
+        self.overlay = {} if overlay is None else overlay
+        self.end_year = catalogue.end_year
+        self.start_year = catalogue.start_year
+        self.processes = deepcopy(catalogue.processes)
+        self.number_earthquakes = len(id0)
+
+    @property
+    def data(self):
+        """
+        The catalogue data restricted to the selected events
+        """
+        return _IndexedData(self.catalogue.data, self.idx, self.overlay)
+
+    def get_number_events(self):
+        return len(self.idx)
+
+    def _get_spatial_index_key(self):
+        return (self.catalogue.data['longitude'],
+                self.catalogue.data['latitude'], self.idx)
+
+    def _take_overlay(self, id0):
+        # the overlay restricted to the selected events of the view
+        id0 = np.asarray(id0)
+        if id0.dtype == bool:
+            id0 = np.where(id0)[0]
+        return {key: _take(values, id0)
+                for key, values in self.overlay.items()}
+
+    def view(self, id0=None):
+        """
+        Returns a view on the selected events of the current view, backed by
+        the original catalogue
+        """
+        if id0 is None:
+            return CatalogueView(self.catalogue, self.idx,
+                                 dict(self.overlay))
+        return CatalogueView(self.catalogue, self.idx[id0],
+                             self._take_overlay(id0))
+
+    def select_catalogue_events(self, id0):
+        '''
+        Orders the events in the view according to an indexing vector,
+        without copying the data
+
+        :param np.ndarray id0:
+            Pointer array indicating the locations of selected events
+        '''
+        self.overlay = self._take_overlay(id0)
+        self.idx = self.idx[id0]
+        self.number_earthquakes = len(self.idx)
+
+    def to_catalogue(self):
+        """
+        :returns:
+            An instance of the class of the original catalogue holding a copy
+            of the selected events, including the columns assigned to the
+            view
+        """
+        catalogue = copy(self.catalogue)
+        catalogue.data = dict(self.catalogue.data)
+        catalogue.processes = deepcopy(self.processes)
+        catalogue.select_catalogue_events(self.idx)
+        catalogue.data.update(deepcopy(self.overlay))
+        catalogue.number_earthquakes = self.number_earthquakes
+        return catalogue
+
+
 def _merge_data(dat1, dat2):
     """
     Merge two data dictionaries containing catalogue data
@@ -53,8 +53,7 @@ the completeness of an earthquake catalogue
 
 import numpy as np
 from scipy.optimize import fmin_l_bfgs_b
-from openquake.hmtk.seismicity.utils import (
-    decimal_time, piecewise_linear_scalar)
+from openquake.hmtk.seismicity.utils import decimal_time
 from openquake.hmtk.seismicity.completeness.base import (
     BaseCatalogueCompleteness, COMPLETENESS_METHODS)
 
@@ -79,21 +78,22 @@ def get_bilinear_residuals_stepp(input_params, xvals, yvals, slope1_fit):
     :returns:
         Residual sum-of-squares of fit
     '''
-    params = np.hstack([slope1_fit, input_params])
-    num_x = len(xvals)
-    y_model = np.zeros(num_x, dtype=float)
-    residuals = np.zeros(num_x, dtype=float)
-    for iloc in range(0, num_x):
-        y_model[iloc] = piecewise_linear_scalar(params, xvals[iloc])
-        residuals[iloc] = (yvals[iloc] - y_model[iloc]) ** 2.0
-    return np.sum(residuals)
+    slope1, slope2, crossover, intercept = np.hstack([slope1_fit,
+                                                      input_params])
+    intercept2 = (intercept + slope1 * crossover) - (slope2 * crossover)
+    y_model = np.where(xvals <= crossover,
+                       slope1 * xvals + intercept,
+                       slope2 * xvals + intercept2)
+    return np.sum((yvals - y_model) ** 2.0)
 
 
 @COMPLETENESS_METHODS.add(
     'completeness',
     magnitude_bin=np.float,
     time_bin=np.float,
-    increment_lock=bool)
+    increment_lock=bool,
+    number_bootstraps=1,
+    seed=None)
 class Stepp1971(BaseCatalogueCompleteness):
     '''
     Implements the completeness analysis methodology of Stepp (1972)
@@ -124,6 +124,10 @@ class Stepp1971(BaseCatalogueCompleteness):
 
     :attribute numpy.ndarray completeness_table:
         Resulting completeness table
+
+    :attribute numpy.ndarray completeness_samples:
+        Completeness years of each magnitude bin (columns) for the
+        original catalogue (first row) and for each bootstrap resample of it
     '''
 
     def __init__(self):
@@ -133,6 +137,7 @@ class Stepp1971(BaseCatalogueCompleteness):
         self.sigma = None
         self.model_line = None
         self.completeness_table = None
+        self.completeness_samples = None
         self.end_year = None
 
     def completeness(self, catalogue, config):
@@ -150,6 +155,12 @@ class Stepp1971(BaseCatalogueCompleteness):
                 (non-negative float)
                 'increment_lock' Boolean to indicate whether to ensure
                 completeness magnitudes always decrease with more recent bins
+                'number_bootstraps' Number of samples of the catalogue
+                (default 1, i.e. the catalogue itself); the additional
+                samples are obtained by resampling the events with
+                replacement and are stored in `completeness_samples`
+                'seed' Seed of the random number generator used for the
+                resampling (default None)
 
         :returns:
             2-column table indicating year of completeness and corresponding
@@ -175,29 +186,63 @@ class Stepp1971(BaseCatalogueCompleteness):
         _s_year, time_bin = self._get_time_limits_from_config(config, dyear)
 
         # Count magnitudes
+        window_counts = self._get_window_counts(mag, dyear, time_bin)
         self.sigma, _counter, n_mags, n_times, self.time_values = (
-            self._count_magnitudes(mag, dyear, time_bin))
+            self._count_magnitudes(mag, dyear, time_bin, window_counts))
 
         # Get completeness magnitudes
         comp_time, _gradient_2, self.model_line = (
             self.get_completeness_points(self.time_values, self.sigma, n_mags,
                                          n_times))
+        comp_times = [comp_time]
+
+        # Resample the catalogue: drawing the events with replacement is
+        # equivalent to drawing the counts of the magnitude-time cells from
+        # a multinomial distribution, so the resampled catalogues are never
+        # built
+        n_samples = config['number_bootstraps'] or 1
+        if n_samples > 1:
+            rng = np.random.RandomState(config['seed'])
+            n_events = window_counts.sum()
+            probs = window_counts.ravel() / float(n_events)
+            samples = rng.multinomial(n_events, probs, n_samples - 1)
+            for sample in samples.reshape((-1,) + window_counts.shape):
+                sample_sigma = self._get_sigma(
+                    self._get_cumulative_counts(sample, time_bin),
+                    self.time_values)
+                comp_times.append(self.get_completeness_points(
+                    self.time_values, sample_sigma, n_mags, n_times)[0])
 
         # If the increment lock is selected then ensure completeness time
         # does not decrease
         if config['increment_lock']:
-            for iloc in range(0, len(comp_time)):
-                cond = (
-                    (iloc > 0 and (comp_time[iloc] < comp_time[iloc - 1])) or
-                    np.isnan(comp_time[iloc]))
-                if cond:
-                    comp_time[iloc] = comp_time[iloc - 1]
+            for comp_time in comp_times:
+                self._lock_increments(comp_time)
 
+        self.completeness_samples = np.floor(self.end_year -
+                                             np.array(comp_times))
         self.completeness_table = np.column_stack([
-            np.floor(self.end_year - comp_time),
+            self.completeness_samples[0],
             self.magnitude_bin[:-1]])
         return self.completeness_table
 
+    @staticmethod
+    def _lock_increments(comp_time):
+        '''
+        Ensures in place that the completeness times do not decrease with
+        the magnitude, replacing the undetermined (nan) ones with the
+        completeness time of the previous magnitude bin
+
+        :param numpy.ndarray comp_time:
+            Completeness duration of each magnitude bin
+        '''
+        for iloc in range(0, len(comp_time)):
+            cond = (
+                (iloc > 0 and (comp_time[iloc] < comp_time[iloc - 1])) or
+                np.isnan(comp_time[iloc]))
+            if cond:
+                comp_time[iloc] = comp_time[iloc - 1]
+
     def simplify(self, deduplicate=True, mag_range=None, year_range=None):
         """
         Simplify a completeness table result. Intended to work with
@@ -299,7 +344,77 @@ class Stepp1971(BaseCatalogueCompleteness):
         mag_bins = mag_bins[is_mag]
         return mag_bins
 
-    def _count_magnitudes(self, mags, times, time_bin):
+    def _get_window_counts(self, mags, times, time_bin):
+        '''
+        Counts the number of events inside each magnitude bin and between
+        consecutive completeness years, i.e. a 2D histogram whose cumulative
+        sum along the time axis gives the number of events later than each
+        completeness year (see :meth:`_get_cumulative_counts`).
+
+        :param numpy.ndarray mags:
+            Magnitude of earthquakes
+
+        :param numpy.ndarray times:
+            Vector of decimal event times
+
+        :param numpy.ndarray time_bin:
+            Vector of bin edges of the time windows
+
+        :returns:
+            Number of earthquakes in each time-magnitude bin, as an array of
+            shape (number of time bins + 1, number of magnitude bins) with
+            the time bins sorted from recent to oldest; the last row contains
+            the events not later than the oldest time bin
+        '''
+        n_mags = len(self.magnitude_bin) - 1
+        n_times = len(time_bin)
+        # Magnitude bins as in numpy.histogram, closed on the right for the
+        # last bin
+        imag = np.searchsorted(self.magnitude_bin, mags, 'right') - 1
+        imag[mags == self.magnitude_bin[-1]] = n_mags - 1
+        # Index of the most recent time bin that each event is later than
+        itime = n_times - np.searchsorted(np.sort(time_bin), times, 'left')
+        itime[np.isnan(times)] = n_times
+        ok = (imag >= 0) & (imag < n_mags)
+        counts = np.bincount(itime[ok] * n_mags + imag[ok],
+                             minlength=(n_times + 1) * n_mags)
+        return counts.reshape(n_times + 1, n_mags)
+
+    def _get_cumulative_counts(self, window_counts, time_bin):
+        '''
+        Returns the number of events inside each magnitude bin and later
+        than each completeness year, in the order of the time bins
+
+        :param numpy.ndarray window_counts:
+            Output of :meth:`_get_window_counts`
+
+        :param numpy.ndarray time_bin:
+            Vector of bin edges of the time windows
+        '''
+        counter = np.zeros([len(time_bin), window_counts.shape[1]],
+                           dtype=window_counts.dtype)
+        counter[np.argsort(time_bin)[::-1]] = np.cumsum(window_counts,
+                                                        axis=0)[:-1]
+        return counter
+
+    def _get_sigma(self, counter, n_years):
+        '''
+        Returns the Poisson variance sigma_lambda = sqrt(n / nyears) /
+        sqrt(n_years) of each time-magnitude bin, zero for the empty bins
+
+        :param numpy.ndarray counter:
+            Number of earthquakes in each magnitude-time bin
+
+        :param numpy.ndarray n_years:
+            Effective duration of each time window
+        '''
+        nvals = counter.astype(float)
+        n_years = n_years[:, np.newaxis]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            sigma = np.sqrt((nvals / n_years)) / np.sqrt(n_years)
+        return np.where(counter > 0, sigma, 0.)
+
+    def _count_magnitudes(self, mags, times, time_bin, window_counts=None):
         '''
         For each completeness magnitude-year counts the number of events
         inside each magnitude bin.
@@ -313,6 +428,9 @@ class Stepp1971(BaseCatalogueCompleteness):
         :param numpy.ndarray time_bin:
             Vector of bin edges of the time windows
 
+        :param numpy.ndarray window_counts:
+            Output of :meth:`_get_window_counts`, if already computed
+
         :returns:
             * sigma - Poisson variance (numpy.ndarray)
             * counter - Number of earthquakes in each magnitude-time bin
@@ -320,23 +438,14 @@ class Stepp1971(BaseCatalogueCompleteness):
             * n_times - number of time bins (Integer)
             * n_years - effective duration of each time window (numpy.ndarray)
         '''
-        n_mags = len(self.magnitude_bin) - 1
-        n_times = len(time_bin)
-        counter = np.zeros([n_times, n_mags], dtype=int)
-        # Count all the magnitudes later than or equal to the reference time
-        for iloc in range(0, n_times):
-            id0 = times > time_bin[iloc]
-            counter[iloc, :] = np.histogram(mags[id0], self.magnitude_bin)[0]
-        # Get sigma_lambda  = sqrt(n / nyears) / sqrt(n_years)
-        sigma = np.zeros([n_times, n_mags], dtype=float)
+        if window_counts is None:
+            window_counts = self._get_window_counts(mags, times, time_bin)
+        n_times, n_mags = window_counts.shape
+        n_times -= 1
+        # Count all the magnitudes later than the reference time
+        counter = self._get_cumulative_counts(window_counts, time_bin)
         n_years = np.floor(np.max(times)) - time_bin
-        for iloc in range(0, n_mags):
-            id0 = counter[:, iloc] > 0
-            if any(id0):
-                nvals = counter[id0, iloc].astype(float)
-                sigma[id0, iloc] = np.sqrt((nvals / n_years[id0])) /\
-                    np.sqrt(n_years[id0])
-
+        sigma = self._get_sigma(counter, n_years)
         return sigma, counter, n_mags, n_times, n_years
 
     def get_completeness_points(self, n_years, sigma, n_mags, n_time):
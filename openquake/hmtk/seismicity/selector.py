@@ -60,7 +60,10 @@ from datetime import datetime
 from copy import deepcopy
 from openquake.hazardlib.geo.point import Point
 from openquake.hazardlib.geo.mesh import Mesh
-from openquake.hmtk.seismicity.catalogue import Catalogue
+from openquake.hazardlib.geo.geodetic import geodetic_distance
+from openquake.hazardlib.geo.utils import (spherical_to_cartesian,
+                                           cartesian_to_spherical)
+from openquake.hmtk.seismicity.catalogue import Catalogue, CatalogueView
 from openquake.hmtk.seismicity.utils import decimal_time
 
 
@@ -93,6 +96,26 @@ def _check_depth_limits(input_dict):
     return upper_depth, lower_depth
 
 
+def _get_bounding_circle(lons, lats):
+    '''
+    Returns the centre and the radius of a circle on the Earth surface
+    containing a set of points
+
+    :param lons:
+        Longitudes of the points
+    :param lats:
+        Latitudes of the points
+    :returns:
+        Longitude and latitude of the centre and radius (km)
+    '''
+    lons = np.asarray(lons, dtype=float).flatten()
+    lats = np.asarray(lats, dtype=float).flatten()
+    # the centre is the surface projection of the mean position vector
+    vectors = np.reshape(spherical_to_cartesian(lons, lats, None), (-1, 3))
+    clon, clat, _ = cartesian_to_spherical(vectors.mean(axis=0))
+    return clon, clat, np.max(geodetic_distance(clon, clat, lons, lats))
+
+
 def _get_decimal_from_datetime(time):
     '''
     As the decimal time function requires inputs in the form of numpy
@@ -120,6 +143,11 @@ class CatalogueSelector(object):
 
     :attr create_copy: Boolean to indicate whether to create copy of the
                        original catalogue before selecting {default = True}
+
+    If the catalogue is an instance of
+    openquake.hmtk.seismicity.catalogue.CatalogueView the selections are
+    views on the same original catalogue, i.e. only the indices of the
+    selected events are copied
     '''
 
     def __init__(self, master_catalogue, create_copy=True):
@@ -153,17 +181,26 @@ class CatalogueSelector(object):
 
         elif np.all(valid_id):
             if self.copycat:
-                output = deepcopy(self.catalogue)
+                output = self._copy_catalogue()
             else:
                 output = self.catalogue
         else:
             if self.copycat:
-                output = deepcopy(self.catalogue)
+                output = self._copy_catalogue()
             else:
                 output = self.catalogue
             output.purge_catalogue(valid_id)
         return output
 
+    def _copy_catalogue(self):
+        '''
+        Returns a copy of the catalogue; views are copied without copying
+        the data of the original catalogue
+        '''
+        if isinstance(self.catalogue, CatalogueView):
+            return self.catalogue.view()
+        return deepcopy(self.catalogue)
+
     def within_polygon(self, polygon, distance=None, **kwargs):
         '''
         Select earthquakes within polygon
@@ -178,27 +215,63 @@ class CatalogueSelector(object):
             Instance of :class:`openquake.hmtk.seismicity.catalogue.Catalogue`
             containing only selected events
         '''
+        upper_depth, lower_depth = _check_depth_limits(kwargs)
+        valid_depth = np.logical_and(
+            self.catalogue.data['depth'] >= upper_depth,
+            self.catalogue.data['depth'] < lower_depth)
+        return self.select_catalogue(
+            self._within_polygon(polygon, distance, valid_depth))
 
-        if distance:
-            # If a distance is specified then dilate the polyon by distance
-            zone_polygon = polygon.dilate(distance)
-        else:
-            zone_polygon = polygon
+    def within_polygons(self, polygons, distance=None, **kwargs):
+        '''
+        Select earthquakes within each polygon of a set, as done by
+        :meth:`within_polygon`. The depth selection and the spatial index
+        of the catalogue are computed once for all the polygons.
+
+        :param list polygons:
+            Polygons as instances of nhlib.geo.polygon.Polygon class
 
-        # Make valid all events inside depth range
+        :param float distance:
+            Buffer distance (km) (can take negative values)
+
+        :returns:
+            List of instances of
+            :class:`openquake.hmtk.seismicity.catalogue.Catalogue`, one for
+            each polygon, containing only the events selected by the polygon
+        '''
         upper_depth, lower_depth = _check_depth_limits(kwargs)
         valid_depth = np.logical_and(
             self.catalogue.data['depth'] >= upper_depth,
             self.catalogue.data['depth'] < lower_depth)
+        # all the polygons are tested before selecting, since the selection
+        # can purge the catalogue when create_copy is False
+        valid_ids = [self._within_polygon(polygon, distance, valid_depth)
+                     for polygon in polygons]
+        return [self.select_catalogue(valid_id) for valid_id in valid_ids]
 
-        # Events outside polygon returned to invalid assignment
-        catalogue_mesh = Mesh(self.catalogue.data['longitude'],
-                              self.catalogue.data['latitude'],
-                              self.catalogue.data['depth'])
-        valid_id = np.logical_and(valid_depth,
-                                  zone_polygon.intersects(catalogue_mesh))
+    def _within_polygon(self, polygon, distance, valid_depth):
+        '''
+        Returns a boolean vector indicating the events within the depth range
+        and the polygon, possibly dilated by distance. Only the events in the
+        circle bounding the polygon are tested against the polygon.
+        '''
+        if distance:
+            # If a distance is specified then dilate the polyon by distance
+            zone_polygon = polygon.dilate(distance)
+        else:
+            zone_polygon = polygon
 
-        return self.select_catalogue(valid_id)
+        # Make valid all events inside depth range and inside polygon
+        valid_id = np.zeros(len(valid_depth), dtype=bool)
+        idx = self.catalogue.get_spatial_index().within_distance(
+            *zone_polygon.get_bounding_circle())
+        idx = idx[valid_depth[idx]]
+        if len(idx):
+            catalogue_mesh = Mesh(self.catalogue.data['longitude'][idx],
+                                  self.catalogue.data['latitude'][idx],
+                                  self.catalogue.data['depth'][idx])
+            valid_id[idx] = zone_polygon.intersects(catalogue_mesh)
+        return valid_id
 
     def circular_distance_from_point(self, point, distance, **kwargs):
         '''
@@ -215,16 +288,20 @@ class CatalogueSelector(object):
             containing only selected events
         '''
 
+        # the hypocentral distance cannot be shorter than the epicentral one
+        idx = self.catalogue.get_spatial_index().within_distance(
+            point.longitude, point.latitude, distance)
+        lons = self.catalogue.data['longitude'][idx]
+        lats = self.catalogue.data['latitude'][idx]
         if kwargs['distance_type'] is 'epicentral':
-            locations = Mesh(
-                self.catalogue.data['longitude'],
-                self.catalogue.data['latitude'],
-                np.zeros(len(self.catalogue.data['longitude']), dtype=float))
+            locations = Mesh(lons, lats, np.zeros(len(idx), dtype=float))
             point = Point(point.longitude, point.latitude, 0.0)
         else:
-            locations = self.catalogue.hypocentres_as_mesh()
+            locations = Mesh(lons, lats, self.catalogue.data['depth'][idx])
 
-        is_close = point.closer_than(locations, distance)
+        is_close = np.zeros(len(self.catalogue.data['longitude']), dtype=bool)
+        if len(idx):
+            is_close[idx] = point.closer_than(locations, distance)
 
         return self.select_catalogue(is_close)
 
@@ -283,12 +360,16 @@ class CatalogueSelector(object):
 
         upper_depth, lower_depth = _check_depth_limits(kwargs)
 
-        rjb = surface.get_joyner_boore_distance(
-            self.catalogue.hypocentres_as_mesh())
-        is_valid = np.logical_and(
-            rjb <= distance,
-            np.logical_and(self.catalogue.data['depth'] >= upper_depth,
-                           self.catalogue.data['depth'] < lower_depth))
+        idx = self._get_surface_candidates(surface, distance)
+        is_valid = np.zeros(len(self.catalogue.data['longitude']), dtype=bool)
+        if len(idx):
+            rjb = surface.get_joyner_boore_distance(
+                self._hypocentres_as_mesh(idx))
+            is_valid[idx] = np.logical_and(
+                rjb <= distance,
+                np.logical_and(
+                    self.catalogue.data['depth'][idx] >= upper_depth,
+                    self.catalogue.data['depth'][idx] < lower_depth))
         return self.select_catalogue(is_valid)
 
     def within_rupture_distance(self, surface, distance,  **kwargs):
@@ -308,14 +389,40 @@ class CatalogueSelector(object):
         # Check for upper and lower depths
         upper_depth, lower_depth = _check_depth_limits(kwargs)
 
-        rrupt = surface.get_min_distance(self.catalogue.hypocentres_as_mesh())
-        is_valid = np.logical_and(
-            rrupt <= distance,
-            np.logical_and(self.catalogue.data['depth'] >= upper_depth,
-                           self.catalogue.data['depth'] < lower_depth))
+        idx = self._get_surface_candidates(surface, distance)
+        is_valid = np.zeros(len(self.catalogue.data['longitude']), dtype=bool)
+        if len(idx):
+            rrupt = surface.get_min_distance(self._hypocentres_as_mesh(idx))
+            is_valid[idx] = np.logical_and(
+                rrupt <= distance,
+                np.logical_and(
+                    self.catalogue.data['depth'][idx] >= upper_depth,
+                    self.catalogue.data['depth'][idx] < lower_depth))
 
         return self.select_catalogue(is_valid)
 
+    def _get_surface_candidates(self, surface, distance):
+        '''
+        Returns the indices of the events which can be within a Joyner-Boore
+        or rupture distance from a fault surface, i.e. the events within the
+        distance from the circle bounding the mesh of the surface. The
+        distance is increased up to 40 km, the threshold below which the
+        Joyner-Boore distance is computed on a projection of the surface.
+        '''
+        mesh = surface.get_mesh()
+        clon, clat, radius = _get_bounding_circle(mesh.lons, mesh.lats)
+        return self.catalogue.get_spatial_index().within_distance(
+            clon, clat, radius + max(distance, 40.))
+
+    def _hypocentres_as_mesh(self, idx):
+        '''
+        Returns the hypocentres of the events with the given indices as
+        instance of nhlib.geo.mesh.Mesh
+        '''
+        return Mesh(self.catalogue.data['longitude'][idx],
+                    self.catalogue.data['latitude'][idx],
+                    self.catalogue.data['depth'][idx])
+
     def within_time_period(self, start_time=None, end_time=None):
         '''
         Select earthquakes occurring within a given time period
@@ -426,7 +533,7 @@ class CatalogueSelector(object):
         cluster_set = []
         for clid in range(0, num_clust + 1):
             idx = np.where(vcl == clid)[0]
-            cluster_cat = deepcopy(self.catalogue)
+            cluster_cat = self._copy_catalogue()
             cluster_cat.select_catalogue_events(idx)
             cluster_set.append((clid, cluster_cat))
         return OrderedDict(cluster_set)
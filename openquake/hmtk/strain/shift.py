@@ -52,7 +52,6 @@ Bird et al. 2010) for calculating seismic moment rate from Geodetic Strain
 '''
 
 import numpy as np
-from math import fabs
 import yaml
 from openquake.hmtk.strain.strain_utils import (
     moment_function, calculate_taper_function)
@@ -265,15 +264,27 @@ class Shift(object):
         '''
         base_ipl_rate = base_params['CMT_EVENTS'] / (
             base_params['area'] * base_params['CMT_duration'])
-        base_rate = np.zeros(self.number_magnitudes, dtype=float)
+        return base_ipl_rate * self._get_taper_functions(
+            self.threshold_moment,
+            base_params['CMT_moment'],
+            moment_function(base_params['corner_mag']),
+            base_params['beta'])
+
+    @staticmethod
+    def _get_taper_functions(threshold_moment, cmt_moment, corner_moment,
+                             beta):
+        '''
+        Returns the tapering functions for each of the threshold moments
+
+        :param np.ndarray threshold_moment:
+            Moments of the target magnitudes
 
-        for iloc in range(0, self.number_magnitudes):
-            base_rate[iloc] = base_ipl_rate * calculate_taper_function(
-                base_params['CMT_moment'],
-                self.threshold_moment[iloc],
-                moment_function(base_params['corner_mag']),
-                base_params['beta'])
-        return base_rate
+        :returns:
+            np.ndarray of relative moment rates
+        '''
+        return np.array([calculate_taper_function(
+            cmt_moment, moment_thresh, corner_moment, beta)
+            for moment_thresh in threshold_moment], dtype=float)
 
     def calculate_activity_rate(self, strain_data, cumulative=False,
                                 in_seconds=False):
@@ -311,11 +322,11 @@ class Shift(object):
             self.base_rate,
             [self.strain.get_number_observations(), 1])
 
-        regionalisation_zones = (
-            np.unique(self.strain.data['region'])).tolist()
+        regionalisation_zones, region_idx = np.unique(
+            self.strain.data['region'], return_inverse=True)
 
-        for region in regionalisation_zones:
-            id0 = self.strain.data['region'] == region
+        for iregion, region in enumerate(regionalisation_zones.tolist()):
+            id0 = region_idx == iregion
             if b'IPL' in region:
                 # For intra-plate seismicity everything is refered to
                 # the background rate
@@ -340,23 +351,22 @@ class Shift(object):
                                               self.strain.data['err'][id0],
                                               self.regionalisation[region])
 
-            for jloc, iloc in enumerate(np.where(id0)[0]):
-                # Where the calculated rate exceeds the base rate then becomes
-                # calculated rate. In this version the magnitudes are treated
-                # independently (i.e. if Rate(M < 7) > Base Rate (M < 7) but
-                # Rate (M > 7) < Base Rate (M > 7) then returned Rate (M < 7)
-                # = Rate (M < 7) and returned Rate (M > 7) = Base Rate (M > 7)
-                id1 = calculated_rate[jloc] > self.base_rate
-                self.strain.seismicity_rate[iloc, id1] = calculated_rate[jloc,
-                                                                         id1]
+            # Where the calculated rate exceeds the base rate then becomes
+            # calculated rate. In this version the magnitudes are treated
+            # independently (i.e. if Rate(M < 7) > Base Rate (M < 7) but
+            # Rate (M > 7) < Base Rate (M > 7) then returned Rate (M < 7)
+            # = Rate (M < 7) and returned Rate (M > 7) = Base Rate (M > 7)
+            self.strain.seismicity_rate[id0] = np.where(
+                calculated_rate > self.base_rate,
+                calculated_rate,
+                self.strain.seismicity_rate[id0])
 
         if not cumulative and self.number_magnitudes > 1:
             # Seismicity rates are currently cumulative - need to turn them
             # into discrete
-            for iloc in range(0, self.number_magnitudes - 1):
-                self.strain.seismicity_rate[:, iloc] = \
-                    self.strain.seismicity_rate[:, iloc] -\
-                    self.strain.seismicity_rate[:, iloc + 1]
+            self.strain.seismicity_rate[:, :-1] = (
+                self.strain.seismicity_rate[:, :-1] -
+                self.strain.seismicity_rate[:, 1:])
 
         if not in_seconds:
             self.strain.seismicity_rate = self.strain.seismicity_rate * \
@@ -486,10 +496,6 @@ class Shift(object):
         e1_rate = np.amin(strain_values, axis=1)
         e3_rate = np.amax(strain_values, axis=1)
         e2_rate = 0. - e1_rate - e3_rate
-        # Pre-allocate seismicity rate with zeros
-        seismicity_rate = np.zeros(
-            [np.shape(strain_values)[0], len(threshold_moment)],
-            dtype=float)
         # Calculate moment rate per unit area
         temp_e_rate = 2.0 * (-e1_rate)
         id0 = np.where(e2_rate < 0.0)[0]
@@ -504,14 +510,12 @@ class Shift(object):
             (M_persec_per_m2 / region_params['tGR_moment_rate'])
         # Adjust forecast rate to desired rate using tapered G-R model
         # Taken from Eq 7 (Bird et al. 2010) and Eq 9 (Bird & Kagan, 2004)
-        for iloc, moment_thresh in enumerate(threshold_moment):
-            g_function = calculate_taper_function(
-                region_params['CMT_moment'],
-                moment_thresh,
-                region_params['corner_moment'],
-                region_params['beta'])
-            seismicity_rate[:, iloc] = g_function * seismicity_at_cmt_threshold
-        return seismicity_rate
+        g_function = self._get_taper_functions(
+            threshold_moment,
+            region_params['CMT_moment'],
+            region_params['corner_moment'],
+            region_params['beta'])
+        return np.outer(seismicity_at_cmt_threshold, g_function)
 
     def _reclassify_Bird_regions_with_data(self):
         '''
@@ -543,23 +547,13 @@ class Shift(object):
 
         # Ridge Types
         id0 = self.strain.data['region'] == b'R'
-        for iloc in np.where(id0)[0]:
-            cond = (self.strain.data['e1h'][iloc] > 0.0 and
-                    self.strain.data['e2h'][iloc] > 0.0)
-            if cond:
-                self.strain.data['region'][iloc] = 'OSRnor'
-            # Effective == 0.0
-            elif fabs(self.strain.data['e1h'][iloc]) < 1E-99:
-                self.strain.data['region'][iloc] = 'OSRnor'
-            elif ((self.strain.data['e1h'][iloc] *
-                   self.strain.data['e2h'][iloc]) < 0.0) and\
-                 ((self.strain.data['e1h'][iloc] +
-                   self.strain.data['e2h'][iloc]) >= 0.):
-                self.strain.data['region'][iloc] = 'OSR_special_1'
-            elif ((self.strain.data['e1h'][iloc] *
-                   self.strain.data['e2h'][iloc]) < 0.) and\
-                 ((self.strain.data['e1h'][iloc] +
-                   self.strain.data['e2h'][iloc]) < 0.):
-                self.strain.data['region'][iloc] = 'OSR_special_2'
-            else:
-                self.strain.data['region'][iloc] = 'OCB'
+        e1h = self.strain.data['e1h'][id0]
+        e2h = self.strain.data['e2h'][id0]
+        # The conditions are checked in order, the first satisfied one wins
+        self.strain.data['region'][id0] = np.select(
+            [np.logical_and(e1h > 0.0, e2h > 0.0),
+             np.fabs(e1h) < 1E-99,  # Effective == 0.0
+             np.logical_and(e1h * e2h < 0.0, e1h + e2h >= 0.),
+             np.logical_and(e1h * e2h < 0.0, e1h + e2h < 0.)],
+            ['OSRnor', 'OSRnor', 'OSR_special_1', 'OSR_special_2'],
+            'OCB')
@@ -57,6 +57,7 @@ from openquake.hazardlib.source.complex_fault import ComplexFaultSource
 from openquake.hazardlib.source.characteristic import CharacteristicFaultSource
 from openquake.hazardlib.source.simple_fault import SimpleFaultSource
 from openquake.hazardlib.source.area import AreaSource
+from openquake.hazardlib.source import area_to_point_sources
 from openquake.hazardlib.source.point import PointSource
 from openquake.hazardlib.mfd.evenly_discretized import EvenlyDiscretizedMFD
 from openquake.hazardlib.mfd.truncated_gr import TruncatedGRMFD
@@ -416,6 +417,91 @@ class RateGridFromFilesTestCase(unittest.TestCase):
         np.testing.assert_array_almost_equal(ratemodel1.rates,
                                              ratemodel2.rates)
 
+
+def _get_rupture_rates(limits, sources, mmin, mmax=np.inf):
+    """
+    Reference calculation of the rates, binning the mesh of each rupture
+    and the point sources of each area
+    """
+    rate_grid = RateGrid(limits, sources)
+    rates = np.zeros_like(rate_grid.rates)
+    for source in sources:
+        if isinstance(source, AreaSource):
+            grid = RateGrid(limits, list(area_to_point_sources(source)))
+            grid.get_rates(mmin, mmax)
+            rates += grid.rates
+            continue
+        for rupt in source.iter_ruptures():
+            if (rupt.mag < mmin) or (rupt.mag >= mmax):
+                continue
+            grd = np.column_stack([rupt.surface.mesh.lons.flatten(),
+                                   rupt.surface.mesh.lats.flatten(),
+                                   rupt.surface.mesh.depths.flatten()])
+            counter = np.histogramdd(
+                grd, bins=[rate_grid.xlim, rate_grid.ylim, rate_grid.zlim])[0]
+            rates += rupt.occurrence_rate / float(len(grd)) * counter
+    return rates
+
+
+class RateGridReferenceTestCase(unittest.TestCase):
+    """
+    Compares the rates computed from the MFDs and the source geometries
+    with the rates obtained by binning the individual ruptures
+    """
+    def setUp(self):
+        """
+        Set up a finer grid and sources with several magnitudes
+        """
+        self.limits = [14.9, 15.1, 0.01, 14.9, 15.1, 0.01, 0., 20., 2.]
+        self.mfd = TruncatedGRMFD(5.0, 7.0, 0.1, 3.0, 1.0)
+
+    def _check(self, source, mmin=5.0, mmax=np.inf):
+        rate_grid = RateGrid(self.limits, [source])
+        rate_grid.get_rates(mmin, mmax)
+        expected = _get_rupture_rates(self.limits, [source], mmin, mmax)
+        self.assertGreater(expected.sum(), 0.)
+        np.testing.assert_allclose(rate_grid.rates, expected, atol=1E-15)
+
+    def test_simple_fault(self):
+        source = SimpleFaultSource(
+            "SFLT001", "Simple Fault Source", "Active Shallow Crust",
+            self.mfd, 1.0, PeerMSR(), 1.5, PoissonTOM(1.0), 0.0, 20.0,
+            SIMPLE_TRACE, 60., 0.0)
+        self._check(source)
+        self._check(source, 5.5, 6.5)
+
+    def test_simple_fault_hypo_slip(self):
+        source = SimpleFaultSource(
+            "SFLT002", "Simple Fault Source", "Active Shallow Crust",
+            self.mfd, 1.0, PeerMSR(), 1.5, PoissonTOM(1.0), 0.0, 20.0,
+            SIMPLE_TRACE, 60., 0.0,
+            np.array([[0.25, 0.25, 0.4], [0.75, 0.75, 0.6]]),
+            np.array([[90., 0.3], [0., 0.7]]))
+        self._check(source)
+
+    def test_complex_fault(self):
+        source = ComplexFaultSource(
+            "CFLT001", "Complex Fault Source", "Active Shallow Crust",
+            self.mfd, 1.0, PeerMSR(), 1.5, PoissonTOM(1.0),
+            COMPLEX_EDGES, 0.0)
+        self._check(source)
+
+    def test_characteristic_fault(self):
+        source = CharacteristicFaultSource(
+            "CHRFLT001", "Characteristic 001", "Active Shallow Crust",
+            self.mfd, PoissonTOM(1.0), SIMPLE_FAULT_SURFACE, 0.0)
+        self._check(source, 6.0)
+
+    def test_area(self):
+        source = AreaSource(
+            "AREA001", "Area 001", "Active Shallow Crust", self.mfd, 1.0,
+            PointMSR(), 1.0, PoissonTOM(1.0), 0., 40.,
+            PMF([(1.0, NodalPlane(0.0, 90.0, 0.0))]),
+            PMF([(0.3, 5.0), (0.5, 11.0), (0.2, 25.0)]),
+            AREA_POLY, 1.0)
+        self._check(source)
+
+
 class RatePolygonTestCase(unittest.TestCase):
     """
     Tests of the Rate polygon tool
@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+# vim: tabstop=4 shiftwidth=4 softtabstop=4
+
+#
+# LICENSE
+#
+# Copyright (c) 2010-2017, GEM Foundation, G. Weatherill, M. Pagani,
+# D. Monelli.
+#
+# The Hazard Modeller's Toolkit is free software: you can redistribute
+# it and/or modify it under the terms of the GNU Affero General Public
+# License as published by the Free Software Foundation, either version
+# 3 of the License, or (at your option) any later version.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with OpenQuake. If not, see <http://www.gnu.org/licenses/>
+#
+# DISCLAIMER
+#
+# The software Hazard Modeller's Toolkit (openquake.hmtk) provided herein
+# is released as a prototype implementation on behalf of
+# scientists and engineers working within the GEM Foundation (Global
+# Earthquake Model).
+#
+# It is distributed for the purpose of open collaboration and in the
+# hope that it will be useful to the scientific, engineering, disaster
+# risk and software design communities.
+#
+# The software is NOT distributed as part of GEM’s OpenQuake suite
+# (https://www.globalquakemodel.org/tools-products) and must be considered as a
+# separate entity. The software provided herein is designed and implemented
+# by scientific staff. It is not developed to the design standards, nor
+# subject to same level of critical review by professional software
+# developers, as GEM’s OpenQuake software suite.
+#
+# Feedback and contribution to the software is welcome, and can be
+# directed to the hazard scientific staff of the GEM Model Facility
+# (hazard@globalquakemodel.org).
+#
+# The Hazard Modeller's Toolkit (openquake.hmtk) is therefore distributed WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License
+# for more details.
+#
+# The GEM Foundation, and the authors of the software, assume no
+# liability for use of the software.
+
+import os
+import shutil
+import tempfile
+import unittest
+import numpy as np
+from openquake.hmtk.parsers.catalogue.csv_catalogue_parser import (
+    CsvCatalogueParser)
+from openquake.hmtk.parsers.catalogue.hdf5_catalogue_parser import (
+    Hdf5CatalogueParser, Hdf5CatalogueWriter)
+
+BASE_DATA_PATH = os.path.join(os.path.dirname(__file__), 'data')
+
+
+class Hdf5CatalogueTestCase(unittest.TestCase):
+    """
+    Tests the round trip of a catalogue through the HDF5 writer and parser
+    """
+    def setUp(self):
+        self.catalogue = CsvCatalogueParser(os.path.join(
+            BASE_DATA_PATH, 'test_catalogue.csv')).read_file()
+        self.tmpdir = tempfile.mkdtemp()
+        self.output_filename = os.path.join(self.tmpdir, 'catalogue.hdf5')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def check_catalogues_are_equal(self, cat1, cat2):
+        self.assertEqual(sorted(cat1.data), sorted(cat2.data))
+        for key in cat1.data:
+            if isinstance(cat1.data[key], list):
+                self.assertEqual(cat1.data[key], cat2.data[key])
+            else:
+                np.testing.assert_array_equal(cat1.data[key], cat2.data[key])
+        self.assertEqual(cat1.start_year, cat2.start_year)
+        self.assertEqual(cat1.end_year, cat2.end_year)
+
+    def test_round_trip(self):
+        Hdf5CatalogueWriter(self.output_filename).write_file(self.catalogue)
+        cat = Hdf5CatalogueParser(self.output_filename).read_file()
+        self.check_catalogues_are_equal(self.catalogue, cat)
+        self.assertIsInstance(cat.data['magnitude'], np.memmap)
+        self.assertEqual(cat.data['eventID'][0], '54')
+        # without memory mapping
+        cat = Hdf5CatalogueParser(self.output_filename).read_file(mmap=False)
+        self.check_catalogues_are_equal(self.catalogue, cat)
+        self.assertNotIsInstance(cat.data['magnitude'], np.memmap)
+
+    def test_copy_on_write(self):
+        # the memory-mapped columns can be modified without changing the file
+        Hdf5CatalogueWriter(self.output_filename).write_file(self.catalogue)
+        cat = Hdf5CatalogueParser(self.output_filename).read_file()
+        cat.data['magnitude'][:] = 0.
+        cat = Hdf5CatalogueParser(self.output_filename).read_file()
+        np.testing.assert_array_equal(cat.data['magnitude'],
+                                      self.catalogue.data['magnitude'])
+
+    def test_flag_purging(self):
+        flag = np.zeros(8, dtype=bool)
+        flag[[1, 4, 5]] = True
+        Hdf5CatalogueWriter(self.output_filename).write_file(
+            self.catalogue, flag_vector=flag)
+        cat = Hdf5CatalogueParser(self.output_filename).read_file(
+            start_year=self.catalogue.start_year,
+            end_year=self.catalogue.end_year)
+        self.check_catalogues_are_equal(
+            self.catalogue.view(flag).to_catalogue(), cat)
+        # the original catalogue is not purged
+        self.assertEqual(self.catalogue.get_number_events(), 8)
+
+    def test_existing_file(self):
+        Hdf5CatalogueWriter(self.output_filename).write_file(self.catalogue)
+        with self.assertRaises(IOError):
+            Hdf5CatalogueWriter(self.output_filename)
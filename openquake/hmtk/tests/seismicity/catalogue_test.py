@@ -57,6 +57,7 @@ from openquake.hazardlib.pmf import PMF
 from openquake.hazardlib.geo.mesh import Mesh
 from openquake.hazardlib.geo.utils import spherical_to_cartesian
 from openquake.hmtk.seismicity.catalogue import Catalogue
+from openquake.hmtk.seismicity.selector import CatalogueSelector
 from openquake.hmtk.seismicity.utils import decimal_time
 
 
@@ -404,3 +405,109 @@ class TestCatalogueConcatenate(unittest.TestCase):
         with self.assertRaises(Warning):
             self.cat1.concatenate(self.cat2)
 
+
+class TestCatalogueView(unittest.TestCase):
+    """
+    Tests the views on the catalogue
+    """
+    def setUp(self):
+        self.cat = Catalogue()
+        self.cat.load_from_array(['year', 'magnitude'], np.array([
+            [1900, 5.0], [1910, 6.0], [1920, 7.0], [1930, 5.0], [1970, 5.5]]))
+        self.cat.data['eventID'] = ['a', 'b', 'c', 'd', 'e']
+
+    def test_view(self):
+        view = self.cat.view(np.array([False, True, True, False, True]))
+        self.assertEqual(view.get_number_events(), 3)
+        np.testing.assert_array_equal(view.data['year'], [1910, 1920, 1970])
+        self.assertEqual(view.data['eventID'], ['b', 'c', 'e'])
+        self.assertEqual(len(view.data['depth']), 0)
+        self.assertEqual(sorted(view.data), sorted(self.cat.data))
+
+    def test_assign_view(self):
+        # the columns assigned to a view are kept in the view, also when
+        # selecting events, and do not change the original catalogue
+        view = self.cat.view([1, 2, 4])
+        view.data['year'] = np.array([1911, 1921, 1971])
+        view.data['dtime'] = np.array([1911.5, 1921.5, 1971.5])
+        self.assertIn('dtime', list(view.data))
+        self.assertNotIn('dtime', self.cat.data)
+        np.testing.assert_array_equal(self.cat.data['year'],
+                                      [1900, 1910, 1920, 1930, 1970])
+        view.purge_catalogue(np.array([True, False, True]))
+        np.testing.assert_array_equal(view.data['year'], [1911, 1971])
+        subview = view.view([1])
+        np.testing.assert_array_equal(subview.data['dtime'], [1971.5])
+        self.assertEqual(subview.data['eventID'], ['e'])
+        cat = view.to_catalogue()
+        np.testing.assert_array_equal(cat.data['dtime'], [1911.5, 1971.5])
+        np.testing.assert_array_equal(cat.data['magnitude'], [6.0, 5.5])
+
+    def test_depth_distribution_view(self):
+        # the missing depth errors are set on the view
+        self.cat.data['depth'] = np.array([5., 15., 25., 12., 8.])
+        view = CatalogueSelector(self.cat.view()).within_magnitude_range(
+            5.5, 7.5)
+        hist = view.get_depth_distribution(np.array([0., 10., 20., 30.]))
+        np.testing.assert_array_equal(hist, [1., 1., 1.])
+        self.assertEqual(len(self.cat.data['depthError']), 0)
+        pmf = view.get_depth_pmf(np.array([0., 10., 20., 30.]))
+        self.assertEqual(len(pmf.data), 3)
+
+    def test_purge_view(self):
+        view = self.cat.view()
+        view.purge_catalogue(view.data['magnitude'] >= 5.5)
+        np.testing.assert_array_equal(view.idx, [1, 2, 4])
+        subview = view.view([0, 2])
+        np.testing.assert_array_equal(subview.idx, [1, 4])
+        self.assertEqual(subview.data['eventID'], ['b', 'e'])
+        # the original catalogue is unchanged
+        self.assertEqual(self.cat.get_number_events(), 5)
+
+    def test_to_catalogue(self):
+        cat = self.cat.view([4, 0]).to_catalogue()
+        self.assertIsInstance(cat.data, dict)
+        np.testing.assert_array_equal(cat.data['magnitude'], [5.5, 5.0])
+        self.assertEqual(cat.data['eventID'], ['e', 'a'])
+        self.assertEqual(cat.end_year, 1970)
+        cat.data['magnitude'][0] = 8.0
+        self.assertEqual(self.cat.data['magnitude'][4], 5.5)
+
+
+class TestCatalogueSpatialIndex(unittest.TestCase):
+    """
+    Tests the spatial index of the epicentres of the catalogue
+    """
+    def setUp(self):
+        self.cat = Catalogue()
+        self.cat.data['longitude'] = np.array([179.9, -179.9, 0.0, 10.0,
+                                               np.nan])
+        self.cat.data['latitude'] = np.array([0.0, 0.0, 0.0, 89.9, 0.0])
+        self.cat.data['eventID'] = ['a', 'b', 'c', 'd', 'e']
+
+    def test_within_distance(self):
+        index = self.cat.get_spatial_index()
+        # across the international date line
+        np.testing.assert_array_equal(index.within_distance(180., 0., 12.),
+                                      [0, 1])
+        np.testing.assert_array_equal(index.within_distance(180., 0., 11.),
+                                      [])
+        # close to the pole
+        np.testing.assert_array_equal(index.within_distance(-170., 89.9, 25.),
+                                      [3])
+        # the events without epicentre are not indexed
+        np.testing.assert_array_equal(index.within_distance(0., 0., 1E5),
+                                      [0, 1, 2, 3])
+        self.assertEqual(len(index.within_distance(0., 0., -1.)), 0)
+
+    def test_index_is_rebuilt(self):
+        index = self.cat.get_spatial_index()
+        self.assertIs(self.cat.get_spatial_index(), index)
+        self.cat.purge_catalogue(np.array([False, True, True, True, True]))
+        index = self.cat.get_spatial_index()
+        np.testing.assert_array_equal(index.within_distance(180., 0., 12.),
+                                      [0])
+        # the view has its own index, on the selected events
+        view = self.cat.view([2, 1])
+        np.testing.assert_array_equal(
+            view.get_spatial_index().within_distance(0., 0., 1.), [1])
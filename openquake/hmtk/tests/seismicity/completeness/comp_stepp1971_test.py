@@ -283,3 +283,49 @@ class TestSteppCompleteness(unittest.TestCase):
         np.testing.assert_array_almost_equal(
             expected_completeness_table,
             self.process.completeness(self.catalogue, self.config))
+
+    def test_stepp_count_magnitudes_reference(self):
+        # Compares the counts against a histogram for each time window,
+        # including events on the bin edges and outside the bins
+        rng = np.random.RandomState(42)
+        mags = np.round(rng.uniform(4.5, 7.5, 500), 1)
+        times = np.round(rng.uniform(1900., 2000., 500))
+        self.process.magnitude_bin = np.arange(5.0, 7.5, 0.5)
+        time_bin = np.arange(1990., 1890., -10.)
+        _, counter, n_mags, n_times, _ = self.process._count_magnitudes(
+            mags, times, time_bin)
+        self.assertEqual((n_times, n_mags), (10, 4))
+        for iloc in range(0, n_times):
+            np.testing.assert_array_equal(
+                counter[iloc],
+                np.histogram(mags[times > time_bin[iloc]],
+                             self.process.magnitude_bin)[0])
+
+    def test_complete_stepp_analysis_bootstrap(self):
+        # The first sample is the catalogue itself, the others are
+        # reproducible resamples of it
+        parser0 = CsvCatalogueParser(INPUT_FILE_1)
+        self.catalogue = parser0.read_file()
+        self.config = {'magnitude_bin': 0.5,
+                       'time_bin': 5.0,
+                       'increment_lock': True}
+        expected_table = self.process.completeness(self.catalogue,
+                                                   self.config)
+        self.assertEqual(self.process.completeness_samples.shape, (1, 7))
+
+        self.config.update(number_bootstraps=20, seed=42)
+        table = self.process.completeness(self.catalogue, self.config)
+        np.testing.assert_array_equal(expected_table, table)
+        samples = self.process.completeness_samples
+        self.assertEqual(samples.shape, (20, 7))
+        np.testing.assert_array_equal(samples[0], table[:, 0])
+        self.assertTrue(np.all(np.diff(samples, axis=1) <= 0.))
+        # The completeness years of the samples are scattered around the
+        # ones of the catalogue
+        self.assertTrue(np.all(np.std(samples, axis=0) > 0.))
+        self.assertTrue(np.all(
+            np.fabs(np.median(samples, axis=0) - table[:, 0]) < 10.))
+
+        process = Stepp1971()
+        process.completeness(self.catalogue, self.config)
+        np.testing.assert_array_equal(samples, process.completeness_samples)
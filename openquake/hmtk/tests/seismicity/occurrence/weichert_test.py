@@ -54,6 +54,7 @@ import unittest
 import numpy as np
 
 from openquake.hmtk.seismicity.catalogue import Catalogue
+from openquake.hmtk.seismicity.selector import CatalogueSelector
 from openquake.hmtk.seismicity.occurrence.weichert import Weichert
 
 
@@ -160,3 +161,23 @@ class WeichertTestCase(unittest.TestCase):
         self.assertAlmostEqual(sigmab, 0.015, 3)
         self.assertAlmostEqual(rate, 100.1078, 4)
         self.assertAlmostEqual(sigma_rate, 2.1218, 4) 
+
+    def test_weichert_view(self):
+        """
+        Tests the Weichert function on a view selected from the synthetic
+        catalogue, computing the decimal time of the view
+        """
+        neq = self.catalogue.get_number_events()
+        self.catalogue.data["dtime"] = np.array([])
+        for key in ("month", "day"):
+            self.catalogue.data[key] = np.ones(neq, int)
+        for key in ("hour", "minute", "second"):
+            self.catalogue.data[key] = np.zeros(neq)
+        view = CatalogueSelector(self.catalogue.view()).within_magnitude_range(
+            4.0, 9.0)
+        expected = Weichert().calculate(view.to_catalogue(), self.config,
+                                        self.completeness)
+        results = Weichert().calculate(view, self.config, self.completeness)
+        np.testing.assert_allclose(results, expected)
+        self.assertEqual(len(view.data["dtime"]), view.get_number_events())
+        self.assertEqual(len(self.catalogue.data["dtime"]), 0)
@@ -12,11 +12,12 @@ geographical selection of seismicity with respect to various source geometries
 import unittest
 import numpy as np
 import datetime
-from openquake.hmtk.seismicity.catalogue import Catalogue
+from openquake.hmtk.seismicity.catalogue import Catalogue, CatalogueView
 from openquake.hmtk.seismicity.selector import (_check_depth_limits,
                                       _get_decimal_from_datetime,
                                       CatalogueSelector)
 from openquake.hazardlib.geo.point import Point
+from openquake.hazardlib.geo.mesh import Mesh
 from openquake.hazardlib.geo.polygon import Polygon
 from openquake.hazardlib.geo.line import Line
 from openquake.hazardlib.geo.surface.simple_fault import SimpleFaultSurface
@@ -89,6 +90,22 @@ class TestSelector(unittest.TestCase):
         self.assertTrue(np.allclose(test_cat1.data['depth'],
                                     np.array([1., 1., 1.])))
 
+    def test_catalogue_view_selection(self):
+        # Tests the selection on a view of the catalogue, sharing the data
+        # of the original catalogue
+        self.catalogue.data['magnitude'] = np.arange(4., 6.5, 0.5)
+        self.catalogue.data['depth'] = np.arange(5., 30., 5.)
+        selector0 = CatalogueSelector(self.catalogue.view())
+        test_cat1 = selector0.within_magnitude_range(4.5, 6.0)
+        self.assertIsInstance(test_cat1, CatalogueView)
+        self.assertIs(test_cat1.catalogue, self.catalogue)
+        np.testing.assert_array_equal(test_cat1.idx, [1, 2, 3])
+        test_cat2 = CatalogueSelector(test_cat1).within_depth_range(20., 10.)
+        np.testing.assert_array_equal(test_cat2.idx, [1, 2])
+        np.testing.assert_array_equal(test_cat2.data['magnitude'], [4.5, 5.])
+        # the first selection is not modified
+        np.testing.assert_array_equal(test_cat1.idx, [1, 2, 3])
+
     def test_select_within_polygon(self):
         # Tests the selection of points within polygon
 
@@ -427,3 +444,73 @@ class TestSelector(unittest.TestCase):
                                       np.array([5, 6]))
         np.testing.assert_array_almost_equal(cluster_set[2].data["magnitude"],
                                              np.array([4.0, 4.0])) 
+
+
+class TestSelectorSpatialIndex(unittest.TestCase):
+    '''
+    Tests that the selections prefiltered with the spatial index of the
+    catalogue are the same as testing all the events
+    '''
+    def setUp(self):
+        rng = np.random.RandomState(42)
+        self.catalogue = Catalogue()
+        self.catalogue.data['eventID'] = np.arange(2000)
+        self.catalogue.data['longitude'] = rng.uniform(-5., 5., 2000)
+        self.catalogue.data['latitude'] = rng.uniform(-5., 5., 2000)
+        self.catalogue.data['depth'] = rng.uniform(0., 50., 2000)
+        self.mesh = self.catalogue.hypocentres_as_mesh()
+        self.polygons = [
+            Polygon([Point(-2., -2.), Point(-2., 1.), Point(1., -1.)]),
+            Polygon([Point(0., 0.), Point(0., 4.), Point(3., 4.),
+                     Point(3., 0.)])]
+
+    def test_within_polygons(self):
+        selector0 = CatalogueSelector(self.catalogue)
+        for distance in [None, 20.]:
+            test_cats = selector0.within_polygons(
+                self.polygons, distance, upper_depth=5., lower_depth=30.)
+            self.assertEqual(len(test_cats), 2)
+            for polygon, test_cat in zip(self.polygons, test_cats):
+                zone = polygon.dilate(distance) if distance else polygon
+                expected = np.logical_and(
+                    zone.intersects(self.mesh),
+                    np.logical_and(self.mesh.depths >= 5.,
+                                   self.mesh.depths < 30.))
+                self.assertTrue(expected.any())
+                np.testing.assert_array_equal(
+                    test_cat.data['eventID'],
+                    self.catalogue.data['eventID'][expected])
+                np.testing.assert_array_equal(
+                    selector0.within_polygon(
+                        polygon, distance, upper_depth=5.,
+                        lower_depth=30.).data['eventID'],
+                    test_cat.data['eventID'])
+
+    def test_within_distances_of_fault(self):
+        selector0 = CatalogueSelector(self.catalogue)
+        fault0 = SimpleFaultSurface.from_fault_data(
+            Line([Point(0., 0.), Point(1., 1.)]), 0., 20., 30., 2.)
+        rjb = fault0.get_joyner_boore_distance(self.mesh)
+        rrup = fault0.get_min_distance(self.mesh)
+        for distance in [0., 10., 60., 150.]:
+            np.testing.assert_array_equal(
+                selector0.within_joyner_boore_distance(
+                    fault0, distance).data['eventID'],
+                self.catalogue.data['eventID'][rjb <= distance])
+            np.testing.assert_array_equal(
+                selector0.within_rupture_distance(
+                    fault0, distance).data['eventID'],
+                self.catalogue.data['eventID'][rrup <= distance])
+
+    def test_circular_distance_from_point(self):
+        selector0 = CatalogueSelector(self.catalogue)
+        point = Point(1., 1., 10.)
+        epicentres = Mesh(self.mesh.lons, self.mesh.lats, None)
+        for distance_type, expected in [
+                ('epicentral', Point(1., 1.).closer_than(epicentres, 80.)),
+                ('hypocentral', point.closer_than(self.mesh, 80.))]:
+            test_cat = selector0.circular_distance_from_point(
+                point, 80., distance_type=distance_type)
+            np.testing.assert_array_equal(
+                test_cat.data['eventID'],
+                self.catalogue.data['eventID'][expected])
@@ -51,7 +51,8 @@ import numpy as np
 from openquake.hmtk.parsers.strain.strain_csv_parser import ReadStrainCsv
 from openquake.hmtk.strain.strain_utils import moment_function
 from openquake.hmtk.strain.geodetic_strain import GeodeticStrain
-from openquake.hmtk.strain.shift import Shift, BIRD_GLOBAL_PARAMETERS
+from openquake.hmtk.strain.shift import (
+    Shift, BIRD_GLOBAL_PARAMETERS, SECS_PER_YEAR)
 
 BASE_DATA_PATH = os.path.join(os.path.dirname(__file__), 'strain_data')
 STRAIN_FILE = os.path.join(BASE_DATA_PATH, 'simple_strain_values.csv')
@@ -182,3 +183,23 @@ class TestShift(unittest.TestCase):
         np.testing.assert_array_almost_equal(
             np.log10(expected_rate),
             np.log10(self.model.strain.seismicity_rate))
+
+    def test_calculate_activity_rate_incremental(self):
+        # Tests that the incremental rates are the differences of the
+        # cumulative rates and that the cumulative rates are never below
+        # the base rates
+        mags = [5.0, 5.5, 6.0, 7.0]
+        cumulative = Shift(mags)
+        cumulative.calculate_activity_rate(
+            ReadStrainCsv(STRAIN_FILE).read_data(), cumulative=True)
+        incremental = Shift(mags)
+        incremental.calculate_activity_rate(
+            ReadStrainCsv(STRAIN_FILE).read_data())
+        cum_rate = cumulative.strain.seismicity_rate
+        inc_rate = incremental.strain.seismicity_rate
+        self.assertEqual(cum_rate.shape, (23, 4))
+        np.testing.assert_allclose(inc_rate[:, :-1],
+                                   cum_rate[:, :-1] - cum_rate[:, 1:])
+        np.testing.assert_allclose(inc_rate[:, -1], cum_rate[:, -1])
+        self.assertTrue(np.all(
+            cum_rate >= cumulative.base_rate * SECS_PER_YEAR * (1 - 1E-12)))
@@ -36,6 +36,7 @@ from openquake.risklib import utils
 from openquake.baselib.python3compat import with_metaclass
 
 F32 = numpy.float32
+F64 = numpy.float64
 U32 = numpy.uint32
 
 
@@ -1036,6 +1037,43 @@ def conditional_loss_ratio(loss_ratios, poes, probability):
         return (y2 - y1) / (x2 - x1) * (probability - x1) + y1
 
 
+def conditional_loss_ratios(loss_curves, poes, probability):
+    """
+    Vectorized version of :func:`conditional_loss_ratio`, working on many
+    curves with the same PoEs at once.
+
+    :param loss_curves: an array of shape (..., P)
+    :param poes: an array of P non-increasing probabilities of exceedance
+    :param float probability: the probability used to interpolate the curves
+    :returns: an array of shape loss_curves.shape[:-1]
+    """
+    P = len(poes)
+    shp = loss_curves.shape[:-1]
+    if probability > poes[0]:  # max poes
+        return numpy.zeros(shp)
+    elif probability < poes[-1]:  # min PoE
+        return loss_curves[..., -1]
+    if probability in poes:
+        # same semantics of the builtin max, also in presence of NaNs
+        idxs = [i for i in range(P) if probability == poes[i]]
+        res = loss_curves[..., idxs[0]]
+        for i in idxs[1:]:
+            res = numpy.where(loss_curves[..., i] > res,
+                              loss_curves[..., i], res)
+        return res
+    interval_index = bisect.bisect_right(poes[::-1], probability)
+    if interval_index == len(poes):  # poes are all nan
+        return numpy.ones(shp) * numpy.nan
+    i2 = P - interval_index
+    i1 = i2 - 1
+    x1, x2 = poes[i1], poes[i2]
+    y1, y2 = loss_curves[..., i1], loss_curves[..., i2]
+    # the differences are computed with the precision of the curves,
+    # as in the scalar version
+    return ((y2 - y1).astype(F64) / (x2 - x1) * (probability - x1) +
+            y1.astype(F64))
+
+
 #
 # Insured Losses
 #
@@ -1176,6 +1214,20 @@ def average_loss(losses_poes):
     return numpy.dot(-pairwise_diff(losses), pairwise_mean(poes))
 
 
+def average_losses(losses, poes):
+    """
+    Vectorized version of :func:`average_loss`, computing the average
+    losses of several loss curves at once.
+
+    :param losses: an array of shape (..., C)
+    :param poes: an array of shape (..., C)
+    :returns: an array with the shape of `losses` without the last axis
+    """
+    diffs = losses[..., :-1] - losses[..., 1:]
+    means = (poes[..., :-1] + poes[..., 1:]) / 2.
+    return (-diffs * means).sum(axis=-1)
+
+
 def normalize_curves_eb(curves):
     """
     A more sophisticated version of normalize_curves, used in the event
@@ -1301,6 +1353,72 @@ def losses_by_period(losses, return_periods, num_events, eff_time):
     return curve
 
 
+def losses_by_period_batch(losses, idxs, num, return_periods, num_events,
+                           eff_time, block_size=2 ** 20):
+    """
+    Vectorized version of :func:`losses_by_period`, working on many groups
+    of losses (typically assets) with the same number of events at once.
+    Since the interpolation points depend only on the number of events,
+    the losses of each group are sorted in a row of a 2D array and only the
+    two losses surrounding each return period are extracted from it.
+
+    :param losses: array of G simulated losses
+    :param idxs: array of G non-decreasing group indices in 0 .. num - 1
+    :param num: the number of groups
+    :param return_periods: return periods of interest
+    :param num_events: the number of events (must be more than the losses
+                       in each group)
+    :param eff_time: investigation_time * ses_per_logic_tree_path
+    :param block_size: maximum size of the 2D arrays of sorted losses
+    :returns: an array of shape (num, P), possibly with NaNs
+    """
+    counts = numpy.bincount(idxs, minlength=num)
+    M = counts.max() if len(counts) else 0  # max number of losses per group
+    if num_events < M:
+        raise ValueError(
+            'There are not enough events to compute the loss curves: %d'
+            % num_events)
+    starts = numpy.cumsum(counts) - counts
+
+    # reproduce numpy.interp(x, xp, fp) where fp are the losses of a group,
+    # sorted and with num_events - counts zeros in front
+    periods = eff_time / numpy.arange(num_events, 0., -1)
+    xp = numpy.log(periods)
+    rperiods = numpy.array([rp if periods[0] <= rp <= periods[-1]
+                            else numpy.nan for rp in return_periods])
+    x = numpy.log(rperiods)
+    ok = ~numpy.isnan(x)
+    j = numpy.zeros(len(x), int)
+    j[ok] = numpy.searchsorted(xp, x[ok], 'right') - 1
+    last = j == num_events - 1
+    j1 = numpy.where(last, j, j + 1)
+    # the k-th loss of a group is in the column k - (num_events - M) of
+    # the sorted rows, which are padded with -inf on the left
+    cols0, cols1 = j - (num_events - M), j1 - (num_events - M)
+
+    curves = numpy.zeros((num, len(x)))
+    step = max(block_size // max(M, 1), 1)
+    for g0 in range(0, num, step):
+        g1 = min(g0 + step, num)
+        s0, s1 = starts[g0], starts[g1 - 1] + counts[g1 - 1]
+        cnt = counts[g0:g1]
+        rows = numpy.repeat(numpy.arange(g1 - g0), cnt)
+        cols = numpy.arange(s0, s1) - numpy.repeat(starts[g0:g1], cnt)
+        srt = numpy.zeros((g1 - g0, M + 1), F64)
+        srt[:, :M] = -numpy.inf
+        srt[rows, cols] = losses[s0:s1]
+        srt[:, :M].sort(axis=1)
+        srt[srt == -numpy.inf] = 0
+        # the column M contains zeros and is used for the missing losses
+        fp0 = srt[:, numpy.where(cols0 >= 0, cols0, M)]
+        fp1 = srt[:, numpy.where(cols1 >= 0, cols1, M)]
+        with numpy.errstate(invalid='ignore'):
+            slope = (fp1 - fp0) / (xp[j1] - xp[j])
+            curves[g0:g1] = numpy.where(last, fp0, slope * (x - xp[j]) + fp0)
+    curves[:, ~ok] = numpy.nan
+    return curves
+
+
 class LossesByPeriodBuilder(object):
     """
     Build losses by period for all loss types at the same time.
@@ -1344,16 +1462,30 @@ class LossesByPeriodBuilder(object):
         R = len(self.weights)
         P = len(self.return_periods)
         array = numpy.zeros((A, R, P), self.loss_dt)
-        for a, asset_value in enumerate(asset_values):
-            r_recs = group_array(loss_ratios[a], 'rlzi').items()
-            for li, lt in enumerate(self.loss_dt.names):
-                aval = asset_value[lt.replace('_ins', '')]
-                for r, recs in r_recs:
-                    array[a, r][lt] = aval * losses_by_period(
-                        recs['ratios'][:, li], self.return_periods,
-                        self.num_events[r], self.eff_time)
+        lens = [len(lrs) for lrs in loss_ratios]
+        if sum(lens) == 0:
+            return self.pair(array, stats)
+        data = numpy.concatenate(loss_ratios)
+        aids = numpy.repeat(numpy.arange(A), lens)
+        for r in numpy.unique(data['rlzi']):
+            ok = data['rlzi'] == r
+            self._build(array[:, r], asset_values, aids[ok],
+                        data['ratios'][ok], self.num_events[r])
         return self.pair(array, stats)
 
+    def _build(self, array, asset_values, aids, ratios, num_events):
+        # populate the rows of the array of shape (A, P) of the given assets
+        A = len(asset_values)
+        has_losses = numpy.bincount(aids, minlength=A) > 0
+        for li, lt in enumerate(self.loss_dt.names):
+            lt_ = lt.replace('_ins', '')
+            avalues = numpy.array([asset_values[a][lt_]
+                                   for a in numpy.where(has_losses)[0]])
+            curves = losses_by_period_batch(
+                ratios[:, li], aids, A, self.return_periods, num_events,
+                self.eff_time)
+            array[lt][has_losses] = avalues[:, None] * curves[has_losses]
+
     # used in the LossCurvesExporter
     def build_rlz(self, asset_values, loss_ratios, rlzi):
         """
@@ -1364,16 +1496,13 @@ class LossesByPeriodBuilder(object):
         # loss_ratios from lrgetter.get, aid -> list of ratios
         A, P = len(asset_values), len(self.return_periods)
         array = numpy.zeros((A, P), self.loss_dt)
-        for a, asset_value in enumerate(asset_values):
-            try:
-                ratios = loss_ratios[a]  # shape (E, LI)
-            except KeyError:  # no loss ratios > 0 for the given asset
-                continue
-            for li, lt in enumerate(self.loss_dt.names):
-                aval = asset_value[lt.replace('_ins', '')]
-                array[a][lt] = aval * losses_by_period(
-                    ratios[:, li], self.return_periods,
-                    self.num_events[rlzi], self.eff_time)
+        # no loss ratios > 0 for the assets missing in loss_ratios
+        aids = [a for a in range(A) if a in loss_ratios]
+        if not aids:
+            return array
+        ratios = numpy.concatenate([loss_ratios[a] for a in aids])
+        idxs = numpy.repeat(aids, [len(loss_ratios[a]) for a in aids])
+        self._build(array, asset_values, idxs, ratios, self.num_events[rlzi])
         return array
 
     def build(self, agg_loss_table_array, stats=()):
@@ -1408,9 +1537,7 @@ class LossesByPeriodBuilder(object):
         shp = losses.shape[:2] + (len(clp), len(losses.dtype))  # (A, R, C, LI)
         array = numpy.zeros(shp, F32)
         for lti, lt in enumerate(losses.dtype.names):
-            for a, losses_ in enumerate(losses[lt]):
-                for r, ls in enumerate(losses_):
-                    for c, poe in enumerate(clp):
-                        clratio = conditional_loss_ratio(ls, self.poes, poe)
-                        array[a, r, c, lti] = clratio
+            for c, poe in enumerate(clp):
+                array[:, :, c, lti] = conditional_loss_ratios(
+                    losses[lt], self.poes, poe)
         return self.pair(array, stats)
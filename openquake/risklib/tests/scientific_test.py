@@ -327,6 +327,17 @@ class MeanLossTestCase(unittest.TestCase):
         mean3 = vf(reordered_imls, reordered_epsilons).mean()
         aaae(mean3, mean)
 
+    def test_average_losses(self):
+        rnd = numpy.random.RandomState(42)
+        losses = numpy.cumsum(rnd.random_sample((3, 4, 10)), axis=-1)
+        poes = numpy.sort(rnd.random_sample((3, 4, 10)))[..., ::-1]
+        avgs = scientific.average_losses(losses, poes)
+        self.assertEqual(avgs.shape, (3, 4))
+        for i in range(3):
+            for j in range(4):
+                aaae(avgs[i, j], scientific.average_loss(
+                    (losses[i, j], poes[i, j])), decimal=12)
+
 
 class LogNormalDistributionTestCase(unittest.TestCase):
 
@@ -673,3 +684,92 @@ class ClassicalDamageTestCase(unittest.TestCase):
             fragility_functions, hazard_imls, hazard_poes,
             investigation_time, risk_investigation_time)
         aaae(poos, [0.56652127, 0.12513401, 0.1709355, 0.06555033, 0.07185889])
+
+
+class LossesByPeriodBuilderTestCase(unittest.TestCase):
+    # the results must be identical to the ones of the scalar functions
+    loss_dt = numpy.dtype([('structural', numpy.float32),
+                           ('structural_ins', numpy.float32)])
+    lrs_dt = numpy.dtype([('rlzi', numpy.uint16),
+                          ('ratios', (numpy.float32, (2,)))])
+
+    def setUp(self):
+        rnd = numpy.random.RandomState(42)
+        self.builder = scientific.LossesByPeriodBuilder(
+            numpy.array([1, 2, 5, 10, 20, 50, 100, 200]), self.loss_dt,
+            weights=[.4, .6], num_events={0: 30, 1: 50}, eff_time=100.,
+            risk_investigation_time=50.)
+        self.asset_values = [{'structural': rnd.uniform(100, 1000)}
+                             for _ in range(6)]
+        self.loss_ratios = []
+        for a in range(6):
+            n = [0, 5, 12, 30, 1, 20][a]
+            lrs = numpy.zeros(n, self.lrs_dt)
+            lrs['rlzi'] = rnd.randint(0, 2, n)
+            lrs['ratios'] = rnd.uniform(0, 1, (n, 2))
+            lrs['ratios'][:2] = .5  # some duplicated ratios
+            self.loss_ratios.append(lrs)
+
+    def test_losses_by_period(self):
+        losses = [3, 2, 3.5, 4, 3, 23, 11, 2, 1, 4, 5, 7, 8, 9, 13]
+        rps = [1, 2, 5, 10, 20, 50, 100]
+        curves = scientific.losses_by_period_batch(
+            numpy.array(losses * 2), numpy.repeat([0, 2], 15), 3, rps,
+            20, 100)
+        expected = scientific.losses_by_period(losses, rps, 20, 100)
+        numpy.testing.assert_array_equal(curves[0], expected)
+        numpy.testing.assert_array_equal(curves[2], expected)
+        numpy.testing.assert_array_equal(  # no losses
+            curves[1], scientific.losses_by_period([], rps, 20, 100))
+        numpy.testing.assert_array_equal(  # one group per block
+            scientific.losses_by_period_batch(
+                numpy.array(losses * 2), numpy.repeat([0, 2], 15), 3, rps,
+                20, 100, block_size=1), curves)
+        with self.assertRaises(ValueError):
+            scientific.losses_by_period_batch(
+                numpy.array(losses), numpy.zeros(15, int), 1, rps, 10, 100)
+
+    def test_build_all(self):
+        b = self.builder
+        curves, _ = b.build_all(self.asset_values, self.loss_ratios)
+        self.assertEqual(curves.shape, (6, 2, 8))
+        for a, lrs in enumerate(self.loss_ratios):
+            for r in range(2):
+                ratios = lrs['ratios'][lrs['rlzi'] == r]
+                for li, lt in enumerate(self.loss_dt.names):
+                    expected = numpy.zeros(8, numpy.float32)
+                    if len(ratios):
+                        expected[:] = (
+                            self.asset_values[a]['structural'] *
+                            scientific.losses_by_period(
+                                ratios[:, li], b.return_periods,
+                                b.num_events[r], b.eff_time))
+                    numpy.testing.assert_array_equal(
+                        curves[lt][a, r], expected)
+
+    def test_build_rlz(self):
+        b = self.builder
+        loss_ratios = {a: lrs['ratios'][lrs['rlzi'] == 1]
+                       for a, lrs in enumerate(self.loss_ratios)
+                       if (lrs['rlzi'] == 1).any()}
+        curves = b.build_rlz(self.asset_values, loss_ratios, 1)
+        all_curves, _ = b.build_all(self.asset_values, self.loss_ratios)
+        for lt in self.loss_dt.names:
+            numpy.testing.assert_array_equal(curves[lt], all_curves[lt][:, 1])
+
+    def test_build_maps(self):
+        b = self.builder
+        curves, _ = b.build_all(self.asset_values, self.loss_ratios)
+        # the poes of the builder are [.39, .22, ...]
+        clp = [.9, .5, b.poes[2], .1, .0001]
+        maps, _ = b.build_maps(curves, clp)
+        self.assertEqual(maps.shape, (6, 2, 5, 2))
+        for li, lt in enumerate(self.loss_dt.names):
+            for a in range(6):
+                for r in range(2):
+                    for c, poe in enumerate(clp):
+                        expected = numpy.float32(
+                            scientific.conditional_loss_ratio(
+                                curves[lt][a, r], b.poes, poe))
+                        numpy.testing.assert_array_equal(
+                            maps[a, r, c, li], expected)
@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+# vim: tabstop=4 shiftwidth=4 softtabstop=4
+#
+# Copyright (C) 2017 GEM Foundation
+#
+# OpenQuake is free software: you can redistribute it and/or modify it
+# under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# OpenQuake is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with OpenQuake. If not, see <http://www.gnu.org/licenses/>.
+"""
+A thread-safe in-memory cache for the payloads returned by the
+`extract` view of the WebUI.
+"""
+import threading
+import collections
+
+
+class ExtractCache(object):
+    """
+    A LRU cache of byte strings, bounded by their total size. The keys are
+    tuples (calc_id, what, extra, mtime): when a payload for a calculation is
+    stored with a new modification time of the datastore, all the payloads
+    for the same calculation with a different modification time are removed.
+    If several threads ask for the same missing key at the same time, the
+    payload is computed only once.
+
+    :param maxsize: maximum number of bytes stored in the cache
+    """
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self._data = collections.OrderedDict()  # key -> bytes
+        self._lock = threading.Lock()
+        self._computing = {}  # key -> lock held while computing the payload
+
+    def _get(self, key):
+        # must be called with the lock acquired
+        data = self._data.pop(key, None)
+        if data is not None:  # move the key at the end
+            self._data[key] = data
+        return data
+
+    def get(self, key):
+        """
+        :returns: the payload associated to the key, or None
+        """
+        with self._lock:
+            return self._get(key)
+
+    def set(self, key, data):
+        """
+        Store the payload, removing the stale payloads of the same
+        calculation and the least recently used ones if needed. Payloads
+        larger than `maxsize` are not stored.
+        """
+        calc_id, mtime = key[0], key[-1]
+        with self._lock:
+            for k in list(self._data):
+                if k[0] == calc_id and k[-1] != mtime or k == key:
+                    self.size -= len(self._data.pop(k))
+            if len(data) > self.maxsize:
+                return
+            self._data[key] = data
+            self.size += len(data)
+            while self.size > self.maxsize:
+                self.size -= len(self._data.popitem(last=False)[1])
+
+    def get_or_compute(self, key, func, *args):
+        """
+        :param key: a tuple (calc_id, what, extra, mtime)
+        :param func: a function returning a byte string
+        :param args: arguments passed to `func` in case of cache miss
+        :returns: the cached payload or the result of `func(*args)`
+        """
+        with self._lock:
+            data = self._get(key)
+            if data is not None:
+                self.hits += 1
+                return data
+            lock = self._computing.setdefault(key, threading.Lock())
+        with lock:
+            with self._lock:
+                # the payload may have been computed by another thread
+                data = self._get(key)
+                if data is not None:
+                    self.hits += 1
+                    return data
+            try:
+                data = func(*args)
+                with self._lock:
+                    self.misses += 1
+                self.set(key, data)
+            finally:
+                with self._lock:
+                    self._computing.pop(key, None)
+        return data
+
+    def invalidate(self, calc_id):
+        """
+        Remove all the payloads of the given calculation
+        """
+        with self._lock:
+            for k in list(self._data):
+                if k[0] == calc_id:
+                    self.size -= len(self._data.pop(k))
+
+    def __len__(self):
+        return len(self._data)
+
+    def __repr__(self):
+        return '<%s %d entries, %d/%d bytes, %d hits, %d misses>' % (
+            self.__class__.__name__, len(self), self.size, self.maxsize,
+            self.hits, self.misses)
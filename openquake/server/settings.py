@@ -164,6 +164,9 @@ LOGGING = {
 
 FILE_UPLOAD_MAX_MEMORY_SIZE = 1
 
+# Maximum number of bytes kept in memory by the cache of the extract view
+EXTRACT_CACHE_SIZE = 64 * 1024 * 1024
+
 # OpenQuake Standalone tools (IPT, Taxtweb, Taxonomy Glossary)
 if STANDALONE:
     INSTALLED_APPS += (
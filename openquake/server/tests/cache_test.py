@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+# vim: tabstop=4 shiftwidth=4 softtabstop=4
+#
+# Copyright (C) 2017 GEM Foundation
+#
+# OpenQuake is free software: you can redistribute it and/or modify it
+# under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# OpenQuake is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with OpenQuake. If not, see <http://www.gnu.org/licenses/>.
+import time
+import threading
+import unittest
+from openquake.server.cache import ExtractCache
+
+
+class ExtractCacheTestCase(unittest.TestCase):
+    def test_lru(self):
+        cache = ExtractCache(maxsize=10)
+        cache.set((1, 'a', (), 0), b'xxxx')
+        cache.set((1, 'b', (), 0), b'yyyy')
+        cache.get((1, 'a', (), 0))  # now 'b' is the least recently used
+        cache.set((2, 'c', (), 0), b'zzzz')
+        self.assertIsNone(cache.get((1, 'b', (), 0)))
+        self.assertEqual(cache.get((1, 'a', (), 0)), b'xxxx')
+        self.assertEqual(cache.size, 8)
+
+        # too big payloads are not stored
+        cache.set((2, 'd', (), 0), b'x' * 11)
+        self.assertIsNone(cache.get((2, 'd', (), 0)))
+        self.assertEqual(len(cache), 2)
+
+    def test_invalidation(self):
+        cache = ExtractCache(maxsize=100)
+        cache.set((1, 'a', (), 0), b'old-a')
+        cache.set((1, 'b', (), 0), b'old-b')
+        cache.set((2, 'a', (), 0), b'other')
+        # the datastore of calculation 1 changed
+        cache.set((1, 'a', (), 1), b'new-a')
+        self.assertIsNone(cache.get((1, 'b', (), 0)))
+        self.assertEqual(cache.get((1, 'a', (), 1)), b'new-a')
+        self.assertEqual(cache.get((2, 'a', (), 0)), b'other')
+        self.assertEqual(cache.size, 10)
+
+        cache.invalidate(2)
+        self.assertEqual(len(cache), 1)
+        self.assertEqual(cache.size, 5)
+
+    def test_concurrency(self):
+        cache = ExtractCache(maxsize=1000)
+        calls = []
+
+        def compute(what):
+            calls.append(what)
+            time.sleep(.01)
+            return what.encode('ascii') * 10
+
+        results = {}
+
+        def request(i):
+            what = 'what%d' % (i % 4)
+            results[i] = cache.get_or_compute(
+                (1, what, (), 0), compute, what)
+
+        threads = [threading.Thread(target=request, args=(i,))
+                   for i in range(40)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        # each payload is computed only once
+        self.assertEqual(sorted(calls), ['what0', 'what1', 'what2', 'what3'])
+        for i, data in results.items():
+            self.assertEqual(data, ('what%d' % (i % 4)).encode('ascii') * 10)
+        self.assertEqual(cache.size, 200)
+        self.assertEqual(cache._computing, {})
+        self.assertEqual((cache.hits, cache.misses), (36, 4))
+
+    def test_error(self):
+        cache = ExtractCache(maxsize=1000)
+
+        def fail():
+            raise KeyError('missing')
+
+        with self.assertRaises(KeyError):
+            cache.get_or_compute((1, 'a', (), 0), fail)
+        self.assertEqual(len(cache), 0)
+        self.assertEqual(cache._computing, {})
@@ -16,6 +16,7 @@
 # You should have received a copy of the GNU Affero General Public License
 # along with OpenQuake. If not, see <http://www.gnu.org/licenses/>.
 
+import io
 import shutil
 import json
 import logging
@@ -56,6 +57,7 @@ from openquake.engine.export import core
 from openquake.engine import engine
 from openquake.engine.export.core import DataStoreExportError
 from openquake.server import utils, dbapi
+from openquake.server.cache import ExtractCache
 
 from django.conf import settings
 if settings.LOCKDOWN:
@@ -79,6 +81,8 @@ XML = 'application/xml'
 JSON = 'application/json'
 HDF5 = 'application/x-hdf'
 
+extract_cache = ExtractCache(settings.EXTRACT_CACHE_SIZE)
+
 DEFAULT_LOG_LEVEL = 'info'
 
 #: For exporting calculation outputs, the client can request a specific format
@@ -382,6 +386,7 @@ def calc_remove(request, calc_id):
         message = logs.dbcmd('del_calc', calc_id, user)
     except dbapi.NotFound:
         return HttpResponseNotFound()
+    extract_cache.invalidate(int(calc_id))
 
     if 'success' in message:
         return HttpResponse(content=json.dumps(message),
@@ -647,12 +652,28 @@ def _array(v):
     return v
 
 
+def _extract_npz(fname, what, extra):
+    # read the data and return them as the bytes of a .npz file
+    with datastore.read(fname) as ds:
+        obj = _extract(ds, what, *extra)
+        if inspect.isgenerator(obj):
+            array, attrs = None, {k: _array(v) for k, v in obj}
+        elif hasattr(obj, '__toh5__'):
+            array, attrs = obj.__toh5__()
+        else:  # assume obj is an array
+            array, attrs = obj, {}
+        bio = io.BytesIO()
+        numpy.savez_compressed(bio, array=array, **attrs)
+    return bio.getvalue()
+
+
 @cross_domain_ajax
 @require_http_methods(['GET', 'HEAD'])
 def extract(request, calc_id, what):
     """
     Wrapper over the `oq extract` command. If setting.LOCKDOWN is true
     only calculations owned by the current user can be retrieved.
+    The payloads are cached in memory, until the datastore changes.
     """
     user = utils.get_user_data(request)
     username = user['name'] if user['acl_on'] else None
@@ -660,27 +681,18 @@ def extract(request, calc_id, what):
     if job is None:
         return HttpResponseNotFound()
 
-    # read the data and save them on a temporary .pik file
-    with datastore.read(job.ds_calc_dir + '.hdf5') as ds:
-        fd, fname = tempfile.mkstemp(
-            prefix=what.replace('/', '-'), suffix='.npz')
-        os.close(fd)
-        extra = ['%s=%s' % item for item in request.GET.items()]
-        obj = _extract(ds, what, *extra)
-        if inspect.isgenerator(obj):
-            array, attrs = None, {k: _array(v) for k, v in obj}
-        elif hasattr(obj, '__toh5__'):
-            array, attrs = obj.__toh5__()
-        else:  # assume obj is an array
-            array, attrs = obj, {}
-        numpy.savez_compressed(fname, array=array, **attrs)
+    fname = job.ds_calc_dir + '.hdf5'
+    extra = ['%s=%s' % item for item in request.GET.items()]
+    # the order of the parameters does not matter for the cache key
+    key = (job.id, what, tuple(sorted(extra)), os.path.getmtime(fname))
+    data = extract_cache.get_or_compute(key, _extract_npz, fname, what, extra)
 
     # stream the data back
-    stream = FileWrapper(open(fname, 'rb'))
-    stream.close = lambda: (FileWrapper.close(stream), os.remove(fname))
-    response = FileResponse(stream, content_type='application/octet-stream')
+    response = FileResponse(
+        io.BytesIO(data), content_type='application/octet-stream')
     response['Content-Disposition'] = (
-        'attachment; filename=%s' % os.path.basename(fname))
+        'attachment; filename=%s.npz' % what.replace('/', '-'))
+    response['Content-Length'] = len(data)
     return response
 
 